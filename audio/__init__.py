@@ -1,4 +1,21 @@
-from .recorder import record_audio
-from .transcriber import transcribe_audio
+import importlib
 
-__all__ = ["record_audio", "transcribe_audio"]
+# Loaded on first use, so offline tools (python -m audio.batch, audio.tune)
+# can import audio.pcm or audio.whisper_server without sounddevice and scipy.
+_EXPORTS = {
+    "record_audio": "recorder",
+    "record_utterance": "recorder",
+    "listen_utterance": "recorder",
+    "get_stream": "recorder",
+    "transcribe_audio": "transcriber",
+    "transcribe_pcm": "transcriber",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f"{__name__}.{module}"), name)
@@ -0,0 +1,189 @@
+"""
+Batch transcription of recorded utterances across all CPU cores.
+
+Usage:
+  python -m audio.batch <wav dir | manifest> [-o results.jsonl]
+                        [--workers N] [--threads T]
+
+A manifest is a text file with one WAV path per line (or JSONL lines with
+a "path" key). Results are appended to the output JSONL as they finish;
+re-running with the same output skips files that are already done.
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.util import Finalize
+
+import config.settings as cfg
+from audio.pcm import from_wav_bytes
+from audio.transcriber import transcribe_wav_bytes_cli
+from audio.whisper_server import WhisperServer, WhisperServerError, free_port
+
+# per-worker state, set up by _init_worker
+_server = None
+_threads = None
+
+
+def _init_worker(counter, threads):
+    """
+    Each worker loads the model once into its own whisper-server, limited
+    to `threads` so workers * threads never oversubscribes the cores.
+    """
+    global _server, _threads
+    _threads = threads
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+
+    # an OS-assigned port never collides with the app, dictation or the tuner
+    server = WhisperServer(port=free_port(), threads=threads)
+    try:
+        server.start()
+    except WhisperServerError as e:
+        print(f"⚠️ worker {index}: whisper-server unavailable, using whisper-cli: {e}")
+        return
+    _server = server
+    Finalize(None, server.stop, exitpriority=10)
+
+
+def _transcribe(path):
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        wav_bytes = f.read()
+    samples, fs = from_wav_bytes(wav_bytes)
+
+    text = None
+    if _server is not None:
+        try:
+            text = _server.transcribe(wav_bytes)
+        except WhisperServerError:
+            text = None
+    if text is None:
+        text = transcribe_wav_bytes_cli(wav_bytes, threads=_threads)
+
+    return {
+        "path": path,
+        "text": text,
+        "audio_seconds": round(len(samples) / fs, 3),
+        "decode_seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def collect_inputs(source):
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, "**", "*.wav"), recursive=True))
+
+    paths = []
+    base = os.path.dirname(os.path.abspath(source))
+    with open(source, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            path = json.loads(line)["path"] if line.startswith("{") else line
+            paths.append(path if os.path.isabs(path) else os.path.join(base, path))
+    return paths
+
+
+def load_done(output):
+    """Paths already present in the output JSONL (for resuming)."""
+    done = set()
+    if not os.path.exists(output):
+        return done
+    with open(output, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)["path"])
+            except (ValueError, KeyError):
+                # a line cut short by an interruption; that file is redone
+                continue
+    return done
+
+
+def trim_partial_line(output):
+    """
+    Cut a last line left unfinished by an interruption, so the next record
+    is appended on a line of its own.
+    """
+    if not os.path.exists(output):
+        return
+    with open(output, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        if not size:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        # walk back to the last complete line
+        pos = size
+        while pos > 0:
+            step = min(4096, pos)
+            f.seek(pos - step)
+            cut = f.read(step).rfind(b"\n")
+            if cut >= 0:
+                pos = pos - step + cut + 1
+                break
+            pos -= step
+        f.truncate(pos)
+
+
+def run(source, output, workers=None, threads=None):
+    threads = threads or cfg.BATCH_THREADS_PER_WORKER
+    workers = workers or max(1, (os.cpu_count() or 1) // threads)
+
+    paths = collect_inputs(source)
+    done = load_done(output)
+    todo = [p for p in paths if p not in done]
+    print(f"📂 {len(paths)} files, {len(done)} already done, {len(todo)} to go "
+          f"({workers} workers x {threads} threads)")
+    if not todo:
+        return
+    trim_partial_line(output)
+
+    counter = multiprocessing.Value("i", 0)
+    audio_total = 0.0
+    failed = 0
+    start = time.perf_counter()
+
+    with open(output, "a", encoding="utf-8") as out, ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(counter, threads),
+    ) as pool:
+        futures = {pool.submit(_transcribe, p): p for p in todo}
+        for i, future in enumerate(as_completed(futures), 1):
+            try:
+                result = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"❌ {futures[future]}: {e}")
+                continue
+
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+            audio_total += result["audio_seconds"]
+            print(f"[{i}/{len(todo)}] {result['path']}: {result['text'][:60]!r}")
+
+    wall = time.perf_counter() - start
+    rtf = wall / audio_total if audio_total else 0.0
+    print(f"\n✅ {len(todo) - failed} transcribed, {failed} failed")
+    print(f"audio {audio_total:.1f}s in {wall:.1f}s wall -> aggregate RTF {rtf:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-transcribe WAV files with whisper.")
+    parser.add_argument("source", help="directory of WAV files or a manifest")
+    parser.add_argument("-o", "--output", default="transcripts.jsonl")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--threads", type=int, default=None, help="whisper threads per worker")
+    args = parser.parse_args()
+    run(args.source, args.output, args.workers, args.threads)
+
+
+if __name__ == "__main__":
+    main()
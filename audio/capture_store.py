@@ -0,0 +1,117 @@
+import glob
+import json
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+import config.settings as cfg
+from utils.metrics import get_metrics
+
+metrics = get_metrics("capture_store")
+
+
+class CaptureStore:
+    """
+    Rotating on-disk store of captured voice turns.
+
+    Each turn is one compressed .npz holding the int16 audio and a JSON
+    metadata record (transcript, intent, timings, ...). Writes happen on a
+    background thread so saving never adds latency to a turn; once the
+    directory grows past `max_bytes` the oldest captures are deleted.
+    """
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or cfg.CAPTURE_DIR
+        self.max_bytes = max_bytes or cfg.CAPTURE_MAX_MB * 1024 * 1024
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._queue = queue.Queue(maxsize=32)
+        self._seq = 0
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+
+    def save(self, samples, fs, meta):
+        """
+        Queue a turn for writing. `samples` must not be reused by the caller.
+        Drops the turn (and counts it) if the writer has fallen behind.
+        """
+        self._seq += 1
+        name = time.strftime("%Y%m%d-%H%M%S") + f"-{self._seq:04d}.npz"
+        try:
+            self._queue.put_nowait((name, samples, fs, meta))
+        except queue.Full:
+            metrics.incr("dropped")
+
+    def _writer(self):
+        while True:
+            name, samples, fs, meta = self._queue.get()
+            path = os.path.join(self.directory, name)
+            try:
+                np.savez_compressed(
+                    path,
+                    samples=np.asarray(samples, dtype=np.int16),
+                    fs=np.int32(fs),
+                    meta=np.array(json.dumps(meta, default=str)),
+                )
+                metrics.incr("saved")
+                self._rotate()
+            except OSError as e:
+                metrics.incr("errors")
+                print("⚠️ Could not save capture:", e)
+
+    def _rotate(self):
+        paths = list_captures(self.directory)
+        sizes = [os.path.getsize(p) for p in paths]
+        total = sum(sizes)
+        for path, size in zip(paths, sizes):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            metrics.incr("rotated")
+
+
+def list_captures(directory=None):
+    """
+    Capture files, oldest first.
+    """
+    return sorted(glob.glob(os.path.join(directory or cfg.CAPTURE_DIR, "*.npz")))
+
+
+def load_capture(path):
+    """
+    (int16 samples, fs, meta dict) for one capture file.
+    """
+    with np.load(path) as data:
+        return data["samples"], int(data["fs"]), json.loads(str(data["meta"]))
+
+
+def keep_raw(asr, samples, info):
+    """
+    Attach a copy of the raw capture (before trimming) to an ASR result so
+    the turn can be saved once it has been handled. No-op unless capturing.
+    """
+    if cfg.CAPTURE_UTTERANCES:
+        asr["raw"] = samples.copy()
+        asr["capture"] = {k: info.get(k) for k in ("profile", "reason", "recorded")}
+    return asr
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """
+    The shared CaptureStore, or None when CAPTURE_UTTERANCES is off.
+    """
+    global _store
+    if not cfg.CAPTURE_UTTERANCES:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = CaptureStore()
+        return _store
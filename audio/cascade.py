@@ -0,0 +1,148 @@
+import math
+import os
+import time
+
+import config.settings as cfg
+from audio.pcm import to_wav_bytes
+from audio.preprocess import prepare_utterance, audio_ctx_for
+from audio.transcriber import transcribe_wav_bytes, transcribe_wav_bytes_cli
+from audio.whisper_server import get_server, WhisperServerError
+from utils.metrics import get_metrics
+
+metrics = get_metrics("asr_cascade")
+
+_fast_model_missing = None
+
+
+def cascade_enabled():
+    """
+    WHISPER_CASCADE, unless WHISPER_FAST_MODEL isn't on disk; then the fast
+    tier is skipped with a single warning.
+    """
+    global _fast_model_missing
+    if not cfg.WHISPER_CASCADE:
+        return False
+    if _fast_model_missing is None:
+        _fast_model_missing = not os.path.isfile(cfg.WHISPER_FAST_MODEL)
+        if _fast_model_missing:
+            print(f"⚠️ Fast whisper model {cfg.WHISPER_FAST_MODEL} not found, cascade disabled")
+    return not _fast_model_missing
+
+
+def segment_logprob(data: dict):
+    """
+    Average token log-probability from whisper-server's verbose_json.
+    Uses the per-segment avg_logprob when present, otherwise the token
+    probabilities. None if the response carries neither.
+    """
+    segments = data.get("segments") or []
+
+    weighted, total = 0.0, 0
+    for seg in segments:
+        if "avg_logprob" in seg:
+            n = max(1, len(seg.get("tokens") or []))
+            weighted += seg["avg_logprob"] * n
+            total += n
+    if total:
+        return weighted / total
+
+    probs = [
+        tok["p"]
+        for seg in segments
+        for tok in (seg.get("tokens") or seg.get("words") or [])
+        if isinstance(tok, dict) and tok.get("p")
+    ]
+    if probs:
+        return sum(math.log(p) for p in probs) / len(probs)
+    return None
+
+
+def _decode(tier, wav_bytes, params):
+    start = time.perf_counter()
+    data = get_server(tier).inference(wav_bytes, response_format="verbose_json", **params)
+    metrics.observe(f"latency.{tier}", time.perf_counter() - start)
+    metrics.incr(f"decodes.{tier}")
+    return (data.get("text") or "").strip(), segment_logprob(data)
+
+
+def transcribe_utterance(samples, fs=None):
+    """
+    Transcribe one captured utterance, escalating from the fast model to the
+    accurate one when the fast result has low confidence.
+
+    Returns {"text", "tier", "logprob", "samples", "fs", "timings"}; pass
+    the result to `escalate()` if the text later fails to parse into an intent.
+    """
+    start = time.perf_counter()
+    result = _transcribe_utterance(samples, fs)
+    result["timings"] = {"asr": time.perf_counter() - start}
+    return result
+
+
+def _transcribe_utterance(samples, fs):
+    samples, params = prepare_utterance(samples, fs)
+    result = {"text": "", "tier": None, "logprob": None, "samples": samples, "fs": fs}
+    if not len(samples):
+        return result
+
+    wav_bytes = to_wav_bytes(samples, fs)
+    if not cascade_enabled():
+        # keep the trimmed audio context from prepare_utterance
+        result["text"] = transcribe_wav_bytes(wav_bytes, **params)
+        result["tier"] = "accurate"
+        return result
+
+    metrics.incr("utterances")
+    try:
+        text, logprob = _decode("fast", wav_bytes, params)
+    except WhisperServerError as e:
+        print("⚠️ fast whisper tier unavailable:", e)
+        text, logprob = "", None
+
+    if text and (logprob is None or logprob >= cfg.WHISPER_ESCALATE_LOGPROB):
+        result.update(text=text, tier="fast", logprob=logprob)
+        return result
+
+    metrics.incr("escalated.empty" if not text else "escalated.confidence")
+    try:
+        text, logprob = _decode("accurate", wav_bytes, params)
+    except WhisperServerError as e:
+        print("⚠️ whisper-server failed, using whisper-cli:", e)
+        text, logprob = transcribe_wav_bytes_cli(wav_bytes, **params), None
+    result.update(text=text, tier="accurate", logprob=logprob)
+    return result
+
+
+def escalate(result):
+    """
+    Re-decode a fast-tier result with the accurate model (used when the
+    fast transcript didn't map to a known intent). Returns a new result,
+    or None if there is nothing to escalate.
+    """
+    if not cfg.WHISPER_ESCALATE_ON_UNKNOWN_INTENT or result.get("tier") != "fast":
+        return None
+
+    metrics.incr("escalated.intent")
+    samples, fs = result["samples"], result["fs"]
+    params = {"audio_ctx": audio_ctx_for(len(samples), fs)} if cfg.WHISPER_DYNAMIC_AUDIO_CTX else {}
+    try:
+        text, logprob = _decode("accurate", to_wav_bytes(samples, fs), params)
+    except WhisperServerError:
+        return None
+    return dict(result, text=text, tier="accurate", logprob=logprob)
+
+
+def cascade_stats():
+    """
+    Escalation rate and per-tier latency, for tuning the thresholds.
+    """
+    snap = metrics.snapshot()
+    counters = snap["counters"]
+    utterances = counters.get("utterances", 0)
+    escalated = sum(v for k, v in counters.items() if k.startswith("escalated."))
+    return {
+        "utterances": utterances,
+        "escalation_rate": escalated / utterances if utterances else 0.0,
+        "counters": counters,
+        "latency": snap["samples"],
+    }
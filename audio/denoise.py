@@ -0,0 +1,119 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+import config.settings as cfg
+
+# one-pole DC blocker: y[n] = x[n] - x[n-1] + 0.995 y[n-1]
+_DC_B = np.array([1.0, -1.0])
+_DC_A = np.array([1.0, -0.995])
+
+
+class StreamingDenoiser:
+    """
+    Spectral-gating noise suppressor for a live int16 stream.
+
+    Blocks go through a 50%-overlap STFT with a sqrt-Hann window (which
+    reconstructs exactly with overlap-add). A per-bin noise power estimate
+    is learned from frames that look like background, and every bin is
+    scaled by max(floor, 1 - over_subtract * noise / power). All frames of
+    a block are transformed together, so the per-block cost is a couple of
+    batched FFTs.
+
+    Output lags the input by frame - hop samples; process() returns as many
+    samples as it was given once the block size is a multiple of the hop.
+    """
+
+    def __init__(self, fs=None, frame=None, dc_removal=None, agc=None):
+        self.fs = fs or cfg.AUDIO_SAMPLE_RATE
+        self.frame = frame or cfg.DENOISE_FRAME
+        self.hop = self.frame // 2
+        self.dc_removal = cfg.DENOISE_DC_REMOVAL if dc_removal is None else dc_removal
+        self.agc = cfg.DENOISE_AGC if agc is None else agc
+
+        self.window = np.sqrt(np.hanning(self.frame + 1)[:-1]).astype(np.float32)
+        self.noise = None
+        self.gain = 1.0
+
+        self._pending = np.zeros(self.frame - self.hop, dtype=np.float32)
+        self._tail = np.zeros(self.frame - self.hop, dtype=np.float32)
+        self._dc_state = np.zeros(1)
+
+    def reset(self):
+        """Forget the stream history but keep the learned noise profile."""
+        self._pending[:] = 0
+        self._tail[:] = 0
+        self._dc_state[:] = 0
+
+    def _update_noise(self, power):
+        """Update the noise estimate; True if the whole block looks like background."""
+        level = power.mean(axis=1)
+        if self.noise is None:
+            self.noise = power[np.argmin(level)].copy()
+            return True
+
+        quiet = level < 3.0 * self.noise.mean()
+        if quiet.any():
+            self.noise = 0.9 * self.noise + 0.1 * power[quiet].mean(axis=0)
+        else:
+            # no background frames in this block: let the estimate creep up
+            # so a new, louder steady noise is eventually learned
+            self.noise *= 1.005
+        return bool(quiet.all())
+
+    def _apply_agc(self, out, background=False):
+        # the gain is frozen on noise-only blocks so it isn't pumped up by background
+        rms = float(np.sqrt(np.mean(out * out))) if len(out) else 0.0
+        if not background and rms > cfg.VAD_MIN_RMS:
+            target = min(cfg.DENOISE_AGC_MAX_GAIN, cfg.DENOISE_AGC_TARGET_RMS / rms)
+            # fast attack when too loud, slow release when quiet
+            rate = 0.5 if target < self.gain else 0.05
+            self.gain += rate * (target - self.gain)
+        return out * self.gain
+
+    def process(self, block):
+        """
+        Denoise one block of int16 (or float) samples. Returns int16.
+        """
+        x = np.asarray(block, dtype=np.float32)
+        if self.dc_removal:
+            x, self._dc_state = lfilter(_DC_B, _DC_A, x, zi=self._dc_state)
+            x = x.astype(np.float32)
+
+        buf = np.concatenate((self._pending, x))
+        n = (len(buf) - self.frame) // self.hop + 1
+        if n <= 0:
+            self._pending = buf
+            return np.zeros(0, dtype=np.int16)
+
+        frames = sliding_window_view(buf, self.frame)[::self.hop][:n] * self.window
+        spec = np.fft.rfft(frames, axis=1)
+        power = spec.real ** 2 + spec.imag ** 2
+
+        background = self._update_noise(power)
+        gain = 1.0 - cfg.DENOISE_OVER_SUBTRACT * self.noise / np.maximum(power, 1e-6)
+        np.clip(gain, cfg.DENOISE_FLOOR, 1.0, out=gain)
+
+        y = np.fft.irfft(spec * gain, self.frame, axis=1).astype(np.float32) * self.window
+        heads = y[:, :self.hop]
+        tails = np.vstack((self._tail, y[:-1, self.hop:]))
+        out = (heads + tails).ravel()
+        self._tail = y[-1, self.hop:].copy()
+        self._pending = buf[n * self.hop:]
+
+        if self.agc:
+            out = self._apply_agc(out, background)
+        return np.clip(out, -32768, 32767).astype(np.int16)
+
+
+def denoise(samples, fs=None, block=None):
+    """
+    Run a whole clip through a fresh StreamingDenoiser (benchmarks, files).
+    The output is realigned with the input and has the same length.
+    """
+    den = StreamingDenoiser(fs)
+    block = block or cfg.AUDIO_BLOCK_SIZE
+    delay = den.frame - den.hop
+    padded = np.concatenate((np.asarray(samples), np.zeros(delay, dtype=np.int16)))
+    out = [den.process(padded[i:i + block]) for i in range(0, len(padded), block)]
+    return np.concatenate(out)[delay:delay + len(samples)]
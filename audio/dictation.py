@@ -0,0 +1,104 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import config.settings as cfg
+from audio.pcm import to_wav_bytes
+from audio.preprocess import audio_ctx_for
+from audio.recorder import listen_utterance
+from audio.transcriber import transcribe_wav_bytes
+from audio.vad import speech_segments
+from audio.whisper_server import get_pool, WhisperServerError
+from nlu.fast_intent import normalize
+from utils.metrics import get_metrics
+
+metrics = get_metrics("dictation")
+
+# longest run of words we look for when de-duplicating a seam
+MAX_SEAM_WORDS = 6
+
+
+def record_dictation(stop_event=None):
+    """
+    Record until the user pauses for the dictation profile's long silence,
+    hits the hard maximum, or `stop_event` is set (explicit stop).
+    Returns (samples, info); the samples are a copy the caller owns.
+    """
+    def on_chunk(ep, start, pos):
+        if stop_event is not None and stop_event.is_set():
+            ep.done, ep.reason = True, "stopped"
+
+    samples, info = listen_utterance("dictation", on_chunk=on_chunk)
+    return samples.copy(), info
+
+
+def stitch(texts):
+    """
+    Join segment transcripts in order, dropping words repeated across a seam
+    (the overlap audio is heard by both neighbours).
+    """
+    words = []
+    for text in texts:
+        new = text.split()
+        if not new:
+            continue
+        tail = [normalize(w) for w in words[-MAX_SEAM_WORDS:]]
+        head = [normalize(w) for w in new[:MAX_SEAM_WORDS]]
+        for k in range(min(len(tail), len(head)), 0, -1):
+            if tail[-k:] == head[:k]:
+                new = new[k:]
+                break
+        words.extend(new)
+    return " ".join(words)
+
+
+def _decode_segment(pool, wav_bytes, audio_ctx):
+    if pool is None:
+        return transcribe_wav_bytes(wav_bytes, audio_ctx=audio_ctx)
+    with pool.checkout() as server:
+        return server.transcribe(wav_bytes, audio_ctx=audio_ctx)
+
+
+def transcribe_dictation(samples, fs=None):
+    """
+    Split `samples` at speech-segment boundaries, decode the segments
+    concurrently on the whisper-server pool and stitch them back in order.
+    """
+    fs = fs or cfg.AUDIO_SAMPLE_RATE
+    segments = speech_segments(samples, fs)
+    if not segments:
+        return ""
+
+    try:
+        pool = get_pool()
+        workers = pool.size
+    except WhisperServerError as e:
+        print("⚠️ dictation pool unavailable, decoding serially:", e)
+        pool, workers = None, 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _decode_segment, pool,
+                to_wav_bytes(samples[a:b], fs),
+                audio_ctx_for(b - a, fs) if cfg.WHISPER_DYNAMIC_AUDIO_CTX else None,
+            )
+            for a, b in segments
+        ]
+        texts = [f.result() for f in futures]
+
+    metrics.incr("dictations")
+    metrics.incr("segments", len(segments))
+    metrics.observe("rtf", (time.perf_counter() - start) / (len(samples) / fs))
+    return stitch(texts)
+
+
+def dictate(stop_event=None):
+    """
+    Record a dictation and return (text, info).
+    """
+    samples, info = record_dictation(stop_event)
+    if not len(samples):
+        return "", info
+    return transcribe_dictation(samples), info
+
@@ -0,0 +1,91 @@
+import re
+from difflib import SequenceMatcher
+
+import config.settings as cfg
+from audio.pcm import to_wav_bytes
+from audio.preprocess import trim_silence, audio_ctx_for
+from audio.transcriber import transcribe_wav_bytes_cli
+from audio.whisper_server import get_server, WhisperServerError
+
+
+def _normalize(text):
+    text = re.sub(r"\[.*?\]|\(.*?\)", " ", text.lower())
+    return " ".join(re.findall(r"[a-z']+", text))
+
+
+class GrammarRecognizer:
+    """
+    Recognizes one phrase out of a small grammar, in the spirit of
+    whisper-command's guided mode: whisper is primed with the allowed
+    phrases, decodes only the trimmed clip with a minimal audio context,
+    and the output is scored against every phrase.
+
+    `grammar` maps a label to the phrases that mean it, e.g.
+    {"yes": ["yes", "sure"], "no": ["no", "cancel"]}.
+
+    Labels in `exact` only match on a whole word or phrase, never on fuzzy
+    similarity, so "yet" can't confirm something that needs a "yes".
+    """
+
+    def __init__(self, grammar: dict, margin: float = 0.15, exact=()):
+        self.grammar = {label: [_normalize(p) for p in phrases] for label, phrases in grammar.items()}
+        self.margin = margin
+        self.exact = set(exact)
+        phrases = sorted({p for ps in self.grammar.values() for p in ps})
+        self.prompt = ", ".join(phrases) + "."
+
+    def score(self, text: str):
+        """
+        Best (label, confidence) for an already-decoded text.
+        Confidence is the fuzzy similarity to the closest phrase, halved
+        when another label is nearly as close.
+        """
+        text = _normalize(text)
+        if not text:
+            return None, 0.0
+
+        words = set(text.split())
+        best = {}
+        for label, phrases in self.grammar.items():
+            for phrase in phrases:
+                # a whole-word hit anywhere in the reply is a strong match
+                if phrase in words or (" " in phrase and phrase in text):
+                    s = 1.0
+                elif label in self.exact:
+                    s = 0.0
+                else:
+                    s = SequenceMatcher(None, text, phrase).ratio()
+                best[label] = max(best.get(label, 0.0), s)
+
+        ranked = sorted(best.items(), key=lambda kv: kv[1], reverse=True)
+        label, confidence = ranked[0]
+        if len(ranked) > 1 and confidence - ranked[1][1] < self.margin:
+            confidence /= 2
+        return label, confidence
+
+    def recognize(self, samples, fs=None):
+        """
+        Decode `samples` and return (label, confidence, text).
+        """
+        samples = trim_silence(samples, fs)
+        if not len(samples):
+            return None, 0.0, ""
+
+        wav_bytes = to_wav_bytes(samples, fs)
+        audio_ctx = audio_ctx_for(len(samples), fs)
+        text = None
+        if cfg.WHISPER_BACKEND == "server":
+            try:
+                text = get_server().transcribe(
+                    wav_bytes,
+                    prompt=self.prompt,
+                    audio_ctx=audio_ctx,
+                    no_timestamps="true",
+                    temperature="0.0",
+                )
+            except WhisperServerError as e:
+                print("⚠️ whisper-server failed, using whisper-cli:", e)
+        if text is None:
+            text = transcribe_wav_bytes_cli(wav_bytes, audio_ctx, prompt=self.prompt)
+        label, confidence = self.score(text)
+        return label, confidence, text
@@ -0,0 +1,67 @@
+import io
+import struct
+import wave
+import numpy as np
+import config.settings as cfg
+
+
+def as_int16(samples):
+    """
+    Return 16-bit PCM. float32/float64 input is expected in [-1, 1].
+    int16 input is returned as-is (no copy).
+    """
+    samples = np.asarray(samples)
+    if samples.dtype == np.int16:
+        return samples
+    if np.issubdtype(samples.dtype, np.floating):
+        return (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+    return samples.astype(np.int16)
+
+
+def as_float32(samples):
+    samples = np.asarray(samples)
+    if samples.dtype == np.float32:
+        return samples
+    if samples.dtype == np.int16:
+        return samples.astype(np.float32) / 32768.0
+    return samples.astype(np.float32)
+
+
+def to_wav_bytes(samples, fs=None):
+    """
+    Encode mono PCM as an in-memory WAV payload (44-byte header + data).
+    """
+    fs = fs or cfg.AUDIO_SAMPLE_RATE
+    data = as_int16(samples).tobytes()
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + len(data), b"WAVE",
+        b"fmt ", 16, 1, 1, fs, fs * 2, 2, 16,
+        b"data", len(data)
+    )
+    return header + data
+
+
+def _read_wave(wf):
+    fs = wf.getframerate()
+    channels = wf.getnchannels()
+    samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return samples, fs
+
+
+def from_wav_bytes(payload):
+    """
+    Decode a 16-bit WAV payload into (int16 mono samples, sample rate).
+    """
+    with wave.open(io.BytesIO(payload), "rb") as wf:
+        return _read_wave(wf)
+
+
+def load_wav(path):
+    """
+    Read a 16-bit WAV file into (int16 mono samples, sample rate).
+    """
+    with wave.open(path, "rb") as wf:
+        return _read_wave(wf)
@@ -0,0 +1,70 @@
+import math
+import numpy as np
+import config.settings as cfg
+from audio.vad import frame_features
+
+# whisper's encoder sees 30 s as 1500 frames
+WHISPER_FRAMES_PER_SECOND = 50
+WHISPER_MAX_AUDIO_CTX = 1500
+
+
+def speech_span(samples, fs=None):
+    """
+    (start, end) sample indices of the region above the noise threshold,
+    or None if the clip is silent. Fully vectorized over frames.
+    """
+    fs = fs or cfg.AUDIO_SAMPLE_RATE
+    frame_len = int(fs * cfg.VAD_FRAME_MS / 1000)
+    if len(samples) < frame_len:
+        return None
+
+    rms, _ = frame_features(samples, frame_len)
+    noise = np.percentile(rms, 10)
+    threshold = max(cfg.VAD_MIN_RMS, noise * cfg.VAD_THRESHOLD_RATIO)
+
+    voiced = np.flatnonzero(rms > threshold)
+    if voiced.size == 0:
+        return None
+    return int(voiced[0]) * frame_len, int(voiced[-1] + 1) * frame_len
+
+
+def trim_silence(samples, fs=None, pad=None):
+    """
+    Drop leading and trailing silence, keeping `pad` seconds around speech.
+    Returns a view (no copy); empty if there is no speech at all.
+    """
+    fs = fs or cfg.AUDIO_SAMPLE_RATE
+    pad = cfg.TRIM_PAD_SECONDS if pad is None else pad
+
+    span = speech_span(samples, fs)
+    if span is None:
+        return samples[:0]
+
+    pad_n = int(pad * fs)
+    start = max(0, span[0] - pad_n)
+    end = min(len(samples), span[1] + pad_n)
+    return samples[start:end]
+
+
+def audio_ctx_for(n_samples, fs=None):
+    """
+    Encoder context (audio_ctx) sized to the clip instead of the full 30 s.
+    """
+    fs = fs or cfg.AUDIO_SAMPLE_RATE
+    frames = math.ceil(n_samples / fs * WHISPER_FRAMES_PER_SECOND) + cfg.WHISPER_AUDIO_CTX_MARGIN
+    return int(min(WHISPER_MAX_AUDIO_CTX, max(cfg.WHISPER_MIN_AUDIO_CTX, frames)))
+
+
+def prepare_utterance(samples, fs=None):
+    """
+    Run the preprocessing stage between capture and whisper.
+    Returns (samples, whisper params).
+    """
+    fs = fs or cfg.AUDIO_SAMPLE_RATE
+    if cfg.WHISPER_TRIM_SILENCE:
+        samples = trim_silence(samples, fs)
+
+    params = {}
+    if cfg.WHISPER_DYNAMIC_AUDIO_CTX and len(samples):
+        params["audio_ctx"] = audio_ctx_for(len(samples), fs)
+    return samples, params
@@ -1,18 +1,294 @@
 import sounddevice as sd
 import numpy as np
+import threading
+import time
 import wave
+from contextlib import contextmanager, nullcontext
+import config.settings as cfg
+from audio.vad import Endpointer
+from audio.denoise import StreamingDenoiser
+from utils.metrics import get_metrics
 
-def record_audio(filename="audio.wav", duration=5, fs=16000):
-    print("🎙️ Recording...")
-    recording = sd.rec(int(duration * fs), samplerate=fs, channels=1, dtype="int16")
-    sd.wait()
+metrics = get_metrics("recorder")
+
+
+class AudioStream:
+    """
+    One long-lived microphone InputStream feeding a preallocated ring buffer.
+
+    The audio callback is the only writer: it copies each block into the ring
+    and then publishes the new total frame count. Readers never block the
+    callback; they poll `position()` and copy out of the ring.
+    """
+
+    def __init__(self, fs=None, capacity_seconds=None, blocksize=None):
+        self.fs = fs or cfg.AUDIO_SAMPLE_RATE
+        self.blocksize = blocksize or cfg.AUDIO_BLOCK_SIZE
+        self.capacity = int((capacity_seconds or cfg.AUDIO_RING_SECONDS) * self.fs)
+        self.overflows = 0
+
+        self._ring = np.zeros(self.capacity, dtype=np.int16)
+        self._written = 0
+
+        # denoising runs in the callback; it needs whole STFT hops per block
+        self._denoiser = None
+        if cfg.DENOISE_CAPTURE:
+            if self.blocksize % (cfg.DENOISE_FRAME // 2) == 0:
+                self._denoiser = StreamingDenoiser(self.fs)
+            else:
+                print("⚠️ Denoiser disabled: AUDIO_BLOCK_SIZE must be a multiple of DENOISE_FRAME // 2")
+        self._stream = None
+        self._scratch = threading.local()
+
+        # while gated (TTS playing) the callback stores silence instead
+        self._gates = 0
+        self._gate_until = 0.0
+        self._gate_lock = threading.Lock()
+
+    # -----------------------------
+    # Device
+    # -----------------------------
+    def start(self):
+        if self._stream is not None:
+            return
+        self._stream = sd.InputStream(
+            samplerate=self.fs,
+            channels=1,
+            dtype="int16",
+            blocksize=self.blocksize,
+            callback=self._callback
+        )
+        self._stream.start()
+
+    def stop(self):
+        if self._stream is None:
+            return
+        self._stream.stop()
+        self._stream.close()
+        self._stream = None
+
+    def _callback(self, indata, frames, time_info, status):
+        if status:
+            self.overflows += 1
+
+        if self._gates or time.monotonic() < self._gate_until:
+            block = 0
+            if self._denoiser is not None:
+                self._denoiser.reset()
+        elif self._denoiser is not None:
+            block = self._denoiser.process(indata[:, 0])
+            frames = len(block)
+        else:
+            block = indata[:, 0]
+
+        pos = self._written % self.capacity
+        first = min(frames, self.capacity - pos)
+        if np.isscalar(block):
+            self._ring[pos:pos + first] = block
+            if first < frames:
+                self._ring[:frames - first] = block
+        else:
+            self._ring[pos:pos + first] = block[:first]
+            if first < frames:
+                self._ring[:frames - first] = block[first:]
+
+        # publish only after the samples are in place
+        self._written += frames
+
+    @contextmanager
+    def gate(self, tail=None):
+        """
+        Suppress capture while the assistant is speaking so TTS output never
+        reaches the endpointer. The gate stays shut `tail` seconds afterwards.
+        """
+        with self._gate_lock:
+            self._gates += 1
+        try:
+            yield
+        finally:
+            with self._gate_lock:
+                self._gates -= 1
+                tail = cfg.TTS_GATE_TAIL if tail is None else tail
+                self._gate_until = max(self._gate_until, time.monotonic() + tail)
+
+    # -----------------------------
+    # Reading
+    # -----------------------------
+    def position(self):
+        """Total number of frames captured since the stream started."""
+        return self._written
+
+    def oldest(self):
+        """Oldest frame index still held in the ring."""
+        return max(0, self._written - self.capacity)
+
+    def wait_until(self, frame):
+        block_time = self.blocksize / self.fs
+        while self._written < frame:
+            time.sleep(block_time)
+
+    def read(self, start, end, out=None):
+        """
+        Copy frames [start, end) out of the ring into `out` (or this thread's
+        scratch buffer) and return a view of the copied samples.
+        """
+        start = max(start, self.oldest())
+        n = end - start
+        if n <= 0:
+            return self._buffer(out)[:0]
+        if n > self.capacity:
+            raise ValueError("requested window is larger than the ring buffer")
+
+        buf = self._buffer(out)
+        pos = start % self.capacity
+        first = min(n, self.capacity - pos)
+        buf[:first] = self._ring[pos:pos + first]
+        if first < n:
+            buf[first:n] = self._ring[:n - first]
+        return buf[:n]
+
+    def capture(self, duration, pre_roll=None, out=None):
+        """
+        Capture `duration` seconds from now, prefixed with `pre_roll` seconds
+        of audio that was already in the ring.
+        """
+        if pre_roll is None:
+            pre_roll = cfg.AUDIO_PRE_ROLL
+
+        now = self._written
+        start = now - int(pre_roll * self.fs)
+        end = now + int(duration * self.fs)
+        self.wait_until(end)
+        return self.read(start, end, out)
+
+    def listen(self, profile="command", max_seconds=None, pre_roll=None, out=None, on_chunk=None):
+        """
+        Capture one utterance using the VAD endpointer: wait for speech onset,
+        stop after the profile's trailing silence or hard maximum.
 
+        Returns (samples, info). `samples` is empty when nobody spoke;
+        `info` has the profile, stop reason, recorded and saved seconds, and
+        `speech_end_at` (time.monotonic() at which speech ended).
+        `on_chunk(endpointer, start, pos)` is called after every chunk so
+        callers can look at the audio while it is still being spoken.
+        """
+        if pre_roll is None:
+            pre_roll = cfg.AUDIO_PRE_ROLL
+
+        began = time.monotonic()
+        ep = Endpointer(profile, self.fs, max_seconds)
+        chunk = ep.frame_len * 4
+        pre = int(pre_roll * self.fs)
+
+        # start scanning a little in the past so an onset during the
+        # pre-roll is still caught
+        start = max(self.oldest(), self._written - pre)
+        pos = start
+        while not ep.done:
+            self.wait_until(pos + chunk)
+            ep.feed(self.read(pos, pos + chunk, self._local("chunk", chunk)))
+            pos += chunk
+            if on_chunk and not ep.done:
+                on_chunk(ep, start, pos)
+
+        elapsed = time.monotonic() - began
+        info = {
+            "profile": profile,
+            "reason": ep.reason,
+            "recorded": round(elapsed, 2),
+            "saved": round(cfg.VAD_BASELINE_SECONDS - elapsed, 2),
+        }
+        metrics.incr(f"turns.{profile}")
+        metrics.observe(f"saved.{profile}", info["saved"])
+
+        bounds = ep.speech_bounds()
+        if bounds is None:
+            return self._buffer(out)[:0], info
+
+        onset, end = bounds
+        samples = self.read(start + onset - pre, start + end, out)
+        info["speech"] = round(len(samples) / self.fs, 2)
+        info["speech_end_at"] = time.monotonic() - (self._written - (start + end)) / self.fs
+        return samples, info
+
+    def _buffer(self, out):
+        if out is not None:
+            return out
+        return self._local("buf", self.capacity)
+
+    def _local(self, name, size):
+        buf = getattr(self._scratch, name, None)
+        if buf is None:
+            buf = np.empty(size, dtype=np.int16)
+            setattr(self._scratch, name, buf)
+        return buf
+
+
+# -----------------------------
+# Shared stream
+# -----------------------------
+_stream = None
+_stream_lock = threading.Lock()
+
+
+def get_stream():
+    """
+    Return the process-wide AudioStream, opening the device on first use.
+    """
+    global _stream
+    with _stream_lock:
+        if _stream is None:
+            stream = AudioStream()
+            stream.start()
+            _stream = stream
+        return _stream
+
+
+def tts_gate():
+    """
+    Gate the shared stream while speaking. A no-op when the mic was never
+    opened (text-only use), since nothing could be captured anyway.
+    """
+    return _stream.gate() if _stream is not None else nullcontext()
+
+
+def record_utterance(duration=5, pre_roll=None):
+    """
+    Pull the next `duration` seconds (plus pre-roll) from the shared stream.
+    The returned array is a view into a reused buffer; copy it if you keep it.
+    """
+    return get_stream().capture(duration, pre_roll)
+
+
+def listen_utterance(profile="command", max_seconds=None, out=None, on_chunk=None):
+    """
+    Record one utterance from the shared stream, ending when the speaker
+    stops. Returns (samples, info); see AudioStream.listen.
+    """
+    samples, info = get_stream().listen(profile, max_seconds, out=out, on_chunk=on_chunk)
+    print(f"🎙️ {profile}: {info['reason']} after {info['recorded']}s "
+          f"(saved {info['saved']}s vs fixed window)")
+    return samples, info
+
+
+def write_wav(filename, samples, fs=None):
     wf = wave.open(filename, "wb")
     wf.setnchannels(1)
     wf.setsampwidth(2)  # 16-bit
-    wf.setframerate(fs)
-    wf.writeframes(recording.tobytes())
+    wf.setframerate(fs or cfg.AUDIO_SAMPLE_RATE)
+    wf.writeframes(samples.tobytes())
     wf.close()
 
+
+def record_audio(filename="audio.wav", duration=5, fs=16000):
+    print("🎙️ Recording...")
+    if fs == cfg.AUDIO_SAMPLE_RATE:
+        recording = record_utterance(duration)
+    else:
+        recording = sd.rec(int(duration * fs), samplerate=fs, channels=1, dtype="int16")
+        sd.wait()
+
+    write_wav(filename, recording, fs)
+
     print("✅ Saved recording:", filename)
     return filename
@@ -0,0 +1,173 @@
+"""
+Replay captured voice turns through ASR and intent parsing offline.
+
+Usage:
+  python -m audio.replay [capture_dir] [--speed realtime|max] [--no-nlu]
+                         [--llm] [--limit N] [--export-wav DIR]
+
+--speed realtime  clips arrive as fast as they were spoken (each arrives
+                  its own duration after the previous one), so queueing
+                  behind a slow decode shows up as it would live
+--speed max       clips are processed back to back (throughput)
+
+Each turn is compared with what was recorded live: transcript changes,
+intent changes, which NLU path answered (fast / embed / llm) and per-stage
+latency (recorded vs now).
+
+The persistent intent cache is neither read nor written during a replay,
+so latencies are real and test audio never lands in the live cache.
+--llm  skip the fast and embed paths too, so every turn goes to the LLM
+
+--export-wav writes the clips as WAV + .txt reference transcripts, in the
+layout the benchmarks and `python -m audio.tune` read as fixtures.
+"""
+
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+import config.settings as cfg
+from audio.capture_store import list_captures, load_capture
+from audio.cascade import transcribe_utterance
+from audio.pcm import to_wav_bytes
+from nlu.intent_extrator import extract_intent
+
+
+def parse_intent(transcript):
+    response = extract_intent(transcript)
+    if isinstance(response, str):
+        try:
+            response = json.loads(response)
+        except ValueError:
+            response = {"intent": "other", "slots": {}}
+    return response
+
+
+def replay_turn(samples, fs, nlu=True):
+    """
+    Run one clip through the same stages as a live turn.
+    Returns (transcript, intent or None, timings).
+    """
+    asr = transcribe_utterance(samples, fs)
+    transcript = asr["text"].strip()
+    timings = dict(asr["timings"])
+
+    intent = None
+    if nlu and transcript:
+        start = time.perf_counter()
+        intent = parse_intent(transcript)
+        timings["intent"] = time.perf_counter() - start
+    return transcript, intent, timings
+
+
+def _arrivals(paths, realtime, out):
+    """
+    Feed clips into `out`, paced like live speech when `realtime`.
+    """
+    for path in paths:
+        samples, fs, meta = load_capture(path)
+        if realtime:
+            time.sleep(len(samples) / fs)
+        out.put((path, samples, fs, meta, time.perf_counter()))
+    out.put(None)
+
+
+def export_wav(paths, directory):
+    os.makedirs(directory, exist_ok=True)
+    for path in paths:
+        samples, fs, meta = load_capture(path)
+        name = os.path.splitext(os.path.basename(path))[0]
+        with open(os.path.join(directory, name + ".wav"), "wb") as f:
+            f.write(to_wav_bytes(samples, fs))
+        with open(os.path.join(directory, name + ".txt"), "w", encoding="utf-8") as f:
+            f.write(meta.get("transcript", ""))
+    print(f"💾 Exported {len(paths)} clips to {directory}")
+
+
+def _ms(value):
+    return f"{value * 1000:8.0f}" if value is not None else f"{'-':>8}"
+
+
+def isolate_nlu(force_llm=False):
+    """Keep the replay out of the live intent cache; optionally LLM only."""
+    cfg.INTENT_CACHE_ENABLED = False
+    if force_llm:
+        cfg.FAST_INTENT_ENABLED = False
+        cfg.EMBED_INTENT_ENABLED = False
+
+
+def replay(directory=None, speed="max", nlu=True, limit=None, force_llm=False):
+    isolate_nlu(force_llm)
+    paths = list_captures(directory)
+    if limit:
+        paths = paths[-limit:]
+    if not paths:
+        print("No captures found. Set CAPTURE_UTTERANCES = True and use the app.")
+        return
+
+    arrivals = queue.Queue(maxsize=cfg.PIPELINE_QUEUE_SIZE)
+    threading.Thread(target=_arrivals, args=(paths, speed == "realtime", arrivals), daemon=True).start()
+
+    rows = []
+    print(f"{'capture':<28}{'asr was':>8}{'asr now':>8}{'nlu was':>8}{'nlu now':>8}{'queued':>8}  {'path':<14}changes")
+    while True:
+        item = arrivals.get()
+        if item is None:
+            break
+        path, samples, fs, meta, arrived = item
+        queued = time.perf_counter() - arrived
+
+        transcript, intent, timings = replay_turn(samples, fs, nlu)
+        was = meta.get("timings", {})
+
+        changes = []
+        if transcript != meta.get("transcript", ""):
+            changes.append(f"text: {meta.get('transcript')!r} -> {transcript!r}")
+        if nlu and intent is not None and intent.get("intent") != (meta.get("intent") or {}).get("intent"):
+            changes.append(f"intent: {(meta.get('intent') or {}).get('intent')} -> {intent.get('intent')}")
+
+        source = (intent or {}).get("source")
+        was_source = (meta.get("intent") or {}).get("source")
+        route = f"{was_source or '-'}->{source or '-'}" if nlu else ""
+
+        rows.append({"was": was, "now": timings, "queued": queued, "changed": bool(changes), "source": source})
+        print(f"{os.path.basename(path)[:27]:<28}{_ms(was.get('asr'))}{_ms(timings.get('asr'))}"
+              f"{_ms(was.get('intent'))}{_ms(timings.get('intent'))}{_ms(queued)}  {route:<14}{'; '.join(changes)}")
+
+    print()
+    for stage in ("asr", "intent"):
+        was = [r["was"][stage] for r in rows if stage in r["was"]]
+        now = [r["now"][stage] for r in rows if stage in r["now"]]
+        if now:
+            before = f"{np.median(was) * 1000:.0f} ms" if was else "n/a"
+            print(f"{stage:<7} p50 recorded {before:>9}   replay {np.median(now) * 1000:.0f} ms")
+    for source in sorted({r["source"] for r in rows if r["source"]}):
+        now = [r["now"]["intent"] for r in rows if r["source"] == source and "intent" in r["now"]]
+        print(f"  {source:<5} {len(now):>4} turns, p50 {np.median(now) * 1000:.0f} ms")
+    print(f"changed {sum(r['changed'] for r in rows)}/{len(rows)} turns")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay captured voice turns offline.")
+    parser.add_argument("directory", nargs="?", default=None, help="capture directory (default CAPTURE_DIR)")
+    parser.add_argument("--speed", choices=("realtime", "max"), default="max")
+    parser.add_argument("--no-nlu", action="store_true", help="replay ASR only")
+    parser.add_argument("--llm", action="store_true", help="send every turn to the LLM (no fast/embed path)")
+    parser.add_argument("--limit", type=int, default=None, help="only the newest N captures")
+    parser.add_argument("--export-wav", metavar="DIR", default=None, help="write clips as benchmark fixtures and exit")
+    args = parser.parse_args()
+
+    if args.export_wav:
+        paths = list_captures(args.directory)
+        export_wav(paths[-args.limit:] if args.limit else paths, args.export_wav)
+        return
+    replay(args.directory, args.speed, not args.no_nlu, args.limit, args.llm)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import threading
+import time
+
+import config.settings as cfg
+from audio.cascade import cascade_enabled
+from audio.pcm import to_wav_bytes
+from audio.preprocess import audio_ctx_for
+from audio.recorder import get_stream, listen_utterance
+from audio.whisper_server import get_server, WhisperServerError
+from nlu.fast_intent import match_command, normalize
+from utils.metrics import get_metrics
+
+metrics = get_metrics("streaming_asr")
+
+
+def decode_partial(samples, fs=None):
+    """
+    Quick decode of the audio heard so far (fast tier when the cascade is on).
+    """
+    tier = "fast" if cascade_enabled() else "accurate"
+    return get_server(tier).transcribe(
+        to_wav_bytes(samples, fs),
+        audio_ctx=audio_ctx_for(len(samples), fs),
+        no_timestamps="true",
+    )
+
+
+class PartialTracker:
+    """
+    Keeps the previous partial hypothesis. A hypothesis is stable once two
+    consecutive decodes agree on it word for word.
+    """
+
+    def __init__(self):
+        self.previous = None
+
+    def update(self, text):
+        words = normalize(text)
+        stable = words if words and words == self.previous else None
+        self.previous = words
+        return stable
+
+
+def listen_streaming(profile="command", out=None, on_partial=None, on_early=None):
+    """
+    Like listen_utterance(), but decodes the growing utterance every
+    STREAMING_STEP seconds while the user is still speaking.
+
+    Decodes run on a worker thread so the endpointer never waits on the
+    server; a step that comes due while a decode is still running is
+    skipped.
+
+    - on_partial(text, stable) gets every partial hypothesis
+    - on_early(text, intent) fires once, as soon as a stable partial
+      matches a high-confidence command (see nlu.fast_intent)
+
+    Returns (samples, info); info["early"] is the dispatched intent or None
+    and info["early_at"] the time.monotonic() it was dispatched.
+    """
+    stream = get_stream()
+    step = int(cfg.STREAMING_STEP * stream.fs)
+    pre = int(cfg.AUDIO_PRE_ROLL * stream.fs)
+    tracker = PartialTracker()
+    state = {"last": 0, "early": None, "early_at": None, "closed": False}
+    lock = threading.Lock()
+    busy = threading.Event()
+
+    def decode(window):
+        try:
+            with metrics.timer("partial_decode"):
+                text = decode_partial(window, stream.fs)
+        except WhisperServerError:
+            return
+        finally:
+            busy.clear()
+        metrics.incr("partials")
+
+        with lock:
+            # the utterance ended while we were decoding: the final pass decides
+            if state["closed"] or state["early"] is not None:
+                return
+            stable = tracker.update(text)
+            intent = match_command(stable) if stable is not None else None
+            if intent is not None:
+                state["early"] = intent
+                state["early_at"] = time.monotonic()
+        if on_partial:
+            on_partial(text, stable)
+        if intent is not None:
+            metrics.incr("early_dispatches")
+            if on_early:
+                on_early(stable, intent)
+
+    def on_chunk(ep, start, pos):
+        if ep.onset is None or state["early"] is not None:
+            return
+        if pos - state["last"] < step:
+            return
+        if busy.is_set():
+            metrics.incr("partials_skipped")
+            return
+        state["last"] = pos
+        busy.set()
+        window = stream.read(start + ep.onset * ep.frame_len - pre, pos)
+        threading.Thread(target=decode, args=(window,), name="partial-decode", daemon=True).start()
+
+    samples, info = listen_utterance(profile, out=out, on_chunk=on_chunk)
+    with lock:
+        state["closed"] = True
+        info["early"] = state["early"]
+        info["early_at"] = state["early_at"]
+    return samples, info
@@ -1,27 +1,107 @@
+import json
+import os
 import subprocess
 import config.settings as cfg
-import os
+from audio.pcm import to_wav_bytes
+from audio.preprocess import prepare_utterance
+from audio.whisper_server import get_server, WhisperServerError
 
-def transcribe_audio(audio_file):
+def load_profile(path=None):
+    """
+    Apply the host profile written by `python -m audio.tune`, if present.
+    Returns the profile dict, or None when there is nothing (valid) to load.
+    """
+    path = path or cfg.WHISPER_PROFILE_PATH
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            profile = json.load(f)
+    except (OSError, ValueError) as e:
+        print("⚠️ Ignoring unreadable whisper profile:", e)
+        return None
+
+    if not os.path.exists(profile.get("model", "")):
+        print(f"⚠️ Ignoring whisper profile, model not found: {profile.get('model')}")
+        return None
+    if profile.get("cpu_count") != os.cpu_count():
+        print("⚠️ whisper profile was tuned on a different CPU; re-run: python -m audio.tune")
+
+    cfg.WHISPER_MODEL = profile["model"]
+    cfg.WHISPER_THREADS = profile.get("threads") or cfg.WHISPER_THREADS
+    if profile.get("min_audio_ctx"):
+        cfg.WHISPER_MIN_AUDIO_CTX = profile["min_audio_ctx"]
+    cfg.WHISPER_DYNAMIC_AUDIO_CTX = profile.get("dynamic_audio_ctx", cfg.WHISPER_DYNAMIC_AUDIO_CTX)
+    print(f"⚙️ whisper profile: {cfg.WHISPER_MODEL}, {cfg.WHISPER_THREADS} threads")
+    return profile
+
+# applied on import, before any whisper process is started
+active_profile = load_profile() if cfg.WHISPER_USE_PROFILE else None
+
+def transcribe_wav_bytes_cli(wav_bytes: bytes, audio_ctx=None, threads=None, prompt=None):
+    """
+    Cold path: spawn whisper-cli, which reloads the model on every call.
+    The WAV payload goes in on stdin and the text comes back on stdout,
+    so nothing touches the filesystem.
+    """
     cmd = [
         cfg.WHISPER_BIN,
         "-m", cfg.WHISPER_MODEL,
-        "-f", audio_file,
-        "-otxt"
+        "-f", "-",
+        "-nt",      # no timestamps
+        "-np",      # only print the transcript
     ]
-    subprocess.run(cmd, check=True)
+    if audio_ctx:
+        cmd += ["-ac", str(audio_ctx)]
+    threads = threads or cfg.WHISPER_THREADS
+    if threads:
+        cmd += ["-t", str(threads)]
+    if prompt:
+        cmd += ["--prompt", prompt]
+
+    result = subprocess.run(
+        cmd,
+        input=wav_bytes,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=True
+    )
+    return result.stdout.decode("utf-8", errors="ignore").strip()
 
-    # Whisper saves as <audio_file>.txt, not replaced
-    output_file = audio_file + ".txt"
+def transcribe_wav_bytes(wav_bytes: bytes, audio_ctx=None):
+    """
+    Transcribe an in-memory WAV payload. Uses the persistent whisper-server
+    when enabled and falls back to whisper-cli if the server can't be reached.
+    """
+    if cfg.WHISPER_BACKEND == "server":
+        params = {"audio_ctx": audio_ctx} if audio_ctx else {}
+        try:
+            return get_server().transcribe(wav_bytes, **params)
+        except WhisperServerError as e:
+            print("⚠️ whisper-server failed, using whisper-cli:", e)
 
-    with open(output_file, "r", encoding="utf-8") as f:
-        text = f.read().strip()
+    return transcribe_wav_bytes_cli(wav_bytes, audio_ctx)
 
-    # # (Optional) Auto-clean temp files
-    # try:
-    #     os.remove(audio_file)       # delete .wav
-    #     os.remove(output_file)      # delete .wav.txt
-    # except FileNotFoundError:
-    #     pass
+def transcribe_pcm(samples, fs=None, preprocess=True):
+    """
+    Transcribe int16 or float32 PCM straight from the capture buffer.
+    With `preprocess`, silence is trimmed and the audio context is sized
+    to the remaining speech.
+    """
+    params = {}
+    if preprocess:
+        samples, params = prepare_utterance(samples, fs)
+        if not len(samples):
+            return ""
+    return transcribe_wav_bytes(to_wav_bytes(samples, fs), **params)
+
+def transcribe_audio(audio_file):
+    """
+    Transcribe a WAV file on disk (archives, fixtures, benchmarks).
+    """
+    with open(audio_file, "rb") as f:
+        return transcribe_wav_bytes(f.read())
 
-    return text
+def transcribe_audio_cli(audio_file):
+    with open(audio_file, "rb") as f:
+        return transcribe_wav_bytes_cli(f.read())
@@ -0,0 +1,272 @@
+"""
+Tune whisper for this machine.
+
+Builds quantized variants of WHISPER_MODEL with the bundled quantize tool,
+then sweeps whisper thread count x quantization x audio-context floor over
+the benchmark fixtures, measuring latency, real-time factor and WER.
+The fastest setting whose WER stays within WHISPER_TUNE_MAX_WER_DELTA of
+the unquantized model at full context is written to WHISPER_PROFILE_PATH,
+which audio/transcriber.py applies at startup.
+
+Usage:
+  python -m audio.tune [fixture_dir] [--threads 2,4,8] [--quants q8_0,q5_0]
+                       [--ctx 256,512] [--runs N] [--dry-run]
+
+Fixtures with a <name>.txt reference are scored against it; without
+references the baseline's own transcripts are used, so WER then measures
+drift from the unquantized model rather than absolute accuracy.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+
+import numpy as np
+
+import config.settings as cfg
+import audio.transcriber as transcriber
+from audio.pcm import to_wav_bytes
+from audio.preprocess import prepare_utterance
+from audio.whisper_server import WhisperServer, WhisperServerError
+from benchmarks.common import load_fixtures
+from nlu.fast_intent import normalize
+
+# audio-context floor meaning "dynamic audio_ctx off" (full 30 s encoder)
+FULL_CTX = 0
+
+
+# -----------------------------
+# Scoring
+# -----------------------------
+def word_error_rate(reference, hypothesis):
+    """
+    Word-level Levenshtein distance / reference length, on normalized text.
+    """
+    ref, hyp = normalize(reference).split(), normalize(hypothesis).split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (r != h))
+    return row[-1] / len(ref)
+
+
+# -----------------------------
+# Model variants
+# -----------------------------
+def quantized_path(model, quant):
+    root, ext = os.path.splitext(model)
+    return f"{root}-{quant}{ext}"
+
+
+def build_quantized(model, quant):
+    """
+    Path to `model` quantized to `quant`, creating it with the bundled
+    quantize tool if it doesn't exist yet. None if quantization failed.
+    """
+    out = quantized_path(model, quant)
+    if os.path.exists(out):
+        return out
+
+    print(f"🔧 Quantizing {model} -> {quant}")
+    try:
+        subprocess.run(
+            [cfg.WHISPER_QUANTIZE_BIN, model, out, quant],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            check=True
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"⚠️ quantize {quant} failed: {e}")
+        if os.path.exists(out):
+            os.remove(out)
+        return None
+    return out
+
+
+def default_threads():
+    cores = os.cpu_count() or 1
+    counts = {1, cores}
+    n = 2
+    while n < cores:
+        counts.add(n)
+        n *= 2
+    return sorted(counts)
+
+
+# -----------------------------
+# Sweep
+# -----------------------------
+def _decode_all(server, fixtures, min_ctx, runs):
+    """
+    Decode every fixture through the production preprocessing with the
+    given audio-context floor. Returns (texts, best latencies).
+    """
+    saved = cfg.WHISPER_MIN_AUDIO_CTX, cfg.WHISPER_DYNAMIC_AUDIO_CTX
+    cfg.WHISPER_DYNAMIC_AUDIO_CTX = min_ctx != FULL_CTX
+    if min_ctx != FULL_CTX:
+        cfg.WHISPER_MIN_AUDIO_CTX = min_ctx
+
+    texts, latencies = [], []
+    try:
+        for _, samples, fs, _ in fixtures:
+            best, text = None, ""
+            for _ in range(runs):
+                start = time.perf_counter()
+                trimmed, params = prepare_utterance(samples, fs)
+                text = server.transcribe(to_wav_bytes(trimmed, fs), **params) if len(trimmed) else ""
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            texts.append(text)
+            latencies.append(best)
+    finally:
+        cfg.WHISPER_MIN_AUDIO_CTX, cfg.WHISPER_DYNAMIC_AUDIO_CTX = saved
+    return texts, latencies
+
+
+def _score(fixtures, texts, latencies, references):
+    audio = sum(len(samples) / fs for _, samples, fs, _ in fixtures)
+    wers = [word_error_rate(ref, hyp) for ref, hyp in zip(references, texts)]
+    return {
+        "p50_ms": round(float(np.median(latencies)) * 1000, 1),
+        "p90_ms": round(float(np.percentile(latencies, 90)) * 1000, 1),
+        "rtf": round(sum(latencies) / audio, 4),
+        "wer": round(float(np.mean(wers)), 4),
+    }
+
+
+def sweep(fixtures, models, threads, contexts, runs):
+    """
+    Yields (model, threads, min_ctx, texts, latencies). One whisper-server
+    is started per (model, threads) pair; contexts are per-request.
+    """
+    for model in models:
+        for t in threads:
+            server = WhisperServer(model=model, port=cfg.WHISPER_TUNE_PORT, threads=t)
+            try:
+                server.start()
+            except WhisperServerError as e:
+                print(f"⚠️ skipping {os.path.basename(model)} x{t}: {e}")
+                continue
+            try:
+                _decode_all(server, fixtures[:1], FULL_CTX, 1)    # warm-up
+                for ctx in contexts:
+                    try:
+                        texts, latencies = _decode_all(server, fixtures, ctx, runs)
+                    except WhisperServerError as e:
+                        print(f"⚠️ {os.path.basename(model)} x{t} ctx {ctx or 'full'}: {e}")
+                        continue
+                    yield model, t, ctx, texts, latencies
+            finally:
+                server.stop()
+
+
+def tune(directory=None, threads=None, quants=None, contexts=None, runs=2, dry_run=False):
+    fixtures = load_fixtures(directory)
+    if not fixtures:
+        print("No fixtures found.")
+        return None
+
+    source = (transcriber.active_profile or {}).get("source_model", cfg.WHISPER_MODEL)
+    threads = threads or default_threads()
+    quants = cfg.WHISPER_TUNE_QUANTS if quants is None else quants
+    contexts = [FULL_CTX] + list(cfg.WHISPER_TUNE_AUDIO_CTX if contexts is None else contexts)
+
+    models = [source] + [m for m in (build_quantized(source, q) for q in quants) if m]
+    print(f"📐 {len(fixtures)} fixtures, models {[os.path.basename(m) for m in models]}, "
+          f"threads {threads}, audio_ctx floors {[c or 'full' for c in contexts]}\n")
+
+    results = []
+    references = [ref for _, _, _, ref in fixtures]
+    has_refs = all(r is not None for r in references)
+    if not has_refs:
+        print("ℹ️ No reference transcripts: scoring WER against the baseline model.\n")
+
+    def add(model, t, ctx, texts, latencies):
+        row = {"model": model, "threads": t, "min_audio_ctx": ctx, "texts": texts}
+        row.update(_score(fixtures, texts, latencies, references))
+        results.append(row)
+        print(f"{os.path.basename(model):<28}{t:4d}{ctx or 'full':>6}"
+              f"{row['p50_ms']:9.0f}{row['p90_ms']:9.0f}{row['rtf']:8.3f}{row['wer']:7.3f}")
+
+    # without references, rows wait until the baseline (unquantized model at
+    # full context) has run, whichever row of the sweep that turns out to be
+    pending = []
+    scoring = has_refs
+    print(f"{'model':<28}{'thr':>4}{'ctx':>6}{'p50 ms':>9}{'p90 ms':>9}{'RTF':>8}{'WER':>7}")
+    for model, t, ctx, texts, latencies in sweep(fixtures, models, threads, contexts, runs):
+        if not scoring and model != source:
+            break  # the source model is swept first: its full-context row never ran
+        if not scoring and model == source and ctx == FULL_CTX:
+            references = [r if r is not None else h for r, h in zip(references, texts)]
+            scoring = True
+            for args in pending:
+                add(*args)
+            pending = []
+        if scoring:
+            add(model, t, ctx, texts, latencies)
+        else:
+            pending.append((model, t, ctx, texts, latencies))
+
+    baseline = [r for r in results if r["model"] == source and r["min_audio_ctx"] == FULL_CTX]
+    if not baseline:
+        print("❌ The baseline (unquantized model, full audio context) could not be run; nothing written.")
+        return None
+
+    reference = min(baseline, key=lambda r: r["p50_ms"])
+    budget = min(r["wer"] for r in baseline) + cfg.WHISPER_TUNE_MAX_WER_DELTA
+    eligible = [r for r in results if r["wer"] <= budget]
+    best = min(eligible, key=lambda r: (r["p50_ms"], r["rtf"]))
+
+    profile = {
+        "model": best["model"],
+        "source_model": source,
+        "threads": best["threads"],
+        "min_audio_ctx": best["min_audio_ctx"] or None,
+        "dynamic_audio_ctx": best["min_audio_ctx"] != FULL_CTX,
+        "metrics": {k: best[k] for k in ("p50_ms", "p90_ms", "rtf", "wer")},
+        "baseline": {k: reference[k] for k in ("p50_ms", "p90_ms", "rtf", "wer")},
+        "host": platform.node(),
+        "cpu_count": os.cpu_count(),
+        "fixtures": len(fixtures),
+        "tuned_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+    print(f"\n🏆 {os.path.basename(best['model'])}, {best['threads']} threads, "
+          f"audio_ctx floor {best['min_audio_ctx'] or 'full'}: "
+          f"p50 {best['p50_ms']:.0f} ms (baseline {reference['p50_ms']:.0f} ms), "
+          f"WER {best['wer']:.3f}")
+    if dry_run:
+        return profile
+
+    with open(cfg.WHISPER_PROFILE_PATH, "w", encoding="utf-8") as f:
+        json.dump(profile, f, indent=2)
+    print(f"💾 Profile written to {cfg.WHISPER_PROFILE_PATH}")
+    return profile
+
+
+def _int_list(value):
+    return [int(v) for v in value.split(",") if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune whisper settings for this machine.")
+    parser.add_argument("fixtures", nargs="?", default=None, help="fixture directory (default benchmarks/fixtures)")
+    parser.add_argument("--threads", type=_int_list, default=None, help="thread counts, e.g. 2,4,8")
+    parser.add_argument("--quants", type=lambda v: [q for q in v.split(",") if q], default=None,
+                        help="quantization types, e.g. q8_0,q5_0 (empty = base model only)")
+    parser.add_argument("--ctx", type=_int_list, default=None, help="audio_ctx floors, e.g. 256,512")
+    parser.add_argument("--runs", type=int, default=2, help="decodes per fixture (best is kept)")
+    parser.add_argument("--dry-run", action="store_true", help="report the winner without writing it")
+    args = parser.parse_args()
+    tune(args.fixtures, args.threads, args.quants, args.ctx, args.runs, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
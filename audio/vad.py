@@ -0,0 +1,140 @@
+import numpy as np
+import config.settings as cfg
+
+
+def frame_features(samples, frame_len):
+    """
+    Per-frame RMS and zero-crossing rate for int16 samples.
+    Trailing samples that don't fill a whole frame are ignored.
+    """
+    n = len(samples) // frame_len
+    frames = samples[:n * frame_len].reshape(n, frame_len).astype(np.float32)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    signs = np.signbit(frames)
+    zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+    return rms, zcr
+
+
+class Endpointer:
+    """
+    Streaming energy/ZCR endpointer.
+
+    Feed it audio in whole frames; it tracks the background noise level,
+    detects speech onset and reports `done` once the speaker has been quiet
+    for the profile's trailing-silence window (or the hard maximum hits).
+    Frame indices are relative to the first sample fed.
+    """
+
+    def __init__(self, profile="command", fs=None, max_seconds=None):
+        p = cfg.VAD_PROFILES[profile]
+        self.profile = profile
+        self.fs = fs or cfg.AUDIO_SAMPLE_RATE
+        self.frame_len = int(self.fs * cfg.VAD_FRAME_MS / 1000)
+
+        frames_per_sec = 1000 / cfg.VAD_FRAME_MS
+        self.silence_frames = int(p["silence"] * frames_per_sec)
+        self.max_frames = int((max_seconds or p["max"]) * frames_per_sec)
+        self.timeout_frames = int(p["start_timeout"] * frames_per_sec)
+
+        self.noise = cfg.VAD_MIN_RMS / cfg.VAD_THRESHOLD_RATIO
+        self.frames = 0
+        self.onset = None
+        self.last_speech = None
+        self.run = 0
+        self.done = False
+        self.reason = None
+
+    def threshold(self):
+        return max(cfg.VAD_MIN_RMS, self.noise * cfg.VAD_THRESHOLD_RATIO)
+
+    def feed(self, samples):
+        """
+        Consume a block of samples (a multiple of frame_len). Returns `done`.
+        """
+        rms, zcr = frame_features(samples, self.frame_len)
+
+        for level, crossings in zip(rms, zcr):
+            if self.done:
+                break
+
+            thr = self.threshold()
+            # loud frames are speech; borderline frames only if they aren't hiss
+            speech = level > 2 * thr or (level > thr and crossings < cfg.VAD_ZCR_MAX)
+
+            if speech:
+                self.run += 1
+                self.last_speech = self.frames
+                if self.onset is None and self.run >= cfg.VAD_ONSET_FRAMES:
+                    self.onset = self.frames - self.run + 1
+            else:
+                self.run = 0
+                if self.onset is None:
+                    self.noise = 0.9 * self.noise + 0.1 * level
+
+            self.frames += 1
+
+            if self.onset is None:
+                if self.frames >= self.timeout_frames:
+                    self.done, self.reason = True, "timeout"
+            elif self.frames - self.last_speech > self.silence_frames:
+                self.done, self.reason = True, "silence"
+            elif self.frames - self.onset >= self.max_frames:
+                self.done, self.reason = True, "max"
+
+        return self.done
+
+    def speech_bounds(self):
+        """
+        (start_sample, end_sample) of the detected speech, or None.
+        """
+        if self.onset is None:
+            return None
+        return self.onset * self.frame_len, (self.last_speech + 1) * self.frame_len
+
+
+def speech_segments(samples, fs=None, min_silence=None, max_segment=None, overlap=None):
+    """
+    Split a long recording at pauses. Returns [(start, end)] sample ranges
+    covering the speech, each padded by `overlap` seconds on both sides.
+    Phrases are grouped up to `max_segment` seconds; a single phrase longer
+    than that is cut into equal pieces.
+    """
+    fs = fs or cfg.AUDIO_SAMPLE_RATE
+    min_silence = cfg.DICTATION_MIN_SILENCE if min_silence is None else min_silence
+    max_segment = cfg.DICTATION_MAX_SEGMENT if max_segment is None else max_segment
+    overlap = cfg.DICTATION_OVERLAP if overlap is None else overlap
+
+    frame_len = int(fs * cfg.VAD_FRAME_MS / 1000)
+    if len(samples) < frame_len:
+        return []
+
+    rms, _ = frame_features(samples, frame_len)
+    threshold = max(cfg.VAD_MIN_RMS, np.percentile(rms, 10) * cfg.VAD_THRESHOLD_RATIO)
+    voiced = np.flatnonzero(rms > threshold)
+    if voiced.size == 0:
+        return []
+
+    # gaps of at least min_silence frames separate segments
+    gap = int(min_silence * 1000 / cfg.VAD_FRAME_MS)
+    breaks = np.flatnonzero(np.diff(voiced) > gap)
+    starts = np.concatenate(([voiced[0]], voiced[breaks + 1]))
+    ends = np.concatenate((voiced[breaks], [voiced[-1]])) + 1
+
+    # merge neighbouring phrases while they fit in max_segment, so the
+    # decoder gets whole sentences rather than single words
+    longest = int(max_segment * fs)
+    merged = []
+    for s, e in zip(starts * frame_len, ends * frame_len):
+        if merged and e - merged[-1][0] <= longest:
+            merged[-1][1] = e
+        else:
+            merged.append([s, e])
+
+    pad = int(overlap * fs)
+    segments = []
+    for s, e in merged:
+        pieces = max(1, int(np.ceil((e - s) / longest)))
+        bounds = np.linspace(s, e, pieces + 1).astype(int)
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            segments.append((max(0, a - pad), min(len(samples), b + pad)))
+    return segments
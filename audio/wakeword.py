@@ -0,0 +1,247 @@
+"""
+Low-CPU wake-word spotting on the capture stream.
+
+Usage:
+  python -m audio.wakeword enroll [count]   record wake-word templates
+"""
+
+import glob
+import os
+import sys
+import threading
+import time
+from functools import lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+import config.settings as cfg
+from audio.pcm import as_float32, load_wav
+from utils.metrics import get_metrics
+
+metrics = get_metrics("wakeword")
+
+N_FFT = 512
+N_MELS = 26
+N_MFCC = 13
+
+
+# -----------------------------
+# Features
+# -----------------------------
+def _hz_to_mel(f):
+    return 2595.0 * np.log10(1.0 + f / 700.0)
+
+
+def _mel_to_hz(m):
+    return 700.0 * (10.0 ** (m / 2595.0) - 1.0)
+
+
+@lru_cache(maxsize=4)
+def _mel_filterbank(fs):
+    points = _mel_to_hz(np.linspace(_hz_to_mel(0), _hz_to_mel(fs / 2), N_MELS + 2))
+    bins = np.floor((N_FFT + 1) * points / fs).astype(int)
+
+    fb = np.zeros((N_MELS, N_FFT // 2 + 1), dtype=np.float32)
+    for m in range(1, N_MELS + 1):
+        left, center, right = bins[m - 1], bins[m], bins[m + 1]
+        if center > left:
+            fb[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            fb[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+    return fb
+
+
+@lru_cache(maxsize=1)
+def _dct_matrix():
+    k = np.arange(N_MFCC)[:, None]
+    n = np.arange(N_MELS)[None, :]
+    return np.cos(np.pi * k * (2 * n + 1) / (2 * N_MELS)).astype(np.float32)
+
+
+def mfcc(samples, fs=None):
+    """
+    MFCCs (25 ms frames, 10 ms hop) without c0, mean/variance normalised
+    over the clip. Returns an array of shape (frames, N_MFCC - 1).
+    """
+    fs = fs or cfg.AUDIO_SAMPLE_RATE
+    frame = int(0.025 * fs)
+    hop = int(0.010 * fs)
+
+    x = as_float32(samples)
+    if len(x) < frame:
+        x = np.pad(x, (0, frame - len(x)))
+    x = np.append(x[0], x[1:] - 0.97 * x[:-1])
+
+    frames = sliding_window_view(x, frame)[::hop] * np.hamming(frame).astype(np.float32)
+    power = np.abs(np.fft.rfft(frames, N_FFT)) ** 2
+    log_mel = np.log(power @ _mel_filterbank(fs).T + 1e-10)
+    coeffs = (log_mel @ _dct_matrix().T)[:, 1:]
+
+    coeffs -= coeffs.mean(axis=0)
+    coeffs /= coeffs.std(axis=0) + 1e-6
+    return coeffs
+
+
+def subsequence_dtw(template, window):
+    """
+    Mean per-frame distance of the best alignment of `template` against any
+    stretch of `window`. Step pattern (1,0)/(1,1)/(1,2) keeps each row a
+    single vectorized operation.
+    """
+    cost = np.sqrt(((template[:, None, :] - window[None, :, :]) ** 2).sum(axis=2))
+    acc = cost[0].copy()
+    inf = np.full(2, np.inf, dtype=acc.dtype)
+    for i in range(1, len(template)):
+        shifted = np.concatenate((inf, acc))
+        acc = cost[i] + np.minimum(np.minimum(acc, shifted[1:-1]), shifted[:-2])
+    return float(acc.min()) / len(template)
+
+
+# -----------------------------
+# Spotter
+# -----------------------------
+class KeywordSpotter:
+    """
+    Feed audio blocks to `process()`; it returns True when the wake word
+    ends in the audio seen so far. Quiet hops are rejected on RMS alone,
+    so idle cost is one mean-square per hop.
+    """
+
+    def __init__(self, templates, fs=None, threshold=None):
+        if not templates:
+            raise ValueError("no wake-word templates")
+        self.fs = fs or cfg.AUDIO_SAMPLE_RATE
+        self.threshold = threshold or cfg.WAKEWORD_THRESHOLD
+        self.templates = [mfcc(t, self.fs) for t in templates]
+
+        longest = max(len(t) for t in templates)
+        self.window = np.zeros(int(longest * 1.25), dtype=np.int16)
+        self.hop = int(cfg.WAKEWORD_HOP * self.fs)
+        self.refractory = int(cfg.WAKEWORD_REFRACTORY * self.fs)
+
+        self._pending = 0
+        self._seen = 0
+        self._last_trigger = -self.refractory
+        self.last_score = None
+
+    def reset(self):
+        self.window[:] = 0
+        self._pending = 0
+
+    def process(self, block):
+        n = len(block)
+        if n >= len(self.window):
+            self.window[:] = block[-len(self.window):]
+        else:
+            self.window[:-n] = self.window[n:]
+            self.window[-n:] = block
+        self._seen += n
+        self._pending += n
+
+        if self._pending < self.hop:
+            return False
+        recent = self.window[-self._pending:].astype(np.float32)
+        self._pending = 0
+
+        if np.sqrt(np.mean(recent * recent)) < cfg.WAKEWORD_ENERGY_GATE:
+            return False
+        if self._seen - self._last_trigger < self.refractory:
+            return False
+
+        metrics.incr("scored_hops")
+        features = mfcc(self.window, self.fs)
+        self.last_score = min(subsequence_dtw(t, features) for t in self.templates)
+        if self.last_score < self.threshold:
+            self._last_trigger = self._seen
+            metrics.incr("triggers")
+            return True
+        return False
+
+
+def load_templates(directory=None):
+    directory = directory or cfg.WAKEWORD_TEMPLATE_DIR
+    return [load_wav(p)[0] for p in sorted(glob.glob(os.path.join(directory, "*.wav")))]
+
+
+class WakeWordListener:
+    """
+    Background thread that runs a KeywordSpotter over the shared stream and
+    calls `on_wake()` when the wake word is heard. `on_wake` runs on the
+    listener thread, so spotting pauses until the command is handled.
+    """
+
+    def __init__(self, on_wake, spotter=None):
+        self.on_wake = on_wake
+        self.spotter = spotter or KeywordSpotter(load_templates())
+        self._running = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._running.is_set():
+            return
+        self._running.set()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running.clear()
+
+    @property
+    def running(self):
+        return self._running.is_set()
+
+    def _loop(self):
+        from audio.recorder import get_stream
+
+        stream = get_stream()
+        hop = self.spotter.hop
+        chunk = np.empty(hop, dtype=np.int16)
+        pos = stream.position()
+
+        while self._running.is_set():
+            # sleep for a whole hop instead of polling every block
+            if stream.position() < pos + hop:
+                time.sleep(cfg.WAKEWORD_HOP)
+                continue
+
+            # if we fell behind, skip to the most recent audio
+            pos = max(pos, stream.position() - len(self.spotter.window))
+            if self.spotter.process(stream.read(pos, pos + hop, chunk)):
+                try:
+                    self.on_wake()
+                finally:
+                    self.spotter.reset()
+                    pos = stream.position()
+                continue
+            pos += hop
+
+
+# -----------------------------
+# Enrollment
+# -----------------------------
+def enroll(count=3, directory=None):
+    from audio.recorder import listen_utterance, write_wav
+    from audio.preprocess import trim_silence
+
+    directory = directory or cfg.WAKEWORD_TEMPLATE_DIR
+    os.makedirs(directory, exist_ok=True)
+    existing = len(glob.glob(os.path.join(directory, "*.wav")))
+
+    for i in range(count):
+        input(f"Press Enter and say the wake word ({i + 1}/{count})...")
+        samples, _ = listen_utterance("confirm")
+        samples = trim_silence(samples)
+        if not len(samples):
+            print("No speech detected, skipped.")
+            continue
+        path = os.path.join(directory, f"template_{existing + i:02d}.wav")
+        write_wav(path, samples)
+        print("✅ Saved", path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "enroll":
+        enroll(int(sys.argv[2]) if len(sys.argv) > 2 else 3)
+    else:
+        print(__doc__)
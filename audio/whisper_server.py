@@ -0,0 +1,266 @@
+import atexit
+import os
+import queue
+import socket
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+import config.settings as cfg
+
+
+class WhisperServerError(RuntimeError):
+    pass
+
+
+class WhisperServer:
+    """
+    Owns one whisper-server process so the model is loaded once and every
+    utterance costs a single HTTP request instead of a full process spawn.
+    """
+
+    def __init__(self, model=None, host=None, port=None, threads=None):
+        self.model = model or cfg.WHISPER_MODEL
+        self.host = host or cfg.WHISPER_SERVER_HOST
+        self.port = port or cfg.WHISPER_SERVER_PORT
+        self.threads = threads or cfg.WHISPER_THREADS
+        self.restarts = 0
+
+        self._proc = None
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def is_running(self):
+        return self._proc is not None and self._proc.poll() is None
+
+    # -----------------------------
+    # Process lifecycle
+    # -----------------------------
+    def start(self):
+        with self._lock:
+            self._start_locked()
+
+    def stop(self):
+        with self._lock:
+            self._stop_locked()
+
+    def restart(self, reason=""):
+        with self._lock:
+            print(f"⚠️ Restarting whisper-server {reason}".rstrip())
+            self._stop_locked()
+            self.restarts += 1
+            self._start_locked()
+
+    def _start_locked(self):
+        if self.is_running() and self.healthy():
+            return
+
+        self._stop_locked()
+
+        cmd = [
+            cfg.WHISPER_SERVER_BIN,
+            "-m", self.model,
+            "--host", self.host,
+            "--port", str(self.port),
+        ]
+        if self.threads:
+            cmd += ["-t", str(self.threads)]
+
+        try:
+            self._proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+        except OSError as e:
+            raise WhisperServerError(f"could not launch whisper-server: {e}") from e
+
+        # Health check: wait until the model is loaded and /health says ok
+        deadline = time.monotonic() + cfg.WHISPER_SERVER_STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            code = self._proc.poll()
+            if code is not None:
+                self._proc = None
+                raise WhisperServerError(f"whisper-server exited during startup (code {code})")
+            if self.healthy():
+                print(f"✅ whisper-server ready on {self.url}")
+                return
+            time.sleep(0.1)
+
+        self._stop_locked()
+        raise WhisperServerError("whisper-server did not become healthy in time")
+
+    def _stop_locked(self):
+        if self._proc is None:
+            return
+        if self._proc.poll() is None:
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+        self._proc = None
+
+    def healthy(self):
+        """
+        True once the server has finished loading the model.
+        /health answers 503 while loading and 200 when ready.
+        """
+        try:
+            r = self._session.get(self.url + "/health", timeout=1)
+            return r.status_code == 200
+        except requests.RequestException:
+            return False
+
+    # -----------------------------
+    # Requests
+    # -----------------------------
+    def inference(self, wav_bytes: bytes, **params):
+        """
+        POST a WAV payload to /inference and return the decoded JSON.
+        Restarts the server if it died or stopped answering.
+        """
+        params.setdefault("response_format", "json")
+        attempts = 0
+
+        while True:
+            if not self.is_running():
+                self.restart("(process not running)")
+
+            try:
+                r = self._session.post(
+                    self.url + "/inference",
+                    files={"file": ("audio.wav", wav_bytes, "audio/wav")},
+                    data=params,
+                    timeout=cfg.WHISPER_SERVER_REQUEST_TIMEOUT
+                )
+                r.raise_for_status()
+                return r.json()
+
+            except requests.HTTPError as e:
+                raise WhisperServerError(f"whisper-server rejected request: {e}") from e
+
+            except (requests.ConnectionError, requests.Timeout) as e:
+                attempts += 1
+                if attempts > cfg.WHISPER_SERVER_MAX_RESTARTS:
+                    raise WhisperServerError(f"whisper-server unavailable: {e}") from e
+                self.restart(f"(request failed: {e})")
+
+    def transcribe(self, wav_bytes: bytes, **params) -> str:
+        data = self.inference(wav_bytes, **params)
+        return (data.get("text") or "").strip()
+
+
+# -----------------------------
+# Shared instances
+# -----------------------------
+_servers = {}
+_server_lock = threading.Lock()
+_last_failure = {}
+
+# don't retry a failed startup on every utterance
+_RETRY_AFTER = 60
+
+
+def free_port(host=None):
+    """A TCP port the OS says is free now, for a short-lived server."""
+    with socket.socket() as s:
+        s.bind((host or cfg.WHISPER_SERVER_HOST, 0))
+        return s.getsockname()[1]
+
+
+def _tier_config(tier):
+    if tier == "fast":
+        return {"model": cfg.WHISPER_FAST_MODEL, "port": cfg.WHISPER_FAST_PORT}
+    return {"model": cfg.WHISPER_MODEL, "port": cfg.WHISPER_SERVER_PORT}
+
+
+def get_server(tier="accurate"):
+    """
+    Return the process-wide WhisperServer for a model tier ("accurate" is
+    WHISPER_MODEL, "fast" is WHISPER_FAST_MODEL), starting it on first use.
+    """
+    with _server_lock:
+        server = _servers.get(tier)
+        if server is None:
+            failed_at = _last_failure.get(tier)
+            if failed_at and time.monotonic() - failed_at < _RETRY_AFTER:
+                raise WhisperServerError(f"whisper-server ({tier}) failed to start recently")
+            server = WhisperServer(**_tier_config(tier))
+            try:
+                server.start()
+            except WhisperServerError:
+                _last_failure[tier] = time.monotonic()
+                raise
+            atexit.register(server.stop)
+            _servers[tier] = server
+        return server
+
+
+class WhisperServerPool:
+    """
+    Several whisper-servers, each limited to a share of the cores, so
+    independent clips can be decoded in parallel.
+    """
+
+    def __init__(self, size, base_port, threads=None):
+        threads = threads or max(1, (os.cpu_count() or 1) // size)
+        self.servers = [WhisperServer(port=base_port + i, threads=threads) for i in range(size)]
+        self._idle = queue.Queue()
+
+    def start(self):
+        errors = []
+
+        def _start(server):
+            try:
+                server.start()
+                self._idle.put(server)
+            except WhisperServerError as e:
+                errors.append(e)
+
+        # load the models concurrently
+        threads = [threading.Thread(target=_start, args=(s,)) for s in self.servers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.size = self._idle.qsize()
+        if not self.size:
+            raise WhisperServerError(f"no whisper-server in the pool started: {errors[0]}")
+
+    def stop(self):
+        for server in self.servers:
+            server.stop()
+
+    @contextmanager
+    def checkout(self):
+        server = self._idle.get()
+        try:
+            yield server
+        finally:
+            self._idle.put(server)
+
+
+_pool = None
+
+
+def get_pool():
+    """
+    Return the shared dictation pool (DICTATION_WORKERS servers).
+    """
+    global _pool
+    with _server_lock:
+        if _pool is None:
+            size = cfg.DICTATION_WORKERS or max(1, min(4, (os.cpu_count() or 2) // 2))
+            pool = WhisperServerPool(size, cfg.DICTATION_BASE_PORT)
+            pool.start()
+            atexit.register(pool.stop)
+            _pool = pool
+        return _pool
@@ -0,0 +1,33 @@
+"""
+Run the fixture set through the fast/accurate whisper cascade and print
+per-tier latency and escalation counters, for tuning
+WHISPER_ESCALATE_LOGPROB on this machine.
+
+Usage:
+  python -m benchmarks.bench_cascade [fixture_dir]
+"""
+
+import sys
+
+from audio.cascade import transcribe_utterance, cascade_stats
+from benchmarks.common import load_fixtures
+
+
+def main(argv):
+    directory = argv[1] if len(argv) > 1 else None
+
+    for name, samples, fs, _ in load_fixtures(directory):
+        result = transcribe_utterance(samples, fs)
+        lp = "n/a" if result["logprob"] is None else f"{result['logprob']:.2f}"
+        print(f"{name:<28} {result['tier'] or '-':<9} logprob {lp:>6}  {result['text']!r}")
+
+    stats = cascade_stats()
+    print(f"\nutterances: {stats['utterances']}   escalation rate: {stats['escalation_rate']:.0%}")
+    for key, value in sorted(stats["counters"].items()):
+        print(f"  {key}: {value}")
+    for key, s in sorted(stats["latency"].items()):
+        print(f"  {key}: p50 {s['p50'] * 1000:.0f} ms  p95 {s['p95'] * 1000:.0f} ms  (n={s['n']})")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
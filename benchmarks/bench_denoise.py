@@ -0,0 +1,117 @@
+"""
+Cost and benefit of the capture-path denoiser.
+
+CPU:     per-block processing time vs block duration, and RTF over the
+         fixture set (denoise time / audio length)
+Benefit: every fixture is mixed with noise at several SNRs and transcribed
+         raw and denoised; a turn whose WER against the clean transcript
+         exceeds RETRY_WER counts as a retry (re-prompt or "other" intent)
+
+Noise comes from benchmarks/noise/*.wav when present (recorded desk/fan
+noise), otherwise synthetic white + hum + low-frequency rumble.
+
+Usage:
+  python -m benchmarks.bench_denoise [fixture_dir] [snr_db,...]
+"""
+
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+
+import config.settings as cfg
+from audio.denoise import StreamingDenoiser, denoise
+from audio.pcm import load_wav
+from audio.transcriber import transcribe_pcm
+from audio.tune import word_error_rate
+from benchmarks.common import load_fixtures
+
+NOISE_DIR = os.path.join(os.path.dirname(__file__), "noise")
+
+# a transcript this far from the clean one would not parse to the same command
+RETRY_WER = 0.34
+
+
+def synthetic_noise(n, fs, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) / fs
+    white = rng.standard_normal(n)
+    hum = sum(np.sin(2 * np.pi * 50 * k * t) / k for k in (1, 2, 3))
+    rumble = np.cumsum(rng.standard_normal(n))
+    rumble -= np.convolve(rumble, np.ones(400) / 400, mode="same")
+    noise = white + 0.5 * hum + 0.05 * rumble
+    return noise / np.std(noise)
+
+
+def load_noise(n, fs):
+    paths = sorted(glob.glob(os.path.join(NOISE_DIR, "*.wav")))
+    if not paths:
+        return synthetic_noise(n, fs)
+    noise, noise_fs = load_wav(paths[0])
+    if noise_fs != fs:
+        return synthetic_noise(n, fs)
+    noise = np.resize(noise.astype(np.float64), n)
+    return noise / (np.std(noise) or 1.0)
+
+
+def mix(samples, fs, snr_db):
+    clean = samples.astype(np.float64)
+    level = np.sqrt(np.mean(clean ** 2)) or 1.0
+    noisy = clean + load_noise(len(clean), fs) * level / (10 ** (snr_db / 20))
+    return np.clip(noisy, -32768, 32767).astype(np.int16)
+
+
+def cpu_cost(fixtures):
+    block = cfg.AUDIO_BLOCK_SIZE
+    per_block, total, audio = [], 0.0, 0.0
+    for _, samples, fs, _ in fixtures:
+        den = StreamingDenoiser(fs)
+        for i in range(0, len(samples) - block + 1, block):
+            start = time.perf_counter()
+            den.process(samples[i:i + block])
+            elapsed = time.perf_counter() - start
+            per_block.append(elapsed)
+            total += elapsed
+        audio += len(samples) / fs
+
+    block_ms = block / cfg.AUDIO_SAMPLE_RATE * 1000
+    print(f"per block ({block_ms:.0f} ms of audio): "
+          f"p50 {np.median(per_block) * 1e6:.0f} us, p99 {np.percentile(per_block, 99) * 1e6:.0f} us")
+    print(f"RTF {total / audio:.4f}\n")
+
+
+def main(argv):
+    directory = argv[1] if len(argv) > 1 else None
+    snrs = [float(v) for v in argv[2].split(",")] if len(argv) > 2 else [20, 10, 5, 0]
+
+    fixtures = [f for f in load_fixtures(directory) if f[2] == cfg.AUDIO_SAMPLE_RATE]
+    if not fixtures:
+        print("No 16 kHz fixtures found.")
+        return
+
+    cpu_cost(fixtures)
+
+    print(f"{'SNR dB':>7}{'turns':>7}{'retries raw':>13}{'retries denoised':>18}{'WER raw':>9}{'WER den':>9}")
+    for snr in snrs:
+        raw_retries = den_retries = 0
+        raw_wer, den_wer = [], []
+        for _, samples, fs, reference in fixtures:
+            reference = reference or transcribe_pcm(samples, fs)
+            if not reference.strip():
+                continue
+            noisy = mix(samples, fs, snr)
+            w_raw = word_error_rate(reference, transcribe_pcm(noisy, fs))
+            w_den = word_error_rate(reference, transcribe_pcm(denoise(noisy, fs), fs))
+            raw_wer.append(w_raw)
+            den_wer.append(w_den)
+            raw_retries += w_raw > RETRY_WER
+            den_retries += w_den > RETRY_WER
+        if raw_wer:
+            print(f"{snr:7.0f}{len(raw_wer):7d}{raw_retries:13d}{den_retries:18d}"
+                  f"{np.mean(raw_wer):9.3f}{np.mean(den_wer):9.3f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,65 @@
+"""
+Wall-clock transcription time for a long dictation, one whisper-server vs
+a pool of N, using the same segmentation and stitching as the app.
+
+The dictation is built by concatenating the fixtures with short pauses
+until it is about a minute long.
+
+Usage:
+  python -m benchmarks.bench_dictation [fixture_dir] [seconds]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+import config.settings as cfg
+import audio.whisper_server as ws
+from audio.dictation import transcribe_dictation
+from audio.vad import speech_segments
+from benchmarks.common import load_fixtures
+
+
+def build_dictation(directory, seconds):
+    clips = [samples for _, samples, fs, _ in load_fixtures(directory)
+             if fs == cfg.AUDIO_SAMPLE_RATE]
+    if not clips:
+        return None
+    pause = np.zeros(int(0.6 * cfg.AUDIO_SAMPLE_RATE), dtype=np.int16)
+    parts, total = [], 0
+    while total < seconds * cfg.AUDIO_SAMPLE_RATE:
+        for clip in clips:
+            parts += [clip, pause]
+            total += len(clip) + len(pause)
+    return np.concatenate(parts)
+
+
+def main(argv):
+    directory = argv[1] if len(argv) > 1 else None
+    seconds = float(argv[2]) if len(argv) > 2 else 60
+
+    samples = build_dictation(directory, seconds)
+    if samples is None:
+        print("No 16 kHz fixtures found.")
+        return
+    duration = len(samples) / cfg.AUDIO_SAMPLE_RATE
+    print(f"dictation {duration:.1f}s, {len(speech_segments(samples))} segments\n")
+
+    print(f"{'servers':>8}{'wall s':>9}{'RTF':>7}")
+    for size in (1, 2, 4):
+        cfg.DICTATION_WORKERS = size
+        ws._pool = None
+        pool = ws.get_pool()
+        try:
+            start = time.perf_counter()
+            transcribe_dictation(samples)
+            wall = time.perf_counter() - start
+        finally:
+            pool.stop()
+            ws._pool = None
+        print(f"{size:8d}{wall:9.2f}{wall / duration:7.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
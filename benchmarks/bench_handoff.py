@@ -0,0 +1,80 @@
+"""
+Per-utterance cost of the capture -> ASR handoff: the old temp WAV + .txt
+sidecar round trip vs encoding the PCM buffer in memory. Only the I/O is
+measured; whisper itself is not run.
+
+Usage:
+  python -m benchmarks.bench_handoff [seconds] [runs]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+from audio.pcm import to_wav_bytes
+
+
+def file_round_trip(samples, fs):
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+        audio_file = tmp.name
+
+    wf = wave.open(audio_file, "wb")
+    wf.setnchannels(1)
+    wf.setsampwidth(2)
+    wf.setframerate(fs)
+    wf.writeframes(samples.tobytes())
+    wf.close()
+
+    # whisper reads the WAV back and writes <file>.wav.txt
+    with open(audio_file, "rb") as f:
+        payload = f.read()
+    with open(audio_file + ".txt", "w", encoding="utf-8") as f:
+        f.write("placeholder transcript")
+    with open(audio_file + ".txt", "r", encoding="utf-8") as f:
+        f.read()
+
+    os.remove(audio_file)
+    os.remove(audio_file + ".txt")
+    return payload
+
+
+def in_memory(samples, fs):
+    return to_wav_bytes(samples, fs)
+
+
+def _time(fn, samples, fs, runs):
+    out = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(samples, fs)
+        out.append(time.perf_counter() - start)
+    return out
+
+
+def main(argv):
+    seconds = float(argv[1]) if len(argv) > 1 else 5.0
+    runs = int(argv[2]) if len(argv) > 2 else 200
+    fs = 16000
+
+    rng = np.random.default_rng(0)
+    samples = (rng.standard_normal(int(seconds * fs)) * 3000).astype(np.int16)
+
+    assert file_round_trip(samples, fs) == in_memory(samples, fs)
+
+    disk = _time(file_round_trip, samples, fs, runs)
+    mem = _time(in_memory, samples, fs, runs)
+
+    print(f"{seconds:.1f}s utterance, {runs} runs")
+    print(f"temp file round trip  p50 {statistics.median(disk) * 1e6:9.1f} us")
+    print(f"in-memory handoff     p50 {statistics.median(mem) * 1e6:9.1f} us")
+    print(f"saved per utterance       {(statistics.median(disk) - statistics.median(mem)) * 1e6:9.1f} us, "
+          f"{len(samples) * 2 + 44} bytes not written to disk")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
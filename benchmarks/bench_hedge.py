@@ -0,0 +1,87 @@
+"""
+Hedged intent requests: end-to-end latency and local Ollama load for a
+range of hedge delays, to pick cfg.LLM_HEDGE_DELAY.
+
+By default Groq and Ollama are two local stub servers (utils/llm_stub.py).
+The Groq stub usually answers fast, but a --tail fraction of its calls
+stall for --stall seconds. The Ollama stub answers in --local seconds.
+With --live the real endpoints from settings are raced instead.
+
+Usage:
+  python -m benchmarks.bench_hedge [--calls N] [--delays 0,0.3,0.6,1] [--live]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+
+import config.settings as cfg
+import utils.llm_client as llm
+from utils.connectivity import get_monitor
+from utils.llm_stub import StubLLMServer
+
+PROMPT = 'User: "turn the volume up"\n\nReturn JSON only.'
+ANSWER = json.dumps({"intent": "volume_up", "slots": {}})
+
+
+def _groq_responder(fast, tail, stall):
+    def respond(prompt, json_mode):
+        time.sleep(stall if random.random() < tail else random.uniform(*fast))
+        return ANSWER
+    return respond
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=40)
+    parser.add_argument("--delays", default="0,0.3,0.6,1,2")
+    parser.add_argument("--tail", type=float, default=0.15, help="fraction of stalled Groq calls")
+    parser.add_argument("--stall", type=float, default=4.0, help="seconds a stalled Groq call takes")
+    parser.add_argument("--local", type=float, default=0.8, help="seconds the local model takes")
+    parser.add_argument("--live", action="store_true")
+    args = parser.parse_args()
+
+    stubs = []
+    if not args.live:
+        groq = StubLLMServer(responder=_groq_responder((0.2, 0.5), args.tail, args.stall)).start()
+        local = StubLLMServer(latency=args.local, token_delay=0.02, responder=lambda p, j: ANSWER).start()
+        stubs = [groq, local]
+        cfg.GROQ_URL = groq.url + "/openai/v1/chat/completions"
+        cfg.OLLAMA_URL = local.url
+        get_monitor().pin(True)
+
+    client = llm.LLMClient()
+    print(f"{'delay':>6}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}{'ollama started':>16}{'ollama wins':>13}")
+    try:
+        for delay in (float(d) for d in args.delays.split(",")):
+            before = dict(llm.metrics.snapshot()["counters"])
+            times = []
+            for _ in range(args.calls):
+                start = time.perf_counter()
+                try:
+                    client.complete_json(PROMPT, hedge=True, delay=delay)
+                except (llm.LLMError, ValueError):
+                    pass
+                times.append(time.perf_counter() - start)
+
+            after = llm.metrics.snapshot()["counters"]
+            started = after.get("hedge.started.ollama", 0) - before.get("hedge.started.ollama", 0)
+            wins = after.get("hedge.wins.ollama", 0) - before.get("hedge.wins.ollama", 0)
+            times.sort()
+            p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+            print(f"{delay:6.2f}{statistics.median(times) * 1000:9.0f}{p95 * 1000:9.0f}{times[-1] * 1000:9.0f}"
+                  f"{started / args.calls:16.0%}{wins / args.calls:13.0%}")
+    finally:
+        for stub in stubs:
+            stub.stop()
+
+    stats = llm.hedge_stats()
+    print("\nlatency histogram (s):", " ".join(f"<{e}" for e in stats["edges"]), ">=")
+    for name, counts in stats["latency"].items():
+        print(f"  {name:<7}", counts)
+
+
+if __name__ == "__main__":
+    main()
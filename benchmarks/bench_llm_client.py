@@ -0,0 +1,85 @@
+"""
+Per-call overhead of the pooled LLM client vs a new connection per call.
+
+Runs against the local stub server (utils/llm_stub.py) so only client-side
+cost and network setup are measured, not the model. With --live the same
+comparison is made against the real Groq/Ollama endpoints from settings.
+
+Usage:
+  python -m benchmarks.bench_llm_client [--calls N] [--backend groq|ollama] [--live]
+"""
+
+import argparse
+import statistics
+import time
+
+import requests
+
+import config.settings as cfg
+from utils.llm_client import LLMClient
+from utils.llm_stub import StubLLMServer
+
+PROMPT = 'User: "turn the volume up"\n\nReturn JSON only.'
+
+
+def _fresh_call(backend):
+    """The old way: a new connection (and TLS handshake) for every request."""
+    if backend == "groq":
+        r = requests.post(
+            cfg.GROQ_URL,
+            headers={"Authorization": f"Bearer {cfg.GROQ_API_KEY}"},
+            json={"model": cfg.GROQ_MODEL, "messages": [{"role": "user", "content": PROMPT}]},
+            timeout=cfg.LLM_TIMEOUT,
+        )
+    else:
+        r = requests.post(
+            cfg.OLLAMA_URL + "/api/chat",
+            json={"model": cfg.OLLAMA_MODEL, "messages": [{"role": "user", "content": PROMPT}], "stream": False},
+            timeout=cfg.LLM_TIMEOUT,
+        )
+    r.raise_for_status()
+
+
+def _time(fn, calls):
+    times = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _report(name, times):
+    times = sorted(times)
+    p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+    print(f"{name:<22} p50 {statistics.median(times) * 1000:7.1f} ms   p95 {p95 * 1000:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--backend", choices=("groq", "ollama"), default="ollama")
+    parser.add_argument("--live", action="store_true", help="use the real endpoints, not the stub")
+    args = parser.parse_args()
+
+    stub = None
+    if not args.live:
+        stub = StubLLMServer(responder=lambda prompt, json_mode: '{"intent": "volume_up"}').start()
+        stub.install()
+
+    try:
+        client = LLMClient()
+        call = getattr(client, args.backend)
+        call(PROMPT, json_mode=True)  # open the pooled connection
+
+        print(f"{args.calls} calls to {args.backend} ({'live' if args.live else 'stub'})")
+        _report("new connection", _time(lambda: _fresh_call(args.backend), args.calls))
+        _report("pooled client", _time(lambda: call(PROMPT, json_mode=True), args.calls))
+        _report("pooled, streamed", _time(lambda: call(PROMPT, json_mode=True, on_token=lambda t: None), args.calls))
+    finally:
+        if stub:
+            stub.stop()
+
+
+if __name__ == "__main__":
+    main()
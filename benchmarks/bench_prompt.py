@@ -0,0 +1,92 @@
+"""
+Monolithic INTENT_PROMPT vs the dynamic few-shot prompt.
+
+Always reports the (estimated) prompt tokens per request for both. With
+--live it also sends every request to the LLM with each prompt and reports
+p50 latency and how often the two prompts agree on the intent.
+
+Requests are paraphrases below plus the reference transcripts of the
+benchmark fixtures, when present.
+
+Usage:
+  python -m benchmarks.bench_prompt [--live] [--backend groq|ollama] [--k N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import config.settings as cfg
+from nlu.intent_extrator import extract_intent_groq, extract_intent_ollama, monolithic_prompt
+from nlu.prompt_builder import build_prompt, estimate_tokens
+from benchmarks.common import load_fixtures
+
+REQUESTS = [
+    "turn the sound down a bit",
+    "make the screen brighter",
+    "set brightness to 40 percent",
+    "skip this song",
+    "how hot is it in Hyderabad today",
+    "email Raj that I will be late",
+    "set up a meeting with Prasanth on Friday at 4pm",
+    "how much memory am I using",
+    "put the laptop to sleep",
+    "write a java program to reverse a string in main file",
+    "run the index html file",
+    "open visual studio code",
+]
+
+
+def _call(backend, prompt):
+    fn = extract_intent_groq if backend == "groq" else extract_intent_ollama
+    start = time.perf_counter()
+    try:
+        intent = fn(prompt).get("intent")
+    except Exception as e:
+        intent = f"error: {type(e).__name__}"
+    return intent, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--live", action="store_true", help="call the LLM with both prompts")
+    parser.add_argument("--backend", choices=("groq", "ollama"), default="groq")
+    parser.add_argument("--k", type=int, default=None, help="examples in the dynamic prompt")
+    args = parser.parse_args()
+    if args.k:
+        cfg.PROMPT_EXAMPLES_K = args.k
+
+    requests = REQUESTS + [ref for _, _, _, ref in load_fixtures(fallback=False) if ref]
+
+    mono_tokens, dyn_tokens, mono_lat, dyn_lat = [], [], [], []
+    agree = 0
+    header = f"{'request':<52}{'mono tok':>9}{'dyn tok':>8}"
+    if args.live:
+        header += f"{'mono ms':>9}{'dyn ms':>8}  intents"
+    print(header)
+
+    for text in requests:
+        mono, dyn = monolithic_prompt(text), build_prompt(text)
+        mono_tokens.append(estimate_tokens(mono))
+        dyn_tokens.append(estimate_tokens(dyn))
+        line = f"{text[:51]:<52}{mono_tokens[-1]:9d}{dyn_tokens[-1]:8d}"
+
+        if args.live:
+            m_intent, m_sec = _call(args.backend, mono)
+            d_intent, d_sec = _call(args.backend, dyn)
+            mono_lat.append(m_sec)
+            dyn_lat.append(d_sec)
+            agree += m_intent == d_intent
+            line += f"{m_sec * 1000:9.0f}{d_sec * 1000:8.0f}  {m_intent} / {d_intent}"
+        print(line)
+
+    print(f"\nprompt tokens  mono {np.mean(mono_tokens):.0f}  dynamic {np.mean(dyn_tokens):.0f} "
+          f"({1 - np.mean(dyn_tokens) / np.mean(mono_tokens):.0%} smaller)")
+    if args.live:
+        print(f"p50 latency    mono {np.median(mono_lat) * 1000:.0f} ms  dynamic {np.median(dyn_lat) * 1000:.0f} ms")
+        print(f"same intent    {agree}/{len(requests)}")
+
+
+if __name__ == "__main__":
+    main()
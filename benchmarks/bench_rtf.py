@@ -0,0 +1,59 @@
+"""
+Real-time factor of whisper on a fixed fixture set, before and after the
+preprocessing stage (silence trimming + audio context sized to the speech).
+
+RTF = decode time / original clip length; lower is better.
+
+Usage:
+  python -m benchmarks.bench_rtf [fixture_dir] [runs]
+"""
+
+import sys
+import time
+
+from audio.transcriber import transcribe_pcm
+from audio.whisper_server import get_server
+from benchmarks.common import load_fixtures
+
+
+def _rtf(samples, fs, preprocess, runs):
+    best = None
+    text = ""
+    for _ in range(runs):
+        start = time.perf_counter()
+        text = transcribe_pcm(samples, fs, preprocess=preprocess)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / (len(samples) / fs), text
+
+
+def main(argv):
+    directory = argv[1] if len(argv) > 1 else None
+    runs = int(argv[2]) if len(argv) > 2 else 3
+
+    fixtures = load_fixtures(directory)
+    if not fixtures:
+        print("No fixtures found.")
+        return
+
+    # load the model before timing anything
+    get_server()
+
+    print(f"{'fixture':<28}{'secs':>7}{'RTF before':>12}{'RTF after':>12}")
+    before_total = after_total = audio_total = 0.0
+    for name, samples, fs, _ in fixtures:
+        seconds = len(samples) / fs
+        before, _ = _rtf(samples, fs, False, runs)
+        after, _ = _rtf(samples, fs, True, runs)
+        print(f"{name:<28}{seconds:7.2f}{before:12.3f}{after:12.3f}")
+
+        before_total += before * seconds
+        after_total += after * seconds
+        audio_total += seconds
+
+    print(f"{'aggregate':<28}{audio_total:7.2f}"
+          f"{before_total / audio_total:12.3f}{after_total / audio_total:12.3f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
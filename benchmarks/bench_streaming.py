@@ -0,0 +1,82 @@
+"""
+End-of-speech -> action latency with and without streaming partials,
+replayed offline over the fixture set.
+
+Batch path:     speech end + trailing-silence window + full decode + intent
+Streaming path: the first stable partial that matches a known command,
+                decoded every STREAMING_STEP seconds of audio
+
+Both paths use the real whisper-server and intent code; only the
+passage of audio time is simulated.
+
+Usage:
+  python -m benchmarks.bench_streaming [fixture_dir]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+import config.settings as cfg
+from audio.preprocess import speech_span
+from audio.streaming import decode_partial, PartialTracker
+from audio.transcriber import transcribe_pcm
+from nlu.fast_intent import match_command
+from nlu.intent_extrator import extract_intent
+from benchmarks.common import load_fixtures
+
+
+def batch_latency(samples, fs):
+    start = time.perf_counter()
+    text = transcribe_pcm(samples, fs)
+    extract_intent(text)
+    compute = time.perf_counter() - start
+    return cfg.VAD_PROFILES["command"]["silence"] + compute
+
+
+def streaming_latency(samples, fs, speech_end):
+    """
+    Seconds from end of speech to early dispatch (negative = before the
+    user finished), or None when no partial matched.
+    """
+    step = int(cfg.STREAMING_STEP * fs)
+    tracker = PartialTracker()
+    for pos in range(step, len(samples) + step, step):
+        pos = min(pos, len(samples))
+        start = time.perf_counter()
+        stable = tracker.update(decode_partial(samples[:pos], fs))
+        hit = stable and match_command(stable)
+        compute = time.perf_counter() - start
+        if hit:
+            return pos / fs + compute - speech_end
+    return None
+
+
+def main(argv):
+    directory = argv[1] if len(argv) > 1 else None
+
+    batch, streaming = [], []
+    print(f"{'fixture':<28}{'batch ms':>10}{'stream ms':>11}")
+    for name, samples, fs, _ in load_fixtures(directory):
+        span = speech_span(samples, fs)
+        if span is None:
+            continue
+        speech_end = span[1] / fs
+
+        b = batch_latency(samples, fs)
+        s = streaming_latency(samples, fs, speech_end)
+        batch.append(b)
+        if s is not None:
+            streaming.append(s)
+        s_txt = f"{s * 1000:11.0f}" if s is not None else f"{'no match':>11}"
+        print(f"{name:<28}{b * 1000:10.0f}{s_txt}")
+
+    if batch:
+        print(f"\nbatch      p50 {np.median(batch) * 1000:6.0f} ms  (n={len(batch)})")
+    if streaming:
+        print(f"streaming  p50 {np.median(streaming) * 1000:6.0f} ms  (n={len(streaming)} early dispatches)")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,70 @@
+"""
+Per-utterance transcription latency: cold whisper-cli spawn vs the
+persistent whisper-server.
+
+Usage:
+  python -m benchmarks.bench_transcriber [audio.wav] [runs]
+"""
+
+import statistics
+import sys
+import time
+
+from audio.transcriber import transcribe_wav_bytes_cli
+from audio.whisper_server import WhisperServer
+
+
+def _summary(name, samples):
+    return (
+        f"{name:<18} mean {statistics.mean(samples) * 1000:8.1f} ms   "
+        f"p50 {statistics.median(samples) * 1000:8.1f} ms   "
+        f"min {min(samples) * 1000:8.1f} ms"
+    )
+
+
+def bench_cli(wav_bytes, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        transcribe_wav_bytes_cli(wav_bytes)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_server(wav_bytes, runs):
+    server = WhisperServer()
+    start = time.perf_counter()
+    server.start()
+    startup = time.perf_counter() - start
+
+    samples = []
+    try:
+        for _ in range(runs):
+            start = time.perf_counter()
+            server.transcribe(wav_bytes)
+            samples.append(time.perf_counter() - start)
+    finally:
+        server.stop()
+    return startup, samples
+
+
+def main(argv):
+    audio_file = argv[1] if len(argv) > 1 else "Release/audio.wav"
+    runs = int(argv[2]) if len(argv) > 2 else 5
+
+    print(f"Benchmarking {audio_file} ({runs} runs)\n")
+
+    with open(audio_file, "rb") as f:
+        wav_bytes = f.read()
+
+    cli = bench_cli(wav_bytes, runs)
+    startup, server = bench_server(wav_bytes, runs)
+
+    print(_summary("whisper-cli", cli))
+    print(_summary("whisper-server", server))
+    print(f"\nserver startup (one-off): {startup * 1000:.1f} ms")
+    print(f"speedup per utterance: {statistics.mean(cli) / statistics.mean(server):.2f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,77 @@
+"""
+Wake-word spotter: idle CPU, detection latency and false-trigger rate.
+
+Fixtures:
+  benchmarks/fixtures/wakeword/positive/*.wav   clips containing the wake word
+  benchmarks/fixtures/wakeword/negative/*.wav   speech/noise without it
+Templates come from config.settings.WAKEWORD_TEMPLATE_DIR.
+
+Usage:
+  python -m benchmarks.bench_wakeword [fixture_dir]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+import config.settings as cfg
+from audio.preprocess import speech_span
+from audio.wakeword import KeywordSpotter, load_templates
+from benchmarks.common import FIXTURE_DIR, load_fixtures
+
+
+def _run(spotter, samples):
+    """Feed samples hop by hop; return trigger sample offsets and CPU seconds."""
+    spotter.reset()
+    hop = spotter.hop
+    triggers = []
+    cpu = time.process_time()
+    for start in range(0, len(samples) - hop + 1, hop):
+        if spotter.process(samples[start:start + hop]):
+            triggers.append(start + hop)
+    return triggers, time.process_time() - cpu
+
+
+def main(argv):
+    base = argv[1] if len(argv) > 1 else os.path.join(FIXTURE_DIR, "wakeword")
+    fs = cfg.AUDIO_SAMPLE_RATE
+    spotter = KeywordSpotter(load_templates(), fs)
+
+    # idle: a minute of quiet room noise
+    rng = np.random.default_rng(0)
+    quiet = (rng.standard_normal(60 * fs) * 60).astype(np.int16)
+    _, cpu = _run(spotter, quiet)
+    print(f"idle CPU (quiet room)      {cpu / 60 * 100:6.2f} % of one core")
+
+    positives = load_fixtures(os.path.join(base, "positive"), fallback=False)
+    latencies, hits = [], 0
+    for name, samples, _, _ in positives:
+        padded = np.concatenate([samples, np.zeros(fs, dtype=np.int16)])
+        triggers, _ = _run(spotter, padded)
+        span = speech_span(samples, fs)
+        if triggers and span:
+            hits += 1
+            latencies.append((triggers[0] - span[1]) / fs)
+    if positives:
+        print(f"detection rate             {hits}/{len(positives)}")
+    if latencies:
+        print(f"detection latency          p50 {np.median(latencies) * 1000:6.0f} ms   "
+              f"max {max(latencies) * 1000:6.0f} ms")
+
+    negatives = load_fixtures(os.path.join(base, "negative"), fallback=False)
+    false_triggers, seconds, cpu_total = 0, 0.0, 0.0
+    for name, samples, _, _ in negatives:
+        triggers, cpu = _run(spotter, samples)
+        false_triggers += len(triggers)
+        seconds += len(samples) / fs
+        cpu_total += cpu
+    if seconds:
+        print(f"false triggers             {false_triggers} in {seconds / 60:.1f} min "
+              f"({false_triggers / seconds * 3600:.1f}/hour)")
+        print(f"CPU on negatives           {cpu_total / seconds * 100:6.2f} % of one core")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,40 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+
+import glob
+import os
+
+from audio.pcm import load_wav
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+DEFAULT_FIXTURE = "Release/audio.wav"
+
+
+def fixture_paths(directory=None, fallback=True):
+    """
+    WAV fixtures from `directory` (default benchmarks/fixtures), falling back
+    to the bundled Release/audio.wav when the directory is empty.
+    """
+    directory = directory or FIXTURE_DIR
+    paths = sorted(glob.glob(os.path.join(directory, "**", "*.wav"), recursive=True))
+    if not paths and fallback and os.path.exists(DEFAULT_FIXTURE):
+        paths = [DEFAULT_FIXTURE]
+    return paths
+
+
+def load_fixtures(directory=None, fallback=True):
+    """
+    [(name, int16 samples, fs, reference transcript or None)]
+    A reference transcript is read from <name>.txt next to the WAV.
+    """
+    fixtures = []
+    for path in fixture_paths(directory, fallback):
+        samples, fs = load_wav(path)
+        ref_path = os.path.splitext(path)[0] + ".txt"
+        reference = None
+        if os.path.exists(ref_path):
+            with open(ref_path, "r", encoding="utf-8") as f:
+                reference = f.read().strip()
+        fixtures.append((os.path.basename(path), samples, fs, reference))
+    return fixtures
@@ -23,3 +23,304 @@ GOOGLE_CREDENTIALS_PATH = os.path.join(BASE_DIR, "googlecredentials.json")
 GOOGLE_TOKEN_PATH = os.path.join(BASE_DIR, "token.json")
 
 GOOGLE_SCOPES = ["https://www.googleapis.com/auth/calendar"]
+
+# ---------------- WHISPER SERVER ----------------
+# "server" keeps one whisper-server process (and the model) loaded between
+# utterances; "cli" spawns whisper-cli for every utterance.
+WHISPER_BACKEND = "server"
+
+WHISPER_SERVER_BIN = "Release/whisper-server.exe"
+WHISPER_SERVER_HOST = "127.0.0.1"
+WHISPER_SERVER_PORT = 8178
+
+# seconds to wait for the model to load before giving up
+WHISPER_SERVER_STARTUP_TIMEOUT = 30
+WHISPER_SERVER_REQUEST_TIMEOUT = 30
+
+# restarts attempted per request before falling back to whisper-cli
+WHISPER_SERVER_MAX_RESTARTS = 2
+
+# ---------------- AUDIO CAPTURE ----------------
+AUDIO_SAMPLE_RATE = 16000
+
+# frames delivered per InputStream callback
+AUDIO_BLOCK_SIZE = 512
+
+# how much history the always-open ring buffer keeps
+AUDIO_RING_SECONDS = 75
+
+# audio kept from before a capture starts, so the first word isn't clipped
+AUDIO_PRE_ROLL = 0.5
+
+# ---------------- VOICE ACTIVITY ENDPOINTING ----------------
+# Recording starts counting at speech onset and stops after `silence`
+# seconds of trailing silence, or at the hard `max`. If nobody speaks
+# within `start_timeout` seconds the capture is dropped.
+VAD_PROFILES = {
+    "command":   {"silence": 0.7, "max": 8,  "start_timeout": 6},
+    "confirm":   {"silence": 0.4, "max": 3,  "start_timeout": 4},
+    "dictation": {"silence": 1.5, "max": 60, "start_timeout": 8},
+}
+
+VAD_FRAME_MS = 20
+
+# consecutive speech frames needed before we call it an onset
+VAD_ONSET_FRAMES = 3
+
+# int16 RMS floor and multiple of the tracked noise level that count as speech
+VAD_MIN_RMS = 300
+VAD_THRESHOLD_RATIO = 3.0
+
+# quiet frames with a zero-crossing rate above this are treated as hiss
+VAD_ZCR_MAX = 0.35
+
+# the old fixed recording window, used to report time saved per turn
+VAD_BASELINE_SECONDS = 5
+
+# ---------------- ASR PREPROCESSING ----------------
+# Trim leading/trailing silence before decoding and shrink whisper's
+# audio context (1500 frames = 30 s) to the remaining speech length.
+WHISPER_TRIM_SILENCE = True
+WHISPER_DYNAMIC_AUDIO_CTX = True
+
+# seconds of audio kept around the detected speech when trimming
+TRIM_PAD_SECONDS = 0.15
+
+# very small contexts make whisper hallucinate; never go below this
+WHISPER_MIN_AUDIO_CTX = 384
+# extra encoder frames on top of the speech length
+WHISPER_AUDIO_CTX_MARGIN = 64
+
+# ---------------- LISTENING PIPELINE ----------------
+# Overlap capture of the next utterance with transcription and intent
+# handling of the previous one. False keeps the one-at-a-time loop.
+PIPELINED_LISTENING = True
+
+# utterances/transcripts allowed to wait between stages
+PIPELINE_QUEUE_SIZE = 2
+
+# keep the mic gated this long after TTS ends (speaker echo/reverb)
+TTS_GATE_TAIL = 0.25
+
+# ---------------- WAKE WORD ----------------
+# Hands-free mode: a cheap MFCC keyword spotter runs on the capture
+# stream and only wakes whisper after it hears the wake word.
+# Record templates with: python -m audio.wakeword enroll
+WAKEWORD_TEMPLATE_DIR = os.path.join(BASE_DIR, "wakeword")
+
+# mean per-frame MFCC distance below which a window counts as a match
+WAKEWORD_THRESHOLD = 3.0
+
+# how often the spotter looks at new audio (seconds)
+WAKEWORD_HOP = 0.1
+
+# hops quieter than this RMS are skipped without computing features
+WAKEWORD_ENERGY_GATE = 300
+
+# ignore further triggers for this long after one fires
+WAKEWORD_REFRACTORY = 1.5
+
+# ---------------- VOICE CONFIRMATION ----------------
+# Yes/no answers are decoded against a small grammar first; the full
+# transcriber only runs when the grammar match is below this confidence.
+CONFIRM_MIN_CONFIDENCE = 0.6
+
+# ---------------- WHISPER MODEL CASCADE ----------------
+# Decode with a small quantized model first and only re-run the clip on
+# WHISPER_MODEL when the fast result looks unreliable. If WHISPER_FAST_MODEL
+# is not on disk the cascade is turned off at runtime with one warning.
+WHISPER_CASCADE = True
+
+WHISPER_FAST_MODEL = "Release/ggml-tiny.en-q5_1.bin"
+WHISPER_FAST_PORT = 8179
+
+# escalate when the average token log-probability is below this
+WHISPER_ESCALATE_LOGPROB = -0.7
+# ...or when the fast transcript doesn't map to a known intent
+WHISPER_ESCALATE_ON_UNKNOWN_INTENT = True
+
+# ---------------- BATCH TRANSCRIPTION ----------------
+# python -m audio.batch: whisper threads per worker process; the worker
+# count defaults to cpu_count // BATCH_THREADS_PER_WORKER
+BATCH_THREADS_PER_WORKER = 2
+# each worker's whisper-server listens on a port the OS assigns
+
+# ---------------- STREAMING ASR ----------------
+# Decode the growing utterance every STREAMING_STEP seconds while the user
+# is still talking. A partial that is identical in two consecutive decodes
+# and matches a known short command is dispatched before end of speech;
+# the final transcript then confirms or revises it.
+STREAMING_ASR = True
+STREAMING_STEP = 0.5
+
+# ---------------- DICTATION ----------------
+# Long dictation (email bodies, code instructions) is split at pauses and
+# the pieces are decoded in parallel on a pool of whisper-servers.
+# None = one server per 2 cores, at most 4.
+DICTATION_WORKERS = None
+DICTATION_BASE_PORT = 8190
+
+# a pause at least this long is a segment boundary
+DICTATION_MIN_SILENCE = 0.35
+# segments longer than this are cut (with overlap) so work stays balanced
+DICTATION_MAX_SEGMENT = 12
+# audio shared between neighbouring segments; duplicated words are removed
+DICTATION_OVERLAP = 0.3
+
+# ---------------- HOST TUNING ----------------
+# python -m audio.tune sweeps whisper threads, model quantization and the
+# audio-context floor on this machine and writes the winner here; the
+# transcriber applies it at startup (WHISPER_MODEL, WHISPER_THREADS,
+# WHISPER_MIN_AUDIO_CTX, WHISPER_DYNAMIC_AUDIO_CTX).
+WHISPER_PROFILE_PATH = os.path.join(BASE_DIR, "whisper_profile.json")
+WHISPER_USE_PROFILE = True
+
+# whisper threads for the main server and whisper-cli; None = whisper default
+WHISPER_THREADS = None
+
+WHISPER_QUANTIZE_BIN = "Release/quantize.exe"
+WHISPER_TUNE_QUANTS = ["q8_0", "q5_1", "q5_0"]
+WHISPER_TUNE_AUDIO_CTX = [256, 384, 512, 768]
+# below DICTATION_BASE_PORT so a large dictation pool can't reach it
+WHISPER_TUNE_PORT = 8180
+
+# accept a faster setting only if its WER is at most this much worse
+# than the unquantized model at full context
+WHISPER_TUNE_MAX_WER_DELTA = 0.02
+
+# ---------------- CAPTURE & REPLAY ----------------
+# Opt-in: keep every voice turn (raw audio, transcript, intent, per-stage
+# timings) so real usage can be replayed offline with python -m audio.replay.
+# Oldest captures are deleted once the store exceeds CAPTURE_MAX_MB.
+CAPTURE_UTTERANCES = False
+CAPTURE_DIR = os.path.join(os.path.dirname(BASE_DIR), "captures")
+CAPTURE_MAX_MB = 200
+
+# ---------------- NOISE SUPPRESSION ----------------
+# Spectral-gating denoiser run block by block in the capture callback, so
+# the endpointer, wake word and whisper all see the cleaned signal.
+DENOISE_CAPTURE = True
+
+# STFT frame (samples); hop is half a frame and must divide AUDIO_BLOCK_SIZE
+DENOISE_FRAME = 512
+
+# bins are attenuated to at most this gain (0.1 = -20 dB)
+DENOISE_FLOOR = 0.1
+# how many times the noise estimate is subtracted from each bin
+DENOISE_OVER_SUBTRACT = 1.5
+
+# high-pass away any DC offset from cheap mics
+DENOISE_DC_REMOVAL = True
+
+# automatic gain: bring speech blocks towards this RMS, never amplifying
+# more than DENOISE_AGC_MAX_GAIN
+DENOISE_AGC = True
+DENOISE_AGC_TARGET_RMS = 3000
+DENOISE_AGC_MAX_GAIN = 4.0
+
+# ---------------- FAST INTENT PATH ----------------
+# Answer common commands (volume, brightness, music, power, system monitor,
+# code actions) with the deterministic matcher in nlu/fast_intent.py and
+# only call the LLM when it has no match.
+FAST_INTENT_ENABLED = True
+
+# ---------------- EMBEDDING INTENT CLASSIFIER ----------------
+# Paraphrases the fast matcher misses are classified by nearest labelled
+# examples (hashed n-gram vectors, cosine top-k). Examples are seeded from
+# INTENT_PROMPT and grown from executed LLM answers in INTENT_HISTORY_PATH.
+EMBED_INTENT_ENABLED = True
+EMBED_INTENT_DIM = 4096
+EMBED_INTENT_TOP_K = 5
+
+# below this confidence (cosine x vote share) the LLM decides
+EMBED_INTENT_THRESHOLD = 0.55
+
+INTENT_HISTORY_PATH = os.path.join(BASE_DIR, "intent_history.jsonl")
+EMBED_INTENT_HISTORY_MAX = 2000
+
+# ---------------- INTENT CACHE ----------------
+# LLM intent answers cached by canonical transcript (LRU + TTL), saved to
+# disk and dropped whenever INTENT_PROMPT or the LLM models change.
+INTENT_CACHE_ENABLED = True
+INTENT_CACHE_PATH = os.path.join(BASE_DIR, "intent_cache.json")
+INTENT_CACHE_MAX_ENTRIES = 500
+INTENT_CACHE_TTL = 7 * 24 * 3600
+
+# answers with slots resolved relative to "now" are never cached
+INTENT_CACHE_EXCLUDE = {"create_event"}
+
+# ---------------- DYNAMIC INTENT PROMPT ----------------
+# Send the LLM only the PROMPT_EXAMPLES_K examples closest to the request
+# (from nlu/prompts.INTENT_EXAMPLES) and one line of slot rules per intent,
+# instead of the whole INTENT_PROMPT.
+DYNAMIC_INTENT_PROMPT = True
+PROMPT_EXAMPLES_K = 8
+
+# ---------------- LLM CLIENT ----------------
+# every Groq / Ollama call goes through utils/llm_client, which keeps
+# pooled keep-alive HTTP sessions to both
+GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
+OLLAMA_URL = "http://127.0.0.1:11434"
+
+# how long Ollama keeps the model loaded after a request
+OLLAMA_KEEP_ALIVE = "30m"
+
+# seconds; connect timeout, and default read timeout per call
+LLM_CONNECT_TIMEOUT = 3
+LLM_TIMEOUT = 15
+
+# read timeout for code generation, which produces much longer answers
+CODE_GEN_TIMEOUT = 60
+
+# pooled connections per backend
+LLM_POOL_SIZE = 4
+
+# ---------------- HEDGED LLM REQUESTS ----------------
+# Intent requests race Groq and local Ollama: Ollama starts when Groq has
+# not answered within LLM_HEDGE_DELAY seconds (0 = send both at once) and
+# the first valid JSON wins; the other request is aborted.
+# utils/llm_client.hedge_stats() has win rates and latency histograms.
+LLM_HEDGE_ENABLED = True
+LLM_HEDGE_DELAY = 0.6
+
+# ---------------- LLM ROUTING ----------------
+# Each request goes to the backend with the lowest expected cost:
+# EWMA latency + EWMA error rate * LLM_ROUTER_ERROR_PENALTY seconds.
+LLM_ROUTER_ALPHA = 0.3
+LLM_ROUTER_ERROR_PENALTY = 5.0
+
+# assumed latency (seconds) of a backend before it has answered anything
+LLM_ROUTER_PRIOR = {"groq": 0.5, "ollama": 1.5}
+
+# consecutive failures that open a backend's circuit breaker (an HTTP 429
+# opens it at once); after the cooldown a background probe half-opens it,
+# and each failed probe doubles the cooldown up to the maximum
+LLM_BREAKER_FAILURES = 3
+LLM_BREAKER_COOLDOWN = 30
+LLM_BREAKER_MAX_COOLDOWN = 300
+LLM_PROBE_TIMEOUT = 5
+
+# ---------------- CONNECTIVITY ----------------
+# utils/connectivity tracks online/offline in the background. Successful
+# Groq requests count as proof of being online; otherwise one of these
+# hosts is TCP-probed every CONNECTIVITY_PROBE_INTERVAL seconds, or every
+# CONNECTIVITY_OFFLINE_INTERVAL seconds while offline.
+CONNECTIVITY_PROBE_HOSTS = [("8.8.8.8", 53), ("1.1.1.1", 53)]
+CONNECTIVITY_PROBE_TIMEOUT = 2
+CONNECTIVITY_PROBE_INTERVAL = 30
+CONNECTIVITY_OFFLINE_INTERVAL = 5
+
+# ---------------- STREAMED INTENT PARSING ----------------
+# Stream intent answers through a tolerant incremental JSON parser
+# (utils/json_stream) and stop generation as soon as the intent and its
+# slots are complete; prose around the JSON is ignored.
+LLM_STREAM_INTENT = True
+
+# ---------------- COMPOUND COMMANDS ----------------
+# "mute the volume and lock the screen": several intents from one
+# utterance. Independent actions run concurrently (up to
+# COMPOUND_MAX_WORKERS at once), "then" / sequential ones in order, and
+# the results are spoken as one reply.
+COMPOUND_INTENTS = True
+COMPOUND_MAX_INTENTS = 4
+COMPOUND_MAX_WORKERS = 4
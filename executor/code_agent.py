@@ -1,21 +1,12 @@
 import os
 import subprocess
-import socket
-import requests
 import config.settings as cfg
 import webbrowser
+from utils.llm_client import LLMError, get_client, strip_code_fences
 WORKSPACE = r"D:/MajorProject/Testing"
 os.makedirs(WORKSPACE, exist_ok=True)
 
 
-def internet_available():
-    try:
-        socket.create_connection(("8.8.8.8", 53), timeout=2)
-        return True
-    except:
-        return False
-
-
 def open_vscode():
     subprocess.Popen(["code", WORKSPACE], shell=True)
     return "VS Code opened in workspace."
@@ -96,44 +87,12 @@ def generate_code_with_llm(instruction, language):
         f"Return ONLY code."
     )
 
-    # code generation using groq
-    if internet_available():
-        try:
-            headers = {
-                "Authorization": f"Bearer {cfg.GROQ_API_KEY}",
-                "Content-Type": "application/json"
-            }
-
-            payload = {
-                "model": cfg.GROQ_MODEL,
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0.2
-            }
-
-            r = requests.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=10
-            )
-
-            return r.json()["choices"][0]["message"]["content"]
-
-        except Exception as e:
-            print("Groq failed, switching to local LLM:", e)
-
-    # try with local ollama
+    # routed to the backend expected to be fastest, the other as fallback
     try:
-        result = subprocess.run(
-            ["ollama", "run", cfg.OLLAMA_MODEL],
-            input=prompt.encode(),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=True
-        )
-        return result.stdout.decode()
-
-    except Exception as e:
+        code = get_client().complete(prompt, temperature=0.2, timeout=cfg.CODE_GEN_TIMEOUT, kind="code")
+        return strip_code_fences(code)
+
+    except LLMError as e:
         return f"# Code generation failed: {e}"
 
 # code execution
@@ -1,14 +1,13 @@
 
 import smtplib
 import re
-import subprocess
-import json
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 
 from config import EMAIL, EMAIL_PASSWORD     # credentials.json
 import config.settings as cfg               # ollama config
+from utils.llm_client import LLMError, get_client
 from config.contacts import CONTACTS        # your saved contacts
 
 # -----------------------------
@@ -57,15 +56,7 @@ Subject:
     
 
     try:
-        p = subprocess.run(
-            [cfg.OLLAMA_BIN, "run", cfg.OLLAMA_MODEL],
-            input=prompt.encode(),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            
-        )
-
-        out = p.stdout.decode().strip()
+        out = get_client().complete(prompt, timeout=cfg.OLLAMA_TIMEOUT, backends=["ollama"]).strip()
         if not out:
             return None
 
@@ -76,7 +67,7 @@ Subject:
                 return line[:120]  # safety trim
 
         return None
-    except Exception:
+    except LLMError:
         return None
 
 
@@ -4,15 +4,20 @@ volume = AudioUtilities.GetSpeakers().EndpointVolume
 
 def change_volume(slots):
     """
-    slots: dict with "action" key ("increase" or "decrease")
+    slots: dict with "action" key ("increase" or "decrease") and an
+    optional "step" in percent (default 20)
     """
     current = volume.GetMasterVolumeLevelScalar()
     action = slots.get("action")
+    try:
+        step = abs(float(slots.get("step", 20))) / 100.0
+    except (TypeError, ValueError):
+        step = 0.2
 
     if action == "increase":
-        new_level = min(current + 0.2, 1.0)
+        new_level = min(current + step, 1.0)
     elif action == "decrease":
-        new_level = max(current - 0.2, 0.0)
+        new_level = max(current - step, 0.0)
     elif action == "full":
         new_level = 1.0
     elif action == "mute":
@@ -0,0 +1,287 @@
+import json
+import os
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+
+import config.settings as cfg
+from nlu.fast_intent import normalize, prompt_examples, replace_number_words
+from utils.metrics import get_metrics
+
+metrics = get_metrics("embed_intent")
+
+
+# -----------------------------
+# Embedding
+# -----------------------------
+def _features(text: str):
+    """
+    Hashed features of normalized text: words, word bigrams and character
+    3-5 grams inside each word (robust to ASR misspellings).
+    """
+    words = normalize(text).split()
+    feats = list(words)
+    feats += [f"{a}_{b}" for a, b in zip(words, words[1:])]
+    for w in words:
+        w = f"<{w}>"
+        for n in (3, 4, 5):
+            feats += [w[i:i + n] for i in range(len(w) - n + 1)]
+    return feats
+
+
+def embed(texts, dim=None):
+    """
+    L2-normalized hashed n-gram vectors, one row per text (float32).
+    Each feature adds +1 or -1 (from the hash's top bit) to its bucket, so
+    collisions tend to cancel instead of piling up.
+    """
+    dim = dim or cfg.EMBED_INTENT_DIM
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        hashes = np.array([zlib.crc32(f.encode()) for f in _features(text)], dtype=np.uint32)
+        if not hashes.size:
+            continue
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+        np.add.at(out[row], hashes % dim, signs)
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    return out / np.maximum(norms, 1e-9)
+
+
+# -----------------------------
+# Lightweight slot extractors
+# -----------------------------
+def _number(text):
+    m = re.search(r"\b(\d{1,3})\b", text)
+    return min(100, int(m.group(1))) if m else None
+
+
+def _keyword(text, table):
+    for action, words in table.items():
+        if re.search(rf"\b(?:{words})\b", text):
+            return action
+    return None
+
+
+_VOLUME_ACTIONS = {
+    "mute": "mute|silence|silent|no sound",
+    "full": "full|max|maximum|loudest",
+    "increase": "increase|raise|up|louder|more|can't hear|cant hear|not audible",
+    "decrease": "decrease|lower|reduce|down|quieter|less|too loud",
+}
+_BRIGHTNESS_ACTIONS = {
+    "increase": "increase|raise|up|brighter|more|can't see|cant see|too dark",
+    "decrease": "decrease|lower|reduce|down|dim|dimmer|less|too bright",
+}
+_MUSIC_ACTIONS = {
+    "next": "next|skip",
+    "previous": "previous|back|last",
+    "play_pause": "play|pause|resume|stop",
+}
+_POWER_ACTIONS = {
+    "hibernate": "hibernate",
+    "sleep": "sleep|suspend",
+    "lock": "lock|off the screen|screen off",
+}
+_MONITOR_ACTIONS = {
+    "cpu": "cpu|processor",
+    "memory": "ram|memory",
+    "disk": "disk|storage|space",
+    "battery": "battery|charge|charging",
+    "summary": "system|status|summary|everything",
+}
+
+
+def _volume_slots(text, example):
+    n = _number(text)
+    if n is not None and not re.search(r"\bby\b", text):
+        return {"percent": n} if n else {"action": "mute"}
+    action = _keyword(text, _VOLUME_ACTIONS) or example.get("action")
+    return {"action": action} if action else None
+
+
+def _brightness_slots(text, example):
+    n = _number(text)
+    action = _keyword(text, _BRIGHTNESS_ACTIONS)
+    if n is not None and not action:
+        return {"action": "set", "value": n}
+    action = action or example.get("action")
+    if action not in ("increase", "decrease"):
+        return None
+    return {"action": action, "step": n} if n else {"action": action}
+
+
+def _action_slots(table):
+    def extract(text, example):
+        action = _keyword(text, table) or example.get("action")
+        return {"action": action} if action else None
+    return extract
+
+
+def _weather_slots(text, example):
+    slots = {}
+    m = re.search(r"\b(?:in|at|for) ([a-z][a-z ]*?)(?: today| tomorrow| now|$)", text)
+    if m and m.group(1) not in ("today", "tomorrow", "now"):
+        slots["location"] = m.group(1).title()
+    if "tomorrow" in text:
+        slots["datetime"] = "tomorrow"
+    return slots
+
+
+def _vscode_slots(text, example):
+    # other code actions need file names and instructions: leave to the LLM
+    if example.get("action") in ("open_vscode", "close_vscode"):
+        return dict(example)
+    return None
+
+
+# intent -> extractor(normalized text, slots of the nearest example) -> slots
+# or None when the slots can't be filled reliably (the LLM takes over)
+SLOT_EXTRACTORS = {
+    "change_volume": _volume_slots,
+    "change_brightness": _brightness_slots,
+    "music_control": _action_slots(_MUSIC_ACTIONS),
+    "power_action": _action_slots(_POWER_ACTIONS),
+    "system_monitor": _action_slots(_MONITOR_ACTIONS),
+    "get_weather": _weather_slots,
+    "code_action": _vscode_slots,
+}
+
+
+# -----------------------------
+# Classifier
+# -----------------------------
+class IntentClassifier:
+    """
+    Nearest-neighbour intent classifier over labelled example utterances.
+
+    Examples are embedded once into a matrix; a query is one mat-vec
+    (cosine similarity against every example) plus an argpartition top-k.
+    Each intent's score is the summed similarity of its examples among the
+    top k; confidence is the best neighbour's similarity scaled by that
+    intent's share of the top-k vote.
+    """
+
+    def __init__(self, examples=None, history_path=None):
+        self.history_path = history_path or cfg.INTENT_HISTORY_PATH
+        self._lock = threading.Lock()
+        self.texts, self.labels = [], []
+        self.matrix = np.zeros((0, cfg.EMBED_INTENT_DIM), dtype=np.float32)
+
+        seed = examples if examples is not None else prompt_examples(intents=None)
+        self._add(list(seed), [dict(v) for v in seed.values()])
+        self._add(*self._load_history())
+
+    def _add(self, texts, labels):
+        if not texts:
+            return
+        with self._lock:
+            known = set(self.texts)
+            pairs = [(t, l) for t, l in zip(texts, labels) if t not in known]
+            if not pairs:
+                return
+            new_texts, new_labels = zip(*pairs)
+            self.matrix = np.vstack((self.matrix, embed(new_texts)))
+            self.texts += new_texts
+            self.labels += new_labels
+
+    def _load_history(self):
+        texts, labels = [], []
+        if not os.path.exists(self.history_path):
+            return texts, labels
+        with open(self.history_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                texts.append(rec["text"])
+                labels.append({"intent": rec["intent"], "slots": rec.get("slots") or {}})
+        limit = cfg.EMBED_INTENT_HISTORY_MAX
+        return texts[-limit:], labels[-limit:]
+
+    def learn(self, text, response):
+        """
+        Add a confirmed (transcript, intent) pair and persist it.
+        """
+        key = normalize(replace_number_words(normalize(text)))
+        intent = response.get("intent")
+        if not key or intent in (None, "other") or key in self.texts:
+            return
+        label = {"intent": intent, "slots": response.get("slots") or {}}
+        self._add([key], [label])
+        metrics.incr("learned")
+        try:
+            with open(self.history_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"text": key, **label}) + "\n")
+        except OSError as e:
+            print("⚠️ Could not save intent history:", e)
+
+    def neighbours(self, text, k=None):
+        """
+        [(similarity, example text, label)] for the k nearest examples.
+        """
+        k = k or cfg.EMBED_INTENT_TOP_K
+        query = embed([normalize(replace_number_words(normalize(text)))])[0]
+        with self._lock:
+            matrix, texts, labels = self.matrix, self.texts, self.labels
+        if not len(texts):
+            return []
+        sims = matrix @ query
+        k = min(k, len(sims))
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top])]
+        return [(float(sims[i]), texts[i], labels[i]) for i in top]
+
+    def classify(self, text):
+        """
+        (intent, confidence, nearest example label of that intent), or
+        (None, 0.0, None) when there are no examples.
+        """
+        near = self.neighbours(text)
+        if not near:
+            return None, 0.0, None
+        votes = {}
+        for sim, _, label in near:
+            votes[label["intent"]] = votes.get(label["intent"], 0.0) + max(sim, 0.0)
+        intent = max(votes, key=votes.get)
+        share = votes[intent] / (sum(votes.values()) or 1.0)
+        best = next(item for item in near if item[2]["intent"] == intent)
+        return intent, best[0] * share, best[2]
+
+    def predict(self, text):
+        """
+        Intent dict with slots when the classification is confident and
+        the slots can be extracted locally, else None (use the LLM).
+        """
+        start = time.perf_counter()
+        intent, confidence, example = self.classify(text)
+        metrics.observe("latency", time.perf_counter() - start)
+        metrics.incr("lookups")
+
+        if intent is None or intent == "other" or confidence < cfg.EMBED_INTENT_THRESHOLD:
+            metrics.incr("low_confidence")
+            return None
+        extractor = SLOT_EXTRACTORS.get(intent)
+        slots = extractor(replace_number_words(normalize(text)), example["slots"]) if extractor else None
+        if slots is None:
+            metrics.incr("no_slots")
+            return None
+
+        metrics.incr("hits")
+        metrics.incr(f"hits.{intent}")
+        return {"intent": intent, "slots": slots, "confidence": round(confidence, 3)}
+
+
+_classifier = None
+_classifier_lock = threading.Lock()
+
+
+def get_classifier():
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            _classifier = IntentClassifier()
+        return _classifier
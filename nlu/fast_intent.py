@@ -0,0 +1,339 @@
+import json
+import re
+import time
+
+import config.settings as cfg
+from nlu.prompts import INTENT_PROMPT
+from utils.metrics import get_metrics
+
+metrics = get_metrics("fast_intent")
+
+# Short commands that are unambiguous as soon as they are heard, so they
+# can be acted on from a partial transcript.
+EARLY_COMMANDS = {
+    "mute": {"intent": "change_volume", "slots": {"action": "mute"}},
+    "mute the volume": {"intent": "change_volume", "slots": {"action": "mute"}},
+    "full volume": {"intent": "change_volume", "slots": {"action": "full"}},
+    "volume up": {"intent": "change_volume", "slots": {"action": "increase"}},
+    "volume down": {"intent": "change_volume", "slots": {"action": "decrease"}},
+    "next song": {"intent": "music_control", "slots": {"action": "next"}},
+    "next track": {"intent": "music_control", "slots": {"action": "next"}},
+    "previous song": {"intent": "music_control", "slots": {"action": "previous"}},
+    "previous track": {"intent": "music_control", "slots": {"action": "previous"}},
+    "play music": {"intent": "music_control", "slots": {"action": "play_pause"}},
+    "pause music": {"intent": "music_control", "slots": {"action": "play_pause"}},
+    "pause the song": {"intent": "music_control", "slots": {"action": "play_pause"}},
+    "check cpu usage": {"intent": "system_monitor", "slots": {"action": "cpu"}},
+    "check ram usage": {"intent": "system_monitor", "slots": {"action": "memory"}},
+    "check disk usage": {"intent": "system_monitor", "slots": {"action": "disk"}},
+    "battery status": {"intent": "system_monitor", "slots": {"action": "battery"}},
+}
+
+# intents the deterministic matcher may answer; everything else goes to the LLM
+FAST_INTENTS = {
+    "change_volume", "change_brightness", "music_control",
+    "power_action", "system_monitor", "code_action",
+}
+
+
+def normalize(text: str) -> str:
+    text = re.sub(r"\[.*?\]|\(.*?\)", " ", (text or "").lower())
+    return " ".join(re.findall(r"[a-z0-9%']+", text))
+
+
+def match_command(text: str):
+    """
+    Intent dict for an exact high-confidence command, else None.
+    """
+    hit = EARLY_COMMANDS.get(normalize(text))
+    if hit is None:
+        return None
+    return {"intent": hit["intent"], "slots": dict(hit["slots"])}
+
+
+# -----------------------------
+# Number words
+# -----------------------------
+_UNITS = {w: i for i, w in enumerate(
+    "zero one two three four five six seven eight nine ten eleven twelve thirteen "
+    "fourteen fifteen sixteen seventeen eighteen nineteen".split())}
+_TENS = {w: 10 * i for i, w in enumerate(
+    "twenty thirty forty fifty sixty seventy eighty ninety".split(), start=2)}
+
+
+def replace_number_words(text: str) -> str:
+    """
+    "set volume to seventy five percent" -> "set volume to 75 percent"
+    Works on normalized text; handles 0-999 ("one hundred and five").
+    """
+    return " ".join(word for word, _, _ in _number_tokens(text.split()))
+
+
+def _number_tokens(words):
+    """
+    replace_number_words() on a word list. Each output word comes with the
+    (first, last) indexes of the input words it was made from.
+    """
+    out, value, first, last = [], None, None, None
+
+    def flush(end):
+        if value is not None:
+            out.append((str(value), first, end))
+
+    for i, w in enumerate(words):
+        nxt = words[i + 1] if i + 1 < len(words) else None
+        if w == "a" and nxt == "hundred":
+            continue
+        if w == "and" and last == "hundred" and (nxt in _UNITS or nxt in _TENS):
+            continue
+        if w == "hundred" and (value is not None or (i and words[i - 1] == "a")):
+            if value is None:
+                first = i - 1
+            value = (value or 1) * 100
+        elif w in _TENS and (value is None or last == "hundred"):
+            if value is None:
+                first = i
+            value = (value or 0) + _TENS[w]
+        elif w in _UNITS and (value is None or last == "hundred" or (last in _TENS and _UNITS[w] < 10)):
+            if value is None:
+                first = i
+            value = (value or 0) + _UNITS[w]
+        elif w in _UNITS or w in _TENS:
+            flush(i - 1)
+            first, value = i, _UNITS.get(w, _TENS.get(w))
+        else:
+            flush(i - 1)
+            out.append((w, i, i))
+            value = None
+        last = w
+    flush(len(words) - 1)
+    return out
+
+
+def _source_text(original, tokens, start, end):
+    """
+    The part of the original transcript behind characters start:end of the
+    normalized text made from `tokens`, with its casing, punctuation and
+    number words intact. None if the two can't be lined up.
+    """
+    lowered = re.sub(r"\[.*?\]|\(.*?\)", lambda m: " " * len(m.group()), original.lower())
+    spans = [m.span() for m in re.finditer(r"[a-z0-9%']+", lowered)]
+    if len(lowered) != len(original) or len(spans) != (tokens[-1][2] + 1 if tokens else 0):
+        return None
+
+    pos, picked = 0, []
+    for word, first, last in tokens:
+        if pos < end and pos + len(word) > start:
+            picked.append((first, last))
+        pos += len(word) + 1
+    if not picked:
+        return None
+    return original[spans[picked[0][0]][0]:spans[picked[-1][1]][1]]
+
+
+# -----------------------------
+# Grammar
+# -----------------------------
+_FILLER_START = re.compile(r"^(?:(?:hey|ok|okay|please|kindly|can you|could you|would you|will you)\s+)+")
+_FILLER_END = re.compile(r"(?:\s+(?:please|for me|now please|thanks|thank you))+$")
+
+_THE = r"(?:the |my |this )?"
+_NUM = r"(?P<n>\d{1,3})(?: ?%| percent)?"
+_LANG = r"(?P<language>python|java|javascript|html|css|cpp|c|text)"
+_FILE = r"(?P<filename>(?!(?:a|an|new|the)\b)[a-z0-9_]+)"
+_PC = r"(?:screen|pc|computer|system|laptop|machine)"
+
+# (intent, fixed slots, pattern, slot name for the number). Named groups
+# become slots; the number group "n" is stored under the rule's slot name
+# (or dropped when it has none). Patterns must match the whole transcript.
+_RULES = [
+    # volume
+    ("change_volume", {}, rf"(?:set|change|make|turn|put) {_THE}volume (?:to |at )?{_NUM}", "percent"),
+    ("change_volume", {}, rf"volume (?:to |at )?{_NUM}", "percent"),
+    ("change_volume", {"action": "increase"}, rf"(?:increase|raise|turn up|pump up) {_THE}(?:volume|sound)(?: by {_NUM})?|volume up|louder", "step"),
+    ("change_volume", {"action": "decrease"}, rf"(?:decrease|lower|reduce|turn down) {_THE}(?:volume|sound)(?: by {_NUM})?|volume down|quieter|too loud|it's too loud", "step"),
+    ("change_volume", {"action": "full"}, rf"(?:full|max|maximum) volume|(?:set |turn )?{_THE}volume (?:to )?(?:full|max|maximum)", None),
+    ("change_volume", {"action": "mute"}, rf"(?:mute|silence)(?: {_THE}(?:volume|sound|audio|speakers?))?", None),
+
+    # brightness
+    ("change_brightness", {"action": "set"}, rf"(?:set|change|make|turn|put) {_THE}(?:screen )?brightness (?:to |at )?{_NUM}", "value"),
+    ("change_brightness", {"action": "set"}, rf"(?:screen )?brightness (?:to |at )?{_NUM}", "value"),
+    ("change_brightness", {"action": "increase"}, rf"(?:increase|raise|turn up) {_THE}(?:screen )?brightness(?: by {_NUM})?|brightness up|brighter", "step"),
+    ("change_brightness", {"action": "decrease"}, rf"(?:decrease|lower|reduce|dim|turn down) {_THE}(?:screen )?brightness(?: by {_NUM})?|brightness down|dimmer|dim {_THE}screen", "step"),
+
+    # music
+    ("music_control", {"action": "next"}, rf"(?:next|skip)(?: {_THE}(?:song|track))?|play {_THE}next (?:song|track)", None),
+    ("music_control", {"action": "previous"}, rf"(?:previous|last|go back)(?: {_THE}(?:song|track))?|play {_THE}previous (?:song|track)", None),
+    ("music_control", {"action": "play_pause"}, rf"(?:play|pause|resume)(?: {_THE}(?:music|song|track))?|pause or play|play or pause", None),
+
+    # power (always confirmed by voice before running)
+    ("power_action", {"action": "lock"}, rf"lock(?: {_THE}{_PC})?|(?:turn )?off {_THE}screen", None),
+    ("power_action", {"action": "sleep"}, rf"(?:put|make|send) {_THE}{_PC} (?:to )?sleep|sleep(?: now| {_THE}{_PC})?|go to sleep", None),
+    ("power_action", {"action": "hibernate"}, rf"hibernate(?: {_THE}{_PC})?", None),
+
+    # system monitor
+    ("system_monitor", {"action": "cpu"}, rf"(?:check |show |what is |what's )?{_THE}(?:cpu|processor) (?:usage|load|utilization)", None),
+    ("system_monitor", {"action": "memory"}, rf"(?:check |show |what is |what's )?{_THE}(?:ram|memory) (?:usage|utilization)", None),
+    ("system_monitor", {"action": "disk"}, rf"(?:check |show |what is |what's )?{_THE}(?:disk|storage) (?:usage|space)", None),
+    ("system_monitor", {"action": "battery"}, rf"(?:check |show |what is |what's )?{_THE}battery(?: status| level| percentage)?", None),
+    ("system_monitor", {"action": "summary"}, rf"(?:check |show )?{_THE}system (?:status|summary)", None),
+
+    # code
+    ("code_action", {"action": "open_vscode"}, r"(?:open|launch|start) (?:vs code|vscode|visual studio code)", None),
+    ("code_action", {"action": "close_vscode"}, r"(?:close|quit|exit) (?:vs code|vscode|visual studio code)", None),
+    ("code_action", {"action": "create_file"}, rf"create (?:a )?(?:new )?{_FILE} {_LANG} file", None),
+    ("code_action", {"action": "create_file"}, rf"create (?:a )?(?:new )?{_LANG} file (?:called |named )?{_FILE}", None),
+    ("code_action", {"action": "run_code"}, rf"run {_THE}{_FILE} {_LANG} file", None),
+    ("code_action", {"action": "run_code"}, rf"run {_THE}{_LANG} file (?:called |named )?{_FILE}", None),
+    ("code_action", {"action": "write_code"}, rf"write (?P<instruction>.+?) in {_THE}{_FILE}(?: {_LANG})? file", None),
+]
+
+_LANG_WORD = re.compile(rf"\b{_LANG}\b")
+
+_COMPILED = [
+    (re.compile(rf"^(?:{pattern})$"), intent, fixed, number_slot)
+    for intent, fixed, pattern, number_slot in _RULES
+]
+
+
+def prompt_examples(prompt: str = INTENT_PROMPT, intents=FAST_INTENTS):
+    """
+    Exact phrases from the one-line `"text" -> {json}` examples in the LLM
+    prompt, for `intents` (None = every intent). "a or b" examples are
+    split into both phrasings.
+    """
+    table = {}
+    for line in prompt.splitlines():
+        m = re.match(r'^\s*"(.+?)"\s*->\s*(\{.*\})\s*$', line)
+        if not m:
+            continue
+        try:
+            parsed = json.loads(m.group(2))
+        except ValueError:
+            continue
+        if intents is not None and parsed.get("intent") not in intents:
+            continue
+        for phrase in m.group(1).split(" or "):
+            key = normalize(replace_number_words(normalize(phrase)))
+            if key:
+                table[key] = {"intent": parsed["intent"], "slots": parsed.get("slots", {})}
+    return table
+
+
+_EXACT = {**prompt_examples(), **{k: v for k, v in EARLY_COMMANDS.items() if v["intent"] in FAST_INTENTS}}
+
+
+def _strip_fillers(text: str) -> str:
+    text = _FILLER_START.sub("", text)
+    return _FILLER_END.sub("", text).strip()
+
+
+def canonical(text: str) -> str:
+    """
+    Transcript reduced to a lookup key: normalized, number words as
+    digits and leading/trailing politeness fillers removed.
+    """
+    return _strip_fillers(replace_number_words(normalize(text)))
+
+
+def _match(text: str):
+    original = text or ""
+    tokens = _number_tokens(normalize(original).split())
+    text = " ".join(word for word, _, _ in tokens)
+    hit = _EXACT.get(text) or _EXACT.get(_strip_fillers(text))
+    if hit is not None:
+        return {"intent": hit["intent"], "slots": dict(hit["slots"])}
+
+    filler = _FILLER_START.match(text)
+    offset = filler.end() if filler else 0
+    text = _strip_fillers(text)
+    for pattern, intent, fixed, number_slot in _COMPILED:
+        m = pattern.match(text)
+        if not m:
+            continue
+        slots = dict(fixed)
+        for key, value in m.groupdict().items():
+            if value is None:
+                continue
+            if key == "n":
+                if number_slot is None:
+                    continue
+                key, value = number_slot, min(100, int(value))
+            elif key == "instruction":
+                # match on normalized text, but pass the words as spoken
+                start, end = m.span(key)
+                value = _source_text(original, tokens, start + offset, end + offset) or value
+            slots[key] = value
+        if intent == "change_volume" and slots.get("percent") == 0:
+            slots = {"action": "mute"}
+        if slots.get("action") == "write_code" and "language" not in slots:
+            lang = _LANG_WORD.search(slots["instruction"].lower())
+            if lang:
+                slots["language"] = lang.group(0)
+        return {"intent": intent, "slots": slots}
+    return None
+
+
+def match_intent(text: str):
+    """
+    Deterministic intent for common commands (volume, brightness, music,
+    power, system monitor, code actions), or None to defer to the LLM.
+    """
+    start = time.perf_counter()
+    result = _match(text)
+    metrics.observe("match_latency", time.perf_counter() - start)
+    metrics.incr("lookups")
+    if result is None:
+        metrics.incr("misses")
+    else:
+        metrics.incr("hits")
+        metrics.incr(f"hits.{result['intent']}")
+    return result
+
+
+# -----------------------------
+# Compound commands
+# -----------------------------
+_CONNECTOR = re.compile(r"\s*(?:[,;]|\band then\b|\bthen\b|\band\b|\balso\b)\s*", re.I)
+_THEN = re.compile(r"\bthen\b", re.I)
+
+
+def split_compound(text: str):
+    """
+    "mute the volume and lock the screen" -> ["mute the volume", "lock the screen"]
+    """
+    return [part for part in _CONNECTOR.split(text or "") if part.strip()]
+
+
+def looks_compound(text: str) -> bool:
+    return len(split_compound(text)) > 1
+
+
+def match_compound(text: str):
+    """
+    {"intents": [...], "sequential": bool} when every part of a compound
+    command is a fast-path command, else None. "then" makes it sequential.
+    """
+    parts = split_compound(text)
+    if not 1 < len(parts) <= cfg.COMPOUND_MAX_INTENTS:
+        return None
+    hits = []
+    for part in parts:
+        hit = _match(part)
+        if hit is None:
+            return None
+        hits.append(hit)
+    metrics.incr("compound_hits")
+    return {"intents": hits, "sequential": bool(_THEN.search(text))}
+
+
+def fast_path_stats():
+    """
+    Hit rate and match latency of the fast path.
+    """
+    snap = metrics.snapshot()
+    return {
+        "hit_rate": metrics.ratio("hits", "lookups"),
+        "counters": snap["counters"],
+        "latency": snap["samples"],
+    }
@@ -0,0 +1,158 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import config.settings as cfg
+from nlu.fast_intent import canonical
+from nlu.prompts import COMPOUND_RULE, INTENT_PROMPT, INTENT_EXAMPLES, INTENT_SCHEMAS, PROMPT_HEADER
+from utils.metrics import get_metrics
+
+metrics = get_metrics("intent_cache")
+
+
+def prompt_version():
+    """
+    Hash of everything that shapes an LLM answer; a change drops the cache.
+    """
+    text = "\n".join((
+        INTENT_PROMPT, PROMPT_HEADER, COMPOUND_RULE,
+        json.dumps(INTENT_EXAMPLES, sort_keys=True),
+        json.dumps(INTENT_SCHEMAS, sort_keys=True),
+        cfg.GROQ_MODEL, cfg.OLLAMA_MODEL,
+    ))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+class IntentCache:
+    """
+    LRU + TTL cache of LLM intent answers keyed on the canonical transcript,
+    saved to a JSON file so it survives restarts. Answers whose slots
+    depend on when they were asked (create_event datetimes) are never
+    stored.
+    """
+
+    def __init__(self, path=None, max_entries=None, ttl=None):
+        self.path = path or cfg.INTENT_CACHE_PATH
+        self.max_entries = max_entries or cfg.INTENT_CACHE_MAX_ENTRIES
+        self.ttl = ttl or cfg.INTENT_CACHE_TTL
+        self.version = prompt_version()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    # -----------------------------
+    # Persistence
+    # -----------------------------
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print("⚠️ Ignoring unreadable intent cache:", e)
+            return
+
+        if data.get("version") != self.version:
+            print("ℹ️ Intent prompt changed, starting with an empty intent cache")
+            metrics.incr("invalidated")
+            return
+        now = time.time()
+        for key, entry in data.get("entries", []):
+            if now - entry["stored_at"] < self.ttl:
+                self._entries[key] = entry
+
+    def _save_locked(self):
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": self.version, "entries": list(self._entries.items())}, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print("⚠️ Could not save intent cache:", e)
+
+    # -----------------------------
+    # Lookup
+    # -----------------------------
+    def get(self, transcript):
+        """
+        Cached answer (a copy) for the transcript, or None.
+        """
+        key = canonical(transcript)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry["stored_at"] >= self.ttl:
+                del self._entries[key]
+                metrics.incr("expired")
+                entry = None
+            if entry is None:
+                metrics.incr("misses")
+                return None
+            self._entries.move_to_end(key)
+
+        metrics.incr("hits")
+        metrics.observe("latency_saved", entry["llm_seconds"])
+        metrics.incr("ms_saved", int(entry["llm_seconds"] * 1000))
+        return copy.deepcopy(entry["response"])
+
+    def put(self, transcript, response, llm_seconds):
+        """
+        Store an LLM answer unless its intent is excluded or unusable.
+        """
+        if not isinstance(response, dict):
+            return
+        intent = response.get("intent")
+        if intent in (None, "other") or intent in cfg.INTENT_CACHE_EXCLUDE:
+            return
+        key = canonical(transcript)
+        if not key:
+            return
+
+        entry = {
+            "response": {"intent": intent, "slots": copy.deepcopy(response.get("slots") or {})},
+            "stored_at": time.time(),
+            "llm_seconds": round(llm_seconds, 3),
+        }
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                metrics.incr("evicted")
+            self._save_locked()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._save_locked()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def cache_stats():
+    """
+    Hit ratio and LLM time saved by the intent cache.
+    """
+    hits, misses = metrics.count("hits"), metrics.count("misses")
+    return {
+        "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+        "seconds_saved": metrics.count("ms_saved") / 1000,
+        "counters": metrics.snapshot()["counters"],
+    }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = IntentCache()
+        return _cache
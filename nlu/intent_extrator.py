@@ -38,99 +38,156 @@
 #     return parsed
 
 
-import subprocess
-import json
-import socket
-import requests
+import time
 import config.settings as cfg
-from nlu.prompts import INTENT_PROMPT
-
-# checking for internet connectivity
-def is_internet_available(host="8.8.8.8", port=53, timeout=2):
-    try:
-        socket.setdefaulttimeout(timeout)
-        socket.socket(socket.AF_INET, socket.SOCK_STREAM).connect((host, port))
-        return True
-    except Exception:
-        return False
+from nlu.prompts import COMPOUND_RULE, INTENT_PROMPT, INTENT_EXAMPLES
+from nlu.fast_intent import looks_compound, match_compound, match_intent
+from nlu.embed_intent import get_classifier
+from nlu.intent_cache import get_cache
+from nlu.prompt_builder import build_prompt, estimate_tokens
+from utils.json_stream import extract_json
+from utils.llm_client import LLMError, get_client
+from utils.metrics import get_metrics
+
+metrics = get_metrics("intent")
+
+INTENT_SYSTEM = "You are an intent extractor. Return ONLY valid JSON."
+
+# intents none of the prompt examples give slots; their answer is usable
+# as soon as the intent name has streamed in
+SLOTLESS_INTENTS = (
+    {ex["intent"] for ex in INTENT_EXAMPLES}
+    - {ex["intent"] for ex in INTENT_EXAMPLES if ex["slots"]}
+) | {"other"}
 
 # extract intent using Groq API
 def extract_intent_groq(prompt: str):
-    headers = {
-        "Authorization": f"Bearer {cfg.GROQ_API_KEY}",
-        "Content-Type": "application/json"
-    }
-
-    payload = {
-        "model": cfg.GROQ_MODEL,
-        "messages": [
-            {
-                "role": "system",
-                "content": "You are an intent extractor. Return ONLY valid JSON."
-            },
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-        "temperature": 0
-    }
-
-    response = requests.post(
-        "https://api.groq.com/openai/v1/chat/completions",
-        headers=headers,
-        json=payload,
-        timeout=15
-    )
-
-    response.raise_for_status()
-    content = response.json()["choices"][0]["message"]["content"].strip()
-
-    return json.loads(content)
+    content = get_client().groq(prompt, system=INTENT_SYSTEM, json_mode=True)
+    return extract_json(content)
 
 # Extract intent using local ollama
 
 def extract_intent_ollama(prompt: str):
-    result = subprocess.run(
-        ["ollama", "run", cfg.OLLAMA_MODEL],
-        input=prompt.encode(),
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE
-    )
-
-    text = result.stdout.decode().strip()
-    return json.loads(text)
+    content = get_client().ollama(prompt, system=INTENT_SYSTEM, json_mode=True)
+    return extract_json(content)
 
 # main functionality
 
 def extract_intent(transcript: str):
     """
     Hybrid intent extraction:
-    - Uses Groq if internet is available
-    - Falls back to local Ollama if offline or Groq fails
+    - Common commands are answered by the deterministic fast path
+    - Repeats of earlier LLM answers come from the persistent intent cache
+    - Paraphrases go to the local nearest-example classifier
+    - Otherwise asks the LLM backend (Groq or local Ollama) expected to be
+      fastest, skipping backends whose circuit breaker is open, and races
+      the other one against it when it is slow or fails
+
+    A compound command ("mute the volume and lock the screen") comes back
+    as {"intents": [{"intent", "slots"}, ...], "sequential": bool}.
+    The result's "source" says which of fast / cache / embed / llm answered.
     """
-
-    prompt = (
+    compound = cfg.COMPOUND_INTENTS and looks_compound(transcript)
+
+    if cfg.FAST_INTENT_ENABLED:
+        start = time.perf_counter()
+        hit = match_intent(transcript)
+        if hit is None and compound:
+            hit = match_compound(transcript)
+        if hit is not None:
+            metrics.observe("latency.fast", time.perf_counter() - start)
+            return dict(hit, source="fast")
+
+    if cfg.INTENT_CACHE_ENABLED:
+        start = time.perf_counter()
+        hit = get_cache().get(transcript)
+        if hit is not None:
+            metrics.observe("latency.cache", time.perf_counter() - start)
+            return dict(hit, source="cache")
+
+    # the nearest single example would answer only part of a compound command
+    if cfg.EMBED_INTENT_ENABLED and not compound:
+        start = time.perf_counter()
+        hit = get_classifier().predict(transcript)
+        metrics.observe("latency.embed", time.perf_counter() - start)
+        if hit is not None:
+            return dict(hit, source="embed")
+
+    start = time.perf_counter()
+    try:
+        response = _extract_intent_llm(transcript)
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.observe("latency.llm", elapsed)
+    if isinstance(response, dict):
+        if cfg.INTENT_CACHE_ENABLED:
+            get_cache().put(transcript, response, elapsed)
+        response["source"] = "llm"
+    return response
+
+
+def monolithic_prompt(transcript: str):
+    return (
         INTENT_PROMPT
         + transcript
         + "\n\nReturn JSON only with keys 'intent' and optional 'slots'."
+        + (COMPOUND_RULE if cfg.COMPOUND_INTENTS and looks_compound(transcript) else "")
     )
 
-    try:
-        # Prefer online LLM if internet exists
-        if is_internet_available():
-            try:
-                return extract_intent_groq(prompt)
-            except Exception as e:
-                print(" Groq failed, switching to local LLM:", e)
 
-        # Fallback to local Ollama
-        return extract_intent_ollama(prompt)
+def intent_ready(members):
+    """
+    True once a streamed answer has its intent and, unless the intent
+    takes none, its complete slots object; for a compound answer, its
+    complete intents list and sequential flag.
+    """
+    if "intents" in members:
+        return isinstance(members["intents"], list) and "sequential" in members
+    intent = members.get("intent")
+    if not isinstance(intent, str):
+        return False
+    return intent in SLOTLESS_INTENTS or isinstance(members.get("slots"), dict)
+
+
+def _intent_answer(text):
+    response = extract_json(text, ready=intent_ready)
+    steps = response.get("intents")
+    if isinstance(steps, list):
+        steps = [s for s in steps if isinstance(s, dict) and isinstance(s.get("intent"), str)]
+        steps = steps[:cfg.COMPOUND_MAX_INTENTS]
+        if len(steps) == 1:
+            return steps[0]
+        if steps:
+            return {"intents": steps, "sequential": bool(response.get("sequential"))}
+    if not isinstance(response.get("intent"), str):
+        raise ValueError(f"no intent in the model output: {text[:80]!r}")
+    return response
+
+
+def _extract_intent_llm(transcript: str):
+    if cfg.DYNAMIC_INTENT_PROMPT:
+        prompt = build_prompt(transcript)
+    else:
+        prompt = monolithic_prompt(transcript)
+    metrics.observe("prompt_tokens", estimate_tokens(prompt))
 
-    except json.JSONDecodeError as e:
+    try:
+        # expected-fastest backend first, the other when it fails; hedged,
+        # the other starts too if the first hasn't answered in LLM_HEDGE_DELAY.
+        # The answer streams and is cut off once intent_ready() says so.
+        return get_client().complete_json(
+            prompt,
+            system=INTENT_SYSTEM,
+            hedge=cfg.LLM_HEDGE_ENABLED,
+            kind="intent",
+            ready=intent_ready if cfg.LLM_STREAM_INTENT else None,
+            accept=_intent_answer,
+        )
+
+    except ValueError as e:
         print(" JSON parsing failed:", e)
         return {"intent": "other", "slots": {}}
 
-    except Exception as e:
-        print(" Unexpected intent extraction error:", e)
+    except LLMError as e:
+        print(" Intent extraction failed on every LLM backend:", e)
         return {"intent": "other", "slots": {}}
@@ -0,0 +1,85 @@
+import datetime
+import json
+import re
+import threading
+
+import numpy as np
+
+import config.settings as cfg
+from nlu.embed_intent import embed
+from nlu.fast_intent import canonical, looks_compound
+from nlu.prompts import COMPOUND_RULE, INTENT_EXAMPLES, INTENT_SCHEMAS, PROMPT_HEADER
+
+PROMPT_FOOTER = "\n\nReturn JSON only with keys 'intent' and optional 'slots'."
+
+_matrix = None
+_matrix_lock = threading.Lock()
+
+
+def _example_matrix():
+    global _matrix
+    with _matrix_lock:
+        if _matrix is None:
+            _matrix = embed([canonical(ex["text"]) for ex in INTENT_EXAMPLES])
+        return _matrix
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough BPE token count: words and punctuation marks. Good enough to
+    compare prompts against each other.
+    """
+    return len(re.findall(r"\w+|[^\w\s]", text))
+
+
+def select_examples(transcript, k=None):
+    """
+    The k examples most similar to the transcript (hashed n-gram cosine),
+    most similar first.
+    """
+    k = min(k or cfg.PROMPT_EXAMPLES_K, len(INTENT_EXAMPLES))
+    sims = _example_matrix() @ embed([canonical(transcript)])[0]
+    top = np.argpartition(-sims, k - 1)[:k]
+    return [INTENT_EXAMPLES[i] for i in top[np.argsort(-sims[top])]]
+
+
+def example_dates(today=None):
+    """Values for the {today}-style placeholders in the example datetimes."""
+    today = today or datetime.date.today()
+    day = datetime.timedelta(days=1)
+    return {
+        "{today}": today.isoformat(),
+        "{tomorrow}": (today + day).isoformat(),
+        "{friday}": (today + day * ((4 - today.weekday()) % 7 or 7)).isoformat(),
+        "{next_monday}": (today + day * (7 - today.weekday())).isoformat(),
+    }
+
+
+def _format_example(ex, dates):
+    answer = {"intent": ex["intent"], "slots": ex["slots"]} if ex["slots"] else {"intent": ex["intent"]}
+    line = f'"{ex["text"]}" -> {json.dumps(answer, separators=(",", ":"))}'
+    for placeholder, value in dates.items():
+        line = line.replace(placeholder, value)
+    return line
+
+
+def build_prompt(transcript, k=None):
+    """
+    Few-shot intent prompt: every intent with its slot rules, and only the
+    examples closest to `transcript`. The compound-command rule is only
+    included when the transcript looks like several requests.
+    """
+    examples = select_examples(transcript, k)
+
+    today = datetime.date.today()
+    dates = example_dates(today)
+    schemas = [schema.replace("{today}", today.strftime("%A %Y-%m-%d")) for schema in INTENT_SCHEMAS.values()]
+
+    return (
+        PROMPT_HEADER
+        + "\nIntents and their slots:\n" + "\n".join(schemas)
+        + "\n\nExamples:\n" + "\n".join(_format_example(ex, dates) for ex in examples)
+        + (COMPOUND_RULE if cfg.COMPOUND_INTENTS and looks_compound(transcript) else "")
+        + f'\n\nUser: "{transcript}"'
+        + PROMPT_FOOTER
+    )
@@ -152,3 +152,117 @@ Output:
 
 User: "
 """
+
+
+# ---------------- STRUCTURED EXAMPLES ----------------
+# The examples from INTENT_PROMPT as data, for the dynamic few-shot prompt
+# (nlu/prompt_builder.py) which only sends the ones relevant to a request.
+# Dates are written relative to the day the prompt is built ({today},
+# {tomorrow}, {friday}, {next_monday}) so they agree with the create_event rule.
+
+PROMPT_HEADER = """You are an intent extractor. Return ONLY JSON with keys "intent" and optional "slots". Provide actions and slots where applicable.
+If you cannot classify, return {"intent":"other"}.
+"""
+
+# one line of slot rules per intent; every intent is listed in every prompt
+INTENT_SCHEMAS = {
+    "change_volume": 'change_volume slots: "action" increase / decrease / full / mute, "step" only for increase/decrease, or "percent" 0-100 to set a level.',
+    "change_brightness": (
+        'change_brightness slots: "action" increase / decrease / set. '
+        'Use "step" only for increase/decrease and "value" only for set. Never return negative numbers.'
+    ),
+    "music_control": 'music_control slots: "action" play_pause / next / previous.',
+    "power_action": 'power_action slots: "action" lock / sleep / hibernate.',
+    "system_monitor": 'system_monitor slots: "action" cpu / memory / disk / battery / summary.',
+    "code_action": (
+        'code_action slots: "action" open_vscode / close_vscode / create_file / write_code / run_code, '
+        '"filename" without extension, "language" (python, java, html, css, javascript, c, cpp, text), '
+        '"instruction" for write_code.'
+    ),
+    "send_email": 'send_email slots: "to", "body", optional "subject".',
+    "get_weather": 'get_weather slots: "location", optional "datetime" (today / tomorrow).',
+    "create_event": (
+        'create_event slots: "title", "datetime" as ISO 8601 (YYYY-MM-DDTHH:MM), optional "duration", '
+        '"participants", "description". Timezone is Asia/Kolkata; resolve relative dates from today, {today}.'
+    ),
+    "unmute": "unmute has no slots.",
+}
+
+INTENT_EXAMPLES = [
+    {"text": "It's too loud", "intent": "change_volume", "slots": {"action": "decrease"}},
+    {"text": "I can't hear anything", "intent": "change_volume", "slots": {"action": "increase"}},
+    {"text": "Not audible", "intent": "change_volume", "slots": {"action": "increase"}},
+    {"text": "Full volume", "intent": "change_volume", "slots": {"action": "full"}},
+    {"text": "silence please", "intent": "change_volume", "slots": {"action": "mute"}},
+    {"text": "mute", "intent": "change_volume", "slots": {"action": "mute"}},
+    {"text": "set volume to 30 percent", "intent": "change_volume", "slots": {"percent": 30}},
+    {"text": "increase volume by 10", "intent": "change_volume", "slots": {"action": "increase", "step": 10}},
+    {"text": "Unmute please", "intent": "unmute", "slots": {}},
+
+    {"text": "Send an email to Raj saying hello", "intent": "send_email", "slots": {"to": "Raj", "body": "hello"}},
+    {"text": "Send an email to Raj saying the report is done", "intent": "send_email",
+     "slots": {"to": "Raj", "body": "The report is done", "subject": "Report completed"}},
+    {"text": "Inform raj about meeting", "intent": "send_email", "slots": {"to": "Raj", "body": "hello"}},
+
+    {"text": "I have a meeting tomorrow at 3pm with Prasanth", "intent": "create_event",
+     "slots": {"title": "Meeting with Prasanth", "datetime": "{tomorrow}T15:00", "participants": "Prasanth"}},
+    {"text": "Schedule a 30 minute call with Raj next Monday 10am", "intent": "create_event",
+     "slots": {"title": "Call with Raj", "datetime": "{next_monday}T10:00", "duration": "30", "participants": "Raj"}},
+    {"text": "Add a dentist appointment on Friday at 9", "intent": "create_event",
+     "slots": {"title": "Dentist Appointment", "datetime": "{friday}T09:00"}},
+    {"text": "Block 2pm tomorrow for project sync", "intent": "create_event",
+     "slots": {"title": "Project Sync", "datetime": "{tomorrow}T14:00"}},
+    {"text": "Reminder: meeting today at 6pm", "intent": "create_event",
+     "slots": {"title": "Meeting", "datetime": "{today}T18:00"}},
+
+    {"text": "What's the weather in Vizag?", "intent": "get_weather", "slots": {"location": "Vizag"}},
+
+    {"text": "it's too bright", "intent": "change_brightness", "slots": {"action": "decrease"}},
+    {"text": "I cant see anything", "intent": "change_brightness", "slots": {"action": "increase"}},
+    {"text": "set brightness to 70 percent", "intent": "change_brightness", "slots": {"action": "set", "value": 70}},
+    {"text": "increase brightness by 10", "intent": "change_brightness", "slots": {"action": "increase", "step": 10}},
+    {"text": "decrease screen brightness", "intent": "change_brightness", "slots": {"action": "decrease"}},
+    {"text": "increase brightness", "intent": "change_brightness", "slots": {"action": "increase"}},
+
+    {"text": "lock the screen", "intent": "power_action", "slots": {"action": "lock"}},
+    {"text": "off the screen", "intent": "power_action", "slots": {"action": "lock"}},
+    {"text": "please lock the computer", "intent": "power_action", "slots": {"action": "lock"}},
+    {"text": "put my computer to sleep", "intent": "power_action", "slots": {"action": "sleep"}},
+    {"text": "sleep now", "intent": "power_action", "slots": {"action": "sleep"}},
+
+    {"text": "play music", "intent": "music_control", "slots": {"action": "play_pause"}},
+    {"text": "pause the song", "intent": "music_control", "slots": {"action": "play_pause"}},
+    {"text": "next song", "intent": "music_control", "slots": {"action": "next"}},
+    {"text": "previous track", "intent": "music_control", "slots": {"action": "previous"}},
+
+    {"text": "open vs code", "intent": "code_action", "slots": {"action": "open_vscode"}},
+    {"text": "close vs code", "intent": "code_action", "slots": {"action": "close_vscode"}},
+    {"text": "create test python file", "intent": "code_action",
+     "slots": {"action": "create_file", "filename": "test", "language": "python"}},
+    {"text": "create index html file", "intent": "code_action",
+     "slots": {"action": "create_file", "filename": "index", "language": "html"}},
+    {"text": "write basic html code in index html file", "intent": "code_action",
+     "slots": {"action": "write_code", "filename": "index", "language": "html",
+               "instruction": "basic HTML boilerplate with title and heading"}},
+    {"text": "write python code to add two numbers in test file", "intent": "code_action",
+     "slots": {"action": "write_code", "filename": "test", "language": "python",
+               "instruction": "program to add two numbers"}},
+    {"text": "run test python file", "intent": "code_action",
+     "slots": {"action": "run_code", "filename": "test", "language": "python"}},
+
+    {"text": "check cpu usage", "intent": "system_monitor", "slots": {"action": "cpu"}},
+    {"text": "check ram usage", "intent": "system_monitor", "slots": {"action": "memory"}},
+    {"text": "check disk usage", "intent": "system_monitor", "slots": {"action": "disk"}},
+    {"text": "battery status", "intent": "system_monitor", "slots": {"action": "battery"}},
+    {"text": "system status", "intent": "system_monitor", "slots": {"action": "summary"}},
+]
+
+
+# ---------------- COMPOUND COMMANDS ----------------
+# Added to the prompt when the transcript looks like several requests
+# ("... and ...", "... then ...").
+COMPOUND_RULE = """
+If the user asks for several things at once, return {"intents":[{"intent":...,"slots":{...}}, ...],"sequential":false} with one entry per request, in the order spoken.
+Set "sequential" to true when a step depends on an earlier one ("then", writing code and then running it).
+"mute the volume and lock the screen" -> {"intents":[{"intent":"change_volume","slots":{"action":"mute"}},{"intent":"power_action","slots":{"action":"lock"}}],"sequential":false}
+"write python code to add two numbers in test file then run it" -> {"intents":[{"intent":"code_action","slots":{"action":"write_code","filename":"test","language":"python","instruction":"program to add two numbers"}},{"intent":"code_action","slots":{"action":"run_code","filename":"test","language":"python"}}],"sequential":true}"""
@@ -1,15 +1,25 @@
 import time
 import tkinter as tk
 import threading
-import os
-import tempfile
 import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from tkinter import ttk, scrolledtext, font
+import config.settings as cfg
 from utils.tts import speak
 from utils import Logger
-from audio.recorder import record_audio
-from audio.transcriber import transcribe_audio
+from audio.recorder import listen_utterance, tts_gate
+from audio.cascade import transcribe_utterance, escalate
+from audio.wakeword import WakeWordListener
+from audio.dictation import dictate
+from audio.capture_store import get_store, keep_raw
+from ui.pipeline import ListeningPipeline
 from nlu.intent_extrator import extract_intent
+from nlu.fast_intent import match_command
+from nlu.embed_intent import get_classifier
+from utils.metrics import get_metrics
+from utils.llm_client import get_client
+from utils.connectivity import get_monitor
 from executor import calendar_api as cal
 from executor import weather
 from executor import brightness_control as bc
@@ -19,11 +29,26 @@ from executor import music_control as mc
 from executor import code_agent as ca
 from executor import system_monitoring as sm
 
+latency = get_metrics("latency")
+
+# compound steps whose intents map to the same key run in order, not concurrently
+COMPOUND_CHAINS = {"music_control": "media", "change_volume": "media"}
+
+
+def same_action(a, b):
+    """True if two {"intent", "slots"} results would do the same thing."""
+    return a.get("intent") == b.get("intent") and (a.get("slots") or {}) == (b.get("slots") or {})
+
+
 class VoiceAssistantApp:
     def __init__(self):
         self.muted = False 
         self.listening = False
         self.speaking = False
+        self.pipeline = None
+        self.wake_listener = None
+        self.dictating = threading.Event()
+        self.dictation_stop = threading.Event()
 
         # Tkinter setup - Dark theme with borders
         self.root = tk.Tk()
@@ -46,6 +71,14 @@ class VoiceAssistantApp:
         self.logger = Logger()
         self.create_ui()
 
+        # load the local model now so the first offline command isn't slow
+        get_client().warm_up()
+        self.refresh_routing()
+
+        monitor = get_monitor()
+        monitor.add_listener(lambda online: self.root.after(0, self.show_connectivity, online))
+        self.show_connectivity(monitor.is_online())
+
     def create_ui(self):
         # Main container
         main_container = tk.Frame(self.root, bg=self.bg_color)
@@ -110,6 +143,18 @@ class VoiceAssistantApp:
                                      command=self.toggle_left_panel)
         self.panel_toggle.pack(side="right", padx=8)
         
+        # Hands-free (wake word) button
+        self.hands_free_btn = tk.Button(btn_frame,
+                                       text="👂",  # Ear emoji
+                                       font=('Segoe UI Emoji', 16),
+                                       bg="#2d3748",
+                                       fg="#ffffff",
+                                       relief="raised",
+                                       borderwidth=2,
+                                       width=3,
+                                       command=self.toggle_hands_free)
+        self.hands_free_btn.pack(side="right", padx=8)
+        
         # Status indicator
         self.status_label = tk.Label(btn_frame,
                                     text="● Ready",
@@ -118,6 +163,14 @@ class VoiceAssistantApp:
                                     fg="#90ee90")
         self.status_label.pack(side="right", padx=15)
         
+        # Connectivity indicator (Groq online / local LLM only)
+        self.net_label = tk.Label(btn_frame,
+                                 text="🌐 Online",
+                                 font=('Segoe UI Emoji', 10),
+                                 bg=self.accent_color,
+                                 fg="#a0aec0")
+        self.net_label.pack(side="right", padx=5)
+        
         # Chat display area
         chat_container = tk.Frame(main_area, bg=self.card_color)
         chat_container.pack(fill="both", expand=True, padx=20, pady=20)
@@ -292,6 +345,14 @@ Ready when you are! 👇"""
             "#f9c74f"  # Yellow
         )
         
+        # 4. LLM routing dropdown
+        self.create_panel_dropdown(
+            panel_content,
+            "🔀 LLM Routing",
+            "routing",
+            "#90be6d"  # Green
+        )
+        
         # Info text at bottom
         info_frame = tk.Frame(panel_content, bg=self.panel_bg)
         info_frame.pack(side="bottom", fill="x", pady=20)
@@ -355,6 +416,10 @@ Ready when you are! 👇"""
             self.logs_btn = btn
             self.logs_frame = content_frame
             self.log_box = text_widget
+        elif section_id == "routing":
+            self.routing_btn = btn
+            self.routing_frame = content_frame
+            self.routing_box = text_widget
 
     # ===== SIMPLE PLACEHOLDER METHODS FOR ENTRY WIDGET =====
     
@@ -386,6 +451,9 @@ Ready when you are! 👇"""
         elif section_id == "intent":
             btn = self.intent_btn
             frame = self.intent_frame
+        elif section_id == "routing":
+            btn = self.routing_btn
+            frame = self.routing_frame
         else:  # logs
             btn = self.logs_btn
             frame = self.logs_frame
@@ -397,6 +465,20 @@ Ready when you are! 👇"""
             frame.pack(fill="x", pady=(5, 0))
             btn.config(text=f"▲ {title}", fg=color)
 
+    def show_connectivity(self, online):
+        if online:
+            self.net_label.config(text="🌐 Online", fg="#a0aec0")
+        else:
+            self.net_label.config(text="📴 Offline (local LLM)", fg="#f9c74f")
+            self.logger.log("📴 Internet unreachable, using the local LLM", self.log_box)
+
+    def refresh_routing(self):
+        # breaker state and latency scores of the LLM backends
+        if self.routing_frame.winfo_ismapped():
+            self.routing_box.delete("1.0", tk.END)
+            self.routing_box.insert(tk.END, get_client().router.describe())
+        self.root.after(2000, self.refresh_routing)
+
     def add_chat_message(self, sender, message):
         self.chat_display.config(state='normal')
         
@@ -423,42 +505,143 @@ Ready when you are! 👇"""
             self.status_label.config(text="● Ready", fg="#90ee90")
 
     def toggle_listening(self):
+        if self.dictating.is_set():
+            # the stop button ends a running dictation
+            self.dictation_stop.set()
+            return
         if not self.listening:
             self.listening = True
             self.mic_btn.config(text="⏹️", bg="#e53e3e", fg="white")  # Stop emoji
             self.status_label.config(text="● Listening...", fg="#4cc9f0")
             self.add_chat_message("assistant", "🎤 Listening... Speak now!")
-            threading.Thread(target=self.continuous_listen, daemon=True).start()
+            if cfg.PIPELINED_LISTENING:
+                self.start_pipeline()
+            else:
+                threading.Thread(target=self.continuous_listen, daemon=True).start()
         else:
-            self.listening = False
-            self.mic_btn.config(text="🎤", bg="#38a169", fg="white")
+            self.stop_listening()
+
+    def stop_listening(self):
+        self.listening = False
+        if self.pipeline:
+            self.pipeline.stop()
+            self.pipeline = None
+        self.mic_btn.config(text="🎤", bg="#38a169", fg="white")
+        self.status_label.config(text="● Ready", fg="#90ee90")
+
+    def start_pipeline(self):
+        self.pipeline = ListeningPipeline(
+            on_transcript=self.on_voice_transcript,
+            on_error=self.on_listen_error,
+            on_capture=lambda info: self.logger.log(
+                f"⏱️ Recording {info['reason']} after {info['recorded']}s "
+                f"(saved {info['saved']}s)", self.log_box)
+        )
+        self.pipeline.start()
+        self.logger.log("🎧 Pipelined listening started...", self.log_box)
+
+    def hold_capture(self):
+        """Keep the listening pipeline off the mic while we ask something."""
+        return self.pipeline.hold() if self.pipeline else nullcontext()
+
+    def on_voice_transcript(self, transcript, asr=None):
+        asr = asr or {}
+        if asr.get("early_intent") is not None:
+            # the command already ran from a stable partial transcript
+            if match_command(transcript) == asr["early_intent"]:
+                self.logger.log(f"✔️ Final transcript confirms early action: {transcript}", self.transcript_box)
+                self.record_action_latency(asr, asr.get("early_at"), "early")
+                # the early dispatch had no audio yet; this final pass has the raw capture
+                self.capture_turn(transcript, asr["early_intent"], asr, dict(asr.get("timings") or {}))
+                return
+
+        print(f"Transcript: {transcript}")
+        self.add_chat_message("user", f"🗣️ {transcript}")
+        tier = f" [{asr['tier']}]" if asr.get("tier") else ""
+        self.logger.log(f"🎤 Transcript{tier}: {transcript}", self.transcript_box)
+        self.handle_intent_and_execute(transcript, asr)
+
+    def dictate_slot(self, slots, key, prompt):
+        """Fill a long free-text slot (email body, code instruction) by dictation."""
+        if (slots.get(key) or "").strip():
+            return
+        with self.hold_capture():
+            self.speak_and_wait(prompt)
+            self.dictation_stop.clear()
+            self.dictating.set()
+            self.status_label.config(text="● Dictating... (⏹️ to finish)", fg="#4cc9f0")
+            try:
+                text, info = dictate(self.dictation_stop)
+            finally:
+                self.dictating.clear()
+                self.status_label.config(text="● Listening..." if self.listening else "● Ready", fg="#4cc9f0")
+        self.logger.log(f"📝 Dictation ({info['reason']} after {info['recorded']}s): {text}", self.transcript_box)
+        if text:
+            slots[key] = text
+
+    def on_listen_error(self, e):
+        self.logger.log(f"❌ Error: {e}", self.log_box)
+        self.add_chat_message("assistant", f"⚠️ Error: {str(e)}")
+
+    def toggle_hands_free(self):
+        if self.wake_listener and self.wake_listener.running:
+            self.wake_listener.stop()
+            self.wake_listener = None
+            self.hands_free_btn.config(bg="#2d3748")
             self.status_label.config(text="● Ready", fg="#90ee90")
+            return
 
-    def continuous_listen(self):
-        while self.listening:
-            while self.speaking:
-                time.sleep(0.1)
+        try:
+            self.wake_listener = WakeWordListener(on_wake=self.on_wake_word)
+        except ValueError:
+            self.add_chat_message(
+                "assistant",
+                "👂 No wake word recorded yet. Run: python -m audio.wakeword enroll")
+            return
 
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                audio_file = tmp.name
+        self.wake_listener.start()
+        self.hands_free_btn.config(bg="#38a169")
+        self.status_label.config(text="● Hands-free", fg="#4cc9f0")
+        self.add_chat_message("assistant", "👂 Hands-free on. Say the wake word, then your command.")
 
+    def on_wake_word(self):
+        # runs on the wake-word thread; spotting resumes once we return
+        self.logger.log("👂 Wake word detected", self.log_box)
+        self.status_label.config(text="● Listening...", fg="#4cc9f0")
+        try:
+            samples, info = listen_utterance("command")
+            if len(samples):
+                asr = keep_raw(transcribe_utterance(samples), samples, info)
+                asr["speech_end_at"] = info.get("speech_end_at")
+                transcript = asr["text"].strip()
+                if transcript:
+                    self.on_voice_transcript(transcript, asr)
+        except Exception as e:
+            self.on_listen_error(e)
+        finally:
+            self.status_label.config(text="● Hands-free", fg="#4cc9f0")
+
+    def continuous_listen(self):
+        while self.listening:
             try:
                 self.logger.log("🎧 Listening started...", self.log_box)
-                record_audio(audio_file)
-                transcript = transcribe_audio(audio_file).strip()
-                print(f"Transcript: {transcript}")
+                samples, info = listen_utterance("command")
+                self.logger.log(
+                    f"⏱️ Recording {info['reason']} after {info['recorded']}s "
+                    f"(saved {info['saved']}s)", self.log_box)
+                if not len(samples):
+                    continue
+
+                # PCM goes straight from the ring buffer to whisper
+                asr = keep_raw(transcribe_utterance(samples), samples, info)
+                asr["speech_end_at"] = info.get("speech_end_at")
+                transcript = asr["text"].strip()
 
                 if transcript:
-                    self.add_chat_message("user", f"🗣️ {transcript}")
-                    self.logger.log(f"🎤 Transcript: {transcript}", self.transcript_box)
-                    self.handle_intent_and_execute(transcript)
+                    self.on_voice_transcript(transcript, asr)
 
             except Exception as e:
-                self.logger.log(f"❌ Error: {e}", self.log_box)
-                self.add_chat_message("assistant", f"⚠️ Error: {str(e)}")
-
-            finally:
-                self.cleanup_files(audio_file)
+                self.on_listen_error(e)
 
     def process_text_input(self):
         # Get text from Entry widget
@@ -478,23 +661,92 @@ Ready when you are! 👇"""
         # Process in background thread
         threading.Thread(target=self.handle_intent_and_execute, args=(transcript,), daemon=True).start()
 
-    def handle_intent_and_execute(self, transcript: str):
-        response = extract_intent(transcript)
+    def handle_intent_and_execute(self, transcript: str, asr=None):
+        asr = asr or {}
+        timings = dict(asr.get("timings") or {})
+        if asr.get("early"):
+            # dispatched from a stable partial before the user finished
+            response = asr["intent"]
+            self.logger.log(f"⚡ Early dispatch on partial: {transcript}", self.log_box)
+        else:
+            start = time.perf_counter()
+            response = self.parse_intent(transcript)
+            timings["intent"] = time.perf_counter() - start
+
+            # fast whisper tier may have misheard: retry with the larger model
+            if response.get("intent") in (None, "other") and not response.get("intents") \
+                    and asr.get("samples") is not None:
+                start = time.perf_counter()
+                retry = escalate(asr)
+                if retry and retry["text"].strip() and retry["text"].strip() != transcript:
+                    transcript = retry["text"].strip()
+                    self.logger.log(f"🎤 Transcript [accurate]: {transcript}", self.transcript_box)
+                    response = self.parse_intent(transcript)
+                timings["escalate"] = time.perf_counter() - start
+
+            early = asr.get("early_intent")
+            if early is not None and not response.get("intents"):
+                if same_action(response, early):
+                    # reworded ("pause music please"), but the action already ran
+                    self.logger.log(f"✔️ Final transcript confirms early action: {transcript}", self.transcript_box)
+                    self.record_action_latency(asr, asr.get("early_at"), "early")
+                    self.capture_turn(transcript, response, asr, timings)
+                    return
+                self.logger.log("↩️ Final transcript revises the early action", self.log_box)
+
+            self.record_action_latency(asr, time.monotonic(), "final")
 
-        if isinstance(response, str):
-            try:
-                response = json.loads(response)
-            except:
-                response = {"intent": "other", "slots": {}}
+        self.logger.log(f"🎯 Intent detected: {response}", self.intent_box)
+        action_start = time.perf_counter()
+
+        steps = response.get("intents")
+        if steps:
+            early = asr.get("early_intent")
+            if early is not None and not asr.get("early"):
+                # the final transcript extends a command that already ran early
+                steps = [s for s in steps if not same_action(s, early)]
+            results = self.execute_compound(steps, response.get("sequential"), asr)
+            handled = all(r[2] for r in results)
+            says = [say.rstrip() for _, _, _, say in results if say]
+            reply = " ".join(say if say.endswith((".", "!", "?")) else say + "." for say in says)
+            message = "\n".join(f"{icon} {result}" for icon, result, _, _ in results)
+        else:
+            action_icon, result, handled, reply = self.execute_intent(response, asr)
+            message = f"{action_icon} {result}"
+        timings["action"] = time.perf_counter() - action_start
+
+        # one spoken reply, even for several actions
+        if reply and not self.muted:
+            self.speak_and_wait(reply)
+
+        # Show result in chat with emoji
+        self.add_chat_message("assistant", message)
+
+        self.capture_turn(transcript, response, asr, timings)
 
+        # an LLM answer we could act on becomes a local classifier example
+        if handled and not steps and response.get("source") == "llm" and cfg.EMBED_INTENT_ENABLED:
+            get_classifier().learn(transcript, response)
+        
+        # Stop listening after a one-shot command; the pipeline keeps going
+        if self.listening and not self.pipeline:
+            self.stop_listening()
+
+    def execute_intent(self, response, asr=None):
+        """
+        Run one {"intent", "slots"} action. Returns (icon, result, handled,
+        say); `handled` is False when nothing ran (unknown intent, cancelled
+        confirmation) and `say` is the text to speak, None when nothing should be.
+        """
+        asr = asr or {}
         intent = response.get("intent")
         slots = response.get("slots", {}) or {}
-
-        self.logger.log(f"🎯 Intent detected: {response}", self.intent_box)
+        handled = True
 
         # Process intents
         result = ""
         action_icon = "⚡"
+        quiet = False
         
         if intent == "change_volume":
             if any(k in slots for k in ("percent", "value", "level", "amount")):
@@ -503,56 +755,49 @@ Ready when you are! 👇"""
                 result = vc(slots)
             action_icon = "🔊"
             self.logger.log(f"{action_icon} Action: {result}", self.log_box)
-            if not self.muted:
-                self.speak_and_wait(result)
 
         elif intent == "get_weather":
             result = weather.get_weather(slots)
             action_icon = "🌤️"
             self.logger.log(f"{action_icon} Action: {result}", self.log_box)
-            if not self.muted:
-                self.speak_and_wait(result)
 
         elif intent == "send_email":
             from executor import gmail_sender
+            if asr:  # spoken command: the user is at the mic
+                self.dictate_slot(slots, "body", "What should the email say?")
             result = gmail_sender.send_email(slots)
             action_icon = "📧"
             self.logger.log(f"{action_icon} Action: {result}", self.log_box)
-            if not self.muted:
-                self.speak_and_wait(result)
 
         elif intent in ("change_brightness", "set_brightness"):
             result = bc.change_brightness(slots)
             action_icon = "💡"
             self.logger.log(f"{action_icon} Action: {result}", self.log_box)
-            if not self.muted:
-                self.speak_and_wait(result)
 
         elif intent == "power_action":
             from executor import power_control as pc
             from utils.confirm import confirm_voice
             action = slots.get("action", "lock")
             prompt = f"Do you want to {action} the system? Say yes to confirm."
-            confirmed = confirm_voice(prompt, retries=1, record_seconds=4)
+            with self.hold_capture():
+                confirmed = confirm_voice(prompt, retries=1, record_seconds=4)
             if confirmed:
-                speak("Confirmed. Executing now.", block=False)
+                self.speak_and_wait("Confirmed. Executing now.")
                 result = pc.handle_power_action(slots)
                 action_icon = "⚡"
                 self.logger.log(f"{action_icon} Action: {result}", self.log_box)
-                if not self.muted:
-                    self.speak_and_wait(result)
             else:
-                speak("Cancelled.", block=False)
+                self.speak_and_wait("Cancelled.")
                 result = "Action cancelled."
                 action_icon = "❌"
+                handled = False  # nothing ran, so nothing to learn from
+                quiet = True  # "Cancelled." was spoken already
                 self.logger.log(f"{action_icon} Action cancelled", self.log_box)
 
-        elif response.get("intent") == "create_event":
-            result = cal.create_event(response.get("slots", {}))
+        elif intent == "create_event":
+            result = cal.create_event(slots)
             action_icon = "📅"
             self.logger.log(f"{action_icon} Action: {result}", self.log_box)
-            if not self.muted:
-                self.speak_and_wait(result)
 
         elif intent == "music_control":
             action = slots.get("action")
@@ -569,8 +814,6 @@ Ready when you are! 👇"""
                 result = "Unknown music action."
                 action_icon = "🎵"
             self.logger.log(f"{action_icon} Action: {result}", self.log_box)
-            if not self.muted:
-                self.speak_and_wait(result)
 
         elif intent == "code_action":
             action = slots.get("action")
@@ -584,6 +827,8 @@ Ready when you are! 👇"""
                 result = ca.create_file(slots)
                 action_icon = "📄"
             elif action == "write_code":
+                if asr:
+                    self.dictate_slot(slots, "instruction", "Describe the code you want.")
                 result = ca.write_code(slots)
                 action_icon = "✍️"
             elif action == "run_code":
@@ -593,8 +838,6 @@ Ready when you are! 👇"""
                 result = "Unknown code action."
                 action_icon = "💻"
             self.logger.log(f"{action_icon} Action: {result}", self.log_box)
-            if not self.muted:
-                self.speak_and_wait(result)
 
         elif intent == "system_monitor":
             action = slots.get("action", "summary")
@@ -614,41 +857,113 @@ Ready when you are! 👇"""
                 result = sm.get_system_summary()
                 action_icon = "📊"
             self.logger.log(f"{action_icon} Action: {result}", self.log_box)
-            if not self.muted:
-                self.speak_and_wait(result)
 
         else:
             result = "🤔 I didn't understand that command. Try: 🔊 volume, 🌤️ weather, 🎵 music, or 💻 system commands."
             action_icon = "❓"
+            handled = False
             self.logger.log(f"{action_icon} Unknown intent: {intent}", self.log_box)
-            if not self.muted:
-                self.speak_and_wait(result)
-        
-        # Show result in chat with emoji
-        self.add_chat_message("assistant", f"{action_icon} {result}")
-        
-        # Stop listening
-        if self.listening:
-            self.listening = False
-            self.mic_btn.config(text="🎤", bg="#38a169", fg="white")
-            self.status_label.config(text="● Ready", fg="#90ee90")
+
+        return action_icon, result, handled, None if quiet else result
+
+    def is_interactive(self, step, asr):
+        """Steps that talk to the user (confirmation, dictation) and need the mic."""
+        intent, slots = step.get("intent"), step.get("slots") or {}
+        if intent == "power_action":
+            return True
+        if not asr:
+            return False
+        if intent == "send_email":
+            return not (slots.get("body") or "").strip()
+        if intent == "code_action" and slots.get("action") == "write_code":
+            return not (slots.get("instruction") or "").strip()
+        return False
+
+    def execute_compound(self, steps, sequential, asr):
+        """
+        Run the intents of a compound command: in order when sequential,
+        otherwise concurrently. Steps that talk to the user run one at a
+        time on this thread. Steps on the same device run in one ordered
+        chain: code actions work on each other's files, and music and
+        volume steps share the media keys and mixer. Returns
+        execute_intent() results in the order the steps were spoken.
+        """
+        results = [None] * len(steps)
+
+        def run(indexes):
+            for i in indexes:
+                try:
+                    results[i] = self.execute_intent(steps[i], asr)
+                except Exception as e:
+                    intent = steps[i].get("intent")
+                    self.logger.log(f"❌ {intent} failed: {e}", self.log_box)
+                    results[i] = ("❌", f"{intent} failed: {e}", False, f"{intent} failed")
+
+        if sequential:
+            run(range(len(steps)))
+            return results
+
+        foreground = [i for i, step in enumerate(steps) if self.is_interactive(step, asr)]
+        code = [i for i, step in enumerate(steps) if step.get("intent") == "code_action"]
+        if set(code) & set(foreground):
+            foreground, code = sorted(set(foreground) | set(code)), []
+        chains = {}
+        for i, step in enumerate(steps):
+            if i in foreground or i in code:
+                continue
+            intent = step.get("intent")
+            chains.setdefault(COMPOUND_CHAINS.get(intent, intent), []).append(i)
+        chains = list(chains.values())
+        if code:
+            chains.append(code)
+
+        with ThreadPoolExecutor(max_workers=cfg.COMPOUND_MAX_WORKERS) as pool:
+            futures = [pool.submit(run, chain) for chain in chains]
+            run(foreground)
+            for future in futures:
+                future.result()
+        return results
+
+    def capture_turn(self, transcript, response, asr, timings):
+        """Save a voice turn to the capture store (opt-in, see CAPTURE_UTTERANCES)."""
+        store = get_store()
+        if store is None or asr.get("raw") is None:
+            return
+        store.save(asr["raw"], asr.get("fs") or cfg.AUDIO_SAMPLE_RATE, {
+            "transcript": transcript,
+            "intent": response,
+            "tier": asr.get("tier"),
+            "logprob": asr.get("logprob"),
+            "capture": asr.get("capture"),
+            "timings": {k: round(v, 4) for k, v in timings.items()},
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        })
+
+    def record_action_latency(self, asr, action_at, path):
+        """End-of-speech to action start, per dispatch path (early/final)."""
+        if action_at is None or not asr.get("speech_end_at"):
+            return
+        seconds = action_at - asr["speech_end_at"]
+        latency.observe(f"eos_to_action.{path}", seconds)
+        self.logger.log(f"⏱️ End of speech -> action ({path}): {seconds * 1000:.0f} ms", self.log_box)
+
+    def parse_intent(self, transcript: str):
+        response = extract_intent(transcript)
+
+        if isinstance(response, str):
+            try:
+                response = json.loads(response)
+            except:
+                response = {"intent": "other", "slots": {}}
+        return response
 
     def speak_and_wait(self, text):
+        # gate the mic so our own voice is never transcribed as a command
         self.speaking = True
-        speak(text, block=True) 
+        with tts_gate():
+            speak(text, block=True)
         self.speaking = False
 
-    def cleanup_files(self, audio_file):
-        try:
-            if os.path.exists(audio_file):
-                os.remove(audio_file)
-            txt_file = audio_file + ".txt"
-            if os.path.exists(txt_file):
-                os.remove(txt_file)
-            self.logger.log("🧹 Cleaned up temporary files", self.log_box)
-        except Exception as e:
-            self.logger.log(f"⚠️ Cleanup failed: {e}", self.log_box)
-
     def run(self):
         # Center window
         self.root.update_idletasks()
@@ -0,0 +1,191 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import config.settings as cfg
+from audio.recorder import get_stream, listen_utterance
+from audio.cascade import transcribe_utterance
+from audio.streaming import listen_streaming
+from audio.capture_store import keep_raw
+from utils.metrics import get_metrics
+
+metrics = get_metrics("pipeline")
+
+
+class ListeningPipeline:
+    """
+    Three stages connected by bounded queues:
+
+        capture -> [audio queue] -> transcribe -> [text queue] -> handle
+
+    The next utterance is captured while the previous one is still being
+    transcribed or handled. When a queue is full the stage before it
+    blocks, so the mic never runs more than `queue_size` turns ahead.
+    """
+
+    def __init__(self, on_transcript, on_error=None, on_capture=None, queue_size=None):
+        self.on_transcript = on_transcript
+        self.on_error = on_error or (lambda e: print("❌ Pipeline error:", e))
+        self.on_capture = on_capture
+
+        size = queue_size or cfg.PIPELINE_QUEUE_SIZE
+        self._audio_q = queue.Queue(maxsize=size)
+        self._text_q = queue.Queue(maxsize=size)
+
+        # one buffer per utterance that can be in flight: being captured,
+        # queued for ASR, being transcribed, queued for handling, and being
+        # handled (the handler may re-decode it with a larger model)
+        capacity = get_stream().capacity
+        self._buffers = [np.empty(capacity, dtype=np.int16) for _ in range(2 * size + 3)]
+        self._next_buffer = 0
+
+        self._running = threading.Event()
+        self._released = threading.Event()
+        self._released.set()
+        self._holds = 0
+        self._hold_gen = 0
+        self._hold_lock = threading.Lock()
+        self._dropped_early = []
+        self._threads = []
+
+    # -----------------------------
+    # Control
+    # -----------------------------
+    def start(self):
+        if self._running.is_set():
+            return
+        self._running.set()
+        self._threads = [
+            threading.Thread(target=self._capture_loop, daemon=True),
+            threading.Thread(target=self._transcribe_loop, daemon=True),
+            threading.Thread(target=self._handle_loop, daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+
+    def stop(self):
+        self._running.clear()
+        self._released.set()
+        # unblock the consumer stages
+        for q in (self._audio_q, self._text_q):
+            try:
+                q.put_nowait(None)
+            except queue.Full:
+                pass
+
+    @property
+    def running(self):
+        return self._running.is_set()
+
+    @contextmanager
+    def hold(self):
+        """
+        Pause command capture while something else owns the mic (e.g. a
+        voice confirmation). Anything captured during the hold is dropped.
+        """
+        with self._hold_lock:
+            self._holds += 1
+            self._hold_gen += 1
+            self._released.clear()
+        try:
+            yield
+        finally:
+            with self._hold_lock:
+                self._holds -= 1
+                if self._holds == 0:
+                    self._released.set()
+
+    # -----------------------------
+    # Stages
+    # -----------------------------
+    def _capture_loop(self):
+        while self._running.is_set():
+            self._released.wait()
+            if not self._running.is_set():
+                break
+
+            gen = self._hold_gen
+            buf = self._buffers[self._next_buffer]
+            try:
+                if cfg.STREAMING_ASR:
+                    samples, info = listen_streaming(
+                        "command", out=buf,
+                        on_early=lambda text, intent, gen=gen: self._dispatch_early(text, intent, gen),
+                    )
+                else:
+                    samples, info = listen_utterance("command", out=buf)
+            except Exception as e:
+                self.on_error(e)
+                time.sleep(0.5)
+                continue
+
+            if self.on_capture:
+                self.on_capture(info)
+            if gen != self._hold_gen or not len(samples):
+                continue
+
+            self._next_buffer = (self._next_buffer + 1) % len(self._buffers)
+            self._put(self._audio_q, (samples, info))
+
+    def _held_since(self, gen):
+        """True if the mic was held at any point since generation `gen`."""
+        with self._hold_lock:
+            return gen != self._hold_gen or not self._released.is_set()
+
+    def _dispatch_early(self, text, intent, gen):
+        # a partial heard while something else owns the mic is not a command
+        if self._held_since(gen):
+            metrics.incr("early_dropped")
+            return
+        # straight to the handler; the final transcript follows through ASR
+        self._put(self._text_q, {"text": text, "early": True, "intent": intent, "gen": gen})
+
+    def _transcribe_loop(self):
+        while self._running.is_set():
+            item = self._audio_q.get()
+            if item is None:
+                break
+            samples, info = item
+            try:
+                with metrics.timer("asr"):
+                    asr = transcribe_utterance(samples)
+            except Exception as e:
+                self.on_error(e)
+                continue
+
+            keep_raw(asr, samples, info)
+            asr["early_intent"] = info.get("early")
+            asr["early_at"] = info.get("early_at")
+            asr["speech_end_at"] = info.get("speech_end_at")
+            if asr["text"].strip():
+                self._put(self._text_q, asr)
+
+    def _handle_loop(self):
+        while self._running.is_set():
+            asr = self._text_q.get()
+            if asr is None:
+                break
+            if asr.get("early") and self._held_since(asr["gen"]):
+                # a hold began after this was heard: leave it to the final transcript
+                self._dropped_early = self._dropped_early[-7:] + [asr["intent"]]
+                metrics.incr("early_dropped")
+                continue
+            if any(d is asr.get("early_intent") for d in self._dropped_early):
+                asr["early_intent"] = None
+            try:
+                with metrics.timer("handle"):
+                    self.on_transcript(asr["text"].strip(), asr)
+                metrics.incr("commands")
+            except Exception as e:
+                self.on_error(e)
+
+    def _put(self, q, item):
+        # blocking put with a timeout so stop() is never stuck behind a full queue
+        while self._running.is_set():
+            try:
+                q.put(item, timeout=0.2)
+                return
+            except queue.Full:
+                continue
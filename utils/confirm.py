@@ -1,62 +1,105 @@
 # utils/confirm.py
-import tempfile
 import time
+import config.settings as cfg
 from utils.tts import speak
-from audio.recorder import record_audio
-from audio.transcriber import transcribe_audio
+from utils.metrics import get_metrics
+from audio.recorder import listen_utterance, tts_gate
+from audio.transcriber import transcribe_pcm
+from audio.grammar import GrammarRecognizer
+from audio.whisper_server import WhisperServerError
 
 YES_PHRASES = {"yes", "yeah", "yup", "confirm", "sure", "okay", "ok", "affirmative", "proceed"}
 NO_PHRASES = {"no", "nope", "nah", "cancel", "stop", "negative", "don't", "do not", "not now"}
 
+metrics = get_metrics("confirm")
+
+_recognizer = GrammarRecognizer({
+    "yes": sorted(YES_PHRASES | {"yes please", "go ahead", "do it"}),
+    "no": sorted(NO_PHRASES | {"no thanks", "never mind"}),
+}, exact=("yes",))
+
 def _normalize_text(t: str):
     if not t:
         return ""
     return t.strip().lower()
 
+def _match_transcript(transcript: str):
+    """
+    Token/prefix matching on a free-form transcript.
+    Returns True/False for a clear answer, None otherwise.
+    """
+    text = _normalize_text(transcript)
+    tokens = set(word.strip(".,!?") for word in text.split())
+
+    # check explicit yes/no
+    if tokens & YES_PHRASES:
+        return True
+    if tokens & NO_PHRASES:
+        return False
+
+    # prefixes fallback
+    if text.startswith(("yes", "yeah", "ok", "okay")):
+        return True
+    if text.startswith(("no", "nah", "cancel")):
+        return False
+    return None
+
+def recognize_confirmation(samples):
+    """
+    Decide yes/no for a recorded answer.
+    Returns (decision, confidence) where decision is True, False or None.
+
+    The grammar recognizer answers first; the general-purpose transcriber
+    only runs when its confidence is below CONFIRM_MIN_CONFIDENCE.
+    """
+    start = time.perf_counter()
+    try:
+        label, confidence, _ = _recognizer.recognize(samples)
+    except WhisperServerError:
+        label, confidence = None, 0.0
+
+    if label is not None and confidence >= cfg.CONFIRM_MIN_CONFIDENCE:
+        metrics.incr("grammar_hits")
+        metrics.observe("grammar_latency", time.perf_counter() - start)
+        return label == "yes", confidence
+
+    # low confidence -> full transcription + phrase matching
+    metrics.incr("fallbacks")
+    decision = _match_transcript(transcribe_pcm(samples))
+    metrics.observe("fallback_latency", time.perf_counter() - start)
+    return decision, (confidence if decision is None else max(confidence, 0.5))
+
 def confirm_voice(prompt: str, retries: int = 1, record_seconds: int = 4):
     """
     Speak `prompt` and listen for a yes/no response.
     Returns True if confirmed, False if denied or unclear after retries.
     - retries: how many extra tries to re-prompt
-    - record_seconds: how long to record; adapt if your recorder supports duration
+    - record_seconds: hard maximum for the answer; recording ends earlier on silence
     """
     for attempt in range(retries + 1):
-        # Speak prompt (blocking)
-        speak(prompt, block=True)
-
-        # Create temp file and record
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-            audio_path = tmp.name
+        # Speak prompt (blocking) with the mic gated so it isn't heard back
+        with tts_gate():
+            speak(prompt, block=True)
 
-        # If your recorder supports duration, use it; otherwise it should record until silence or fixed time
+        # Pull the answer from the always-open mic stream; the short
+        # "confirm" profile stops as soon as the user goes quiet
         try:
-            # If record_audio supports duration, change call accordingly:
-            # record_audio(audio_path, duration=record_seconds)
-            record_audio(audio_path)
-            # small wait to ensure file flush
-            time.sleep(0.2)
-            transcript = transcribe_audio(audio_path)
+            samples, _ = listen_utterance("confirm", max_seconds=record_seconds)
+            if len(samples):
+                decision, confidence = recognize_confirmation(samples)
+                print(f"✅ Confirmation: {decision} (confidence {confidence:.2f})")
+            else:
+                decision = None
         except Exception:
-            transcript = ""
-
-        text = _normalize_text(transcript)
-        tokens = set(word.strip(".,!?") for word in text.split())
-
-        # check explicit yes/no
-        if tokens & YES_PHRASES:
-            return True
-        if tokens & NO_PHRASES:
-            return False
+            decision = None
 
-        # prefixes fallback
-        if text.startswith(("yes", "yeah", "ok", "okay")):
-            return True
-        if text.startswith(("no", "nah", "cancel")):
-            return False
+        if decision is not None:
+            return decision
 
         # unclear -> re-prompt if retries remain
         if attempt < retries:
-            speak("I didn't catch that. Please say yes or no.", block=True)
+            with tts_gate():
+                speak("I didn't catch that. Please say yes or no.", block=True)
 
     # default: not confirmed
     return False
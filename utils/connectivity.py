@@ -0,0 +1,122 @@
+import socket
+import threading
+import time
+
+import config.settings as cfg
+from utils.metrics import get_metrics
+
+metrics = get_metrics("connectivity")
+
+
+class ConnectivityMonitor:
+    """
+    Online/offline state kept up to date in the background, so callers
+    never wait on the network to ask.
+
+    Passive signals come first: a successful remote request marks us
+    online and postpones the next probe; a failed connection schedules a
+    probe right away. Otherwise a cheap TCP probe runs every
+    CONNECTIVITY_PROBE_INTERVAL seconds (CONNECTIVITY_OFFLINE_INTERVAL
+    while offline). Listeners are called with the new state on every change.
+    """
+
+    def __init__(self):
+        self._online = True          # optimistic until the first probe says otherwise
+        self._pinned = None
+        self._last_success = 0.0
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="connectivity", daemon=True)
+            self._thread.start()
+        return self
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+    def is_online(self) -> bool:
+        """Last known state; never blocks."""
+        return self._online if self._pinned is None else self._pinned
+
+    def add_listener(self, fn):
+        """fn(online) is called from the monitor thread on every change."""
+        with self._lock:
+            self._listeners.append(fn)
+
+    def pin(self, online):
+        """Fix the reported state (benchmarks, stub servers); None resumes probing."""
+        self._pinned = online
+
+    # -----------------------------
+    # Passive signals
+    # -----------------------------
+    def report_success(self):
+        self._last_success = time.monotonic()
+        self._set(True, "request succeeded")
+
+    def report_failure(self):
+        """A remote request could not connect: check now rather than wait."""
+        metrics.incr("failures_reported")
+        self._wake.set()
+
+    # -----------------------------
+    # Probing
+    # -----------------------------
+    def probe(self) -> bool:
+        """True if any probe host accepts a TCP connection."""
+        metrics.incr("probes")
+        for host, port in cfg.CONNECTIVITY_PROBE_HOSTS:
+            try:
+                with socket.create_connection((host, port), timeout=cfg.CONNECTIVITY_PROBE_TIMEOUT):
+                    return True
+            except OSError:
+                continue
+        return False
+
+    def _run(self):
+        while True:
+            idle = time.monotonic() - self._last_success
+            if idle >= cfg.CONNECTIVITY_PROBE_INTERVAL or not self._online or self._wake.is_set():
+                self._wake.clear()
+                online = self.probe()
+                self._set(online, "probe")
+                if online:
+                    self._last_success = time.monotonic()
+
+            interval = cfg.CONNECTIVITY_PROBE_INTERVAL if self._online else cfg.CONNECTIVITY_OFFLINE_INTERVAL
+            wait = max(1.0, interval - (time.monotonic() - self._last_success)) if self._online else interval
+            self._wake.wait(wait)
+
+    def _set(self, online, reason):
+        with self._lock:
+            if online == self._online:
+                return
+            self._online = online
+            listeners = list(self._listeners)
+        metrics.incr("went_online" if online else "went_offline")
+        print(("🌐 Online" if online else "📴 Offline") + f" ({reason})")
+        for fn in listeners:
+            try:
+                fn(online)
+            except Exception as e:
+                print("⚠️ Connectivity listener failed:", e)
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_monitor():
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = ConnectivityMonitor().start()
+        return _monitor
+
+
+def is_online() -> bool:
+    return get_monitor().is_online()
@@ -0,0 +1,236 @@
+"""
+Tolerant JSON extraction from LLM output, whole or streamed token by token.
+
+Models wrap their JSON in prose or code fences, leave trailing commas and
+write Python literals; all of that is accepted. Only the first object
+that parses counts (a "{" in the prose before it is skipped) and anything
+after it is ignored. A cut-off object still yields the members that were
+complete.
+"""
+
+import re
+
+_WS = " \t\r\n"
+_NUMBER = re.compile(r"-?\d+(\.\d+)?([eE][+-]?\d+)?")
+_LITERALS = {"true": True, "false": False, "null": None, "True": True, "False": False, "None": None}
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class _Incomplete(Exception):
+    """The text ended inside a value."""
+
+
+def _skip(s, i):
+    while i < len(s) and s[i] in _WS:
+        i += 1
+    return i
+
+
+def _string(s, i):
+    quote = s[i]
+    out, i = [], i + 1
+    while i < len(s):
+        c = s[i]
+        if c == quote:
+            return "".join(out), i + 1
+        if c == "\\":
+            if i + 1 >= len(s):
+                break
+            e = s[i + 1]
+            if e == "u":
+                if i + 6 > len(s):
+                    break
+                out.append(chr(int(s[i + 2:i + 6], 16)))
+                i += 6
+                continue
+            out.append(_ESCAPES.get(e, e))
+            i += 2
+            continue
+        out.append(c)
+        i += 1
+    raise _Incomplete
+
+
+def _value(s, i, members=None):
+    i = _skip(s, i)
+    if i >= len(s):
+        raise _Incomplete
+    c = s[i]
+    if c == "{":
+        return _object(s, i, members)
+    if c == "[":
+        return _array(s, i)
+    if c in "\"'":
+        return _string(s, i)
+    m = _NUMBER.match(s, i)
+    if m:
+        if m.end() == len(s):
+            raise _Incomplete  # more digits may follow
+        text = m.group()
+        return (float(text) if m.group(1) or m.group(2) else int(text)), m.end()
+    for word, value in _LITERALS.items():
+        if s.startswith(word, i):
+            return value, i + len(word)
+        if word.startswith(s[i:]):
+            raise _Incomplete
+    raise ValueError(f"unexpected {c!r} at {i}")
+
+
+def _object(s, i, members=None):
+    """Parse {...} at s[i]. Complete members are also put in `members`."""
+    obj = {} if members is None else members
+    i += 1
+    while True:
+        i = _skip(s, i)
+        if i >= len(s):
+            raise _Incomplete
+        if s[i] == "}":
+            return obj, i + 1
+        if s[i] not in "\"'":
+            raise ValueError(f"expected a key at {i}")
+        key, i = _string(s, i)
+        i = _skip(s, i)
+        if i >= len(s):
+            raise _Incomplete
+        if s[i] != ":":
+            raise ValueError(f"expected ':' at {i}")
+        value, i = _value(s, i + 1)
+        obj[key] = value
+        i = _skip(s, i)
+        if i >= len(s):
+            raise _Incomplete
+        if s[i] == ",":
+            i += 1
+        elif s[i] != "}":
+            raise ValueError(f"expected ',' or '}}' at {i}")
+
+
+def _array(s, i):
+    arr = []
+    i += 1
+    while True:
+        i = _skip(s, i)
+        if i >= len(s):
+            raise _Incomplete
+        if s[i] == "]":
+            return arr, i + 1
+        value, i = _value(s, i)
+        arr.append(value)
+        i = _skip(s, i)
+        if i >= len(s):
+            raise _Incomplete
+        if s[i] == ",":
+            i += 1
+        elif s[i] != "]":
+            raise ValueError(f"expected ',' or ']' at {i}")
+
+
+def parse_prefix(text, start=None):
+    """
+    (members, complete) for the first JSON object in `text`: the members
+    whose values are complete so far, and whether the object has closed.
+    A "{" that doesn't start a valid object is skipped, unless `start`
+    pins where the object begins. Raises ValueError if there is no object.
+    """
+    error = ValueError("no JSON object in the model output")
+    pos = text.find("{") if start is None else start
+    while pos >= 0:
+        members = {}
+        try:
+            _object(text, pos, members)
+            return members, True
+        except _Incomplete:
+            return members, False
+        except ValueError as e:
+            if start is not None:
+                raise
+            error = e
+        pos = text.find("{", pos + 1)
+    raise error
+
+
+def extract_json(text, ready=None):
+    """
+    The first JSON object in a model's answer. Surrounding prose and code
+    fences are ignored. If the object was cut off, its complete members are
+    returned when `ready(members)` accepts them (any members at all without
+    `ready`); otherwise ValueError is raised.
+    """
+    members, complete = parse_prefix(text)
+    if not complete and not (members and (ready is None or ready(members))):
+        raise ValueError("incomplete JSON object in the model output")
+    return members
+
+
+class StreamingJSON:
+    """
+    Feed streamed tokens; feed() returns True once `ready(members)` says
+    the members seen so far are enough (or the object has closed), so the
+    caller can stop the stream.
+
+    Brackets and strings are tracked as tokens arrive, and the partial
+    object is only re-parsed when a top-level member may have just
+    completed.
+    """
+
+    def __init__(self, ready=None):
+        self._accept = ready
+        self.ready = ready or (lambda members: False)
+        self.text = ""
+        self.members = {}
+        self.complete = False
+        self._start = -1
+        self._depth = 0
+        self._in_string = None
+        self._escape = False
+
+    def feed(self, token):
+        if self.complete:
+            return True
+        base = len(self.text)
+        self.text += token
+        return self._scan(base)
+
+    def _scan(self, pos):
+        boundary = False
+        for i in range(pos, len(self.text)):
+            c = self.text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == self._in_string:
+                    self._in_string = None
+                    boundary = boundary or self._depth == 1
+                continue
+            if self._start < 0:
+                if c == "{":
+                    self._start, self._depth = i, 1
+                continue
+            if c in "\"'":
+                self._in_string = c
+            elif c in "{[":
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                boundary = boundary or self._depth <= 1
+                if self._depth == 0:
+                    break
+            elif c == "," and self._depth == 1:
+                boundary = True
+
+        if boundary:
+            try:
+                self.members, self.complete = parse_prefix(self.text, self._start)
+            except ValueError:
+                # not the object after all ("{as requested}"): look for the next one
+                restart = self._start + 1
+                self.members, self._start, self._depth = {}, -1, 0
+                self._in_string, self._escape = None, False
+                return self._scan(restart)
+        return self.complete or (bool(self.members) and self.ready(self.members))
+
+    def result(self):
+        """Like extract_json() on everything fed so far."""
+        return extract_json(self.text, self._accept)
@@ -0,0 +1,466 @@
+import json
+import queue
+import re
+import socket
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ClosedPoolError
+
+import config.settings as cfg
+from utils.connectivity import get_monitor, is_online
+from utils.json_stream import StreamingJSON, extract_json
+from utils.llm_router import LLMRouter
+from utils.metrics import get_metrics
+
+metrics = get_metrics("llm")
+
+# latency histogram bucket edges (seconds) reported by hedge_stats()
+LATENCY_BUCKETS = (0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 3, 5, 10)
+
+
+class LLMError(RuntimeError):
+    pass
+
+
+def strip_code_fences(text: str) -> str:
+    """Remove a ```lang ... ``` wrapper some models add around code or JSON."""
+    m = re.match(r"^\s*```[\w+-]*\s*\n(.*?)\n?```\s*$", text, re.S)
+    return m.group(1) if m else text
+
+
+def _retry_after(error):
+    """Seconds a rate-limited (HTTP 429) backend asked us to wait, else None."""
+    response = getattr(error, "response", None)
+    if response is None or response.status_code != 429:
+        return None
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return float(cfg.LLM_BREAKER_COOLDOWN)
+
+
+class AbortableAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that can cut off its requests in flight. abort() shuts down
+    the socket of every connection checked out of its pools, so a request
+    still waiting for headers (a model loading, a slow upstream) fails at
+    once instead of running to its timeout. Requests that start afterwards
+    fail too.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.aborted = False
+        self._in_flight = weakref.WeakSet()
+        self._in_flight_lock = threading.Lock()
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: self._tracked(cls) for scheme, cls in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+    def _tracked(self, pool_cls):
+        adapter = self
+
+        class TrackedPool(pool_cls):
+            def _get_conn(self, timeout=None):
+                if adapter.aborted:
+                    raise ClosedPoolError(self, "request aborted")
+                conn = super()._get_conn(timeout)
+                with adapter._in_flight_lock:
+                    adapter._in_flight.add(conn)
+                return conn
+
+            def _put_conn(self, conn):
+                if conn is not None:  # None after a connection error
+                    with adapter._in_flight_lock:
+                        adapter._in_flight.discard(conn)
+                super()._put_conn(conn)
+
+        return TrackedPool
+
+    def abort(self):
+        """Close every connection in flight; returns how many were closed."""
+        self.aborted = True
+        with self._in_flight_lock:
+            conns = list(self._in_flight)
+        closed = 0
+        for conn in conns:
+            sock = getattr(conn, "sock", None)
+            if sock is None:
+                continue  # still connecting: bounded by LLM_CONNECT_TIMEOUT
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                continue
+            closed += 1
+        self.close()
+        return closed
+
+
+def _aborted(session):
+    return any(getattr(a, "aborted", False) for a in session.adapters.values())
+
+
+class LLMClient:
+    """
+    One place for every LLM call: Groq (OpenAI-compatible chat API) and the
+    local Ollama HTTP API.
+
+    Each backend has its own pooled keep-alive requests.Session, so repeat
+    calls reuse the TCP/TLS connection. Ollama requests carry keep_alive so
+    the model stays loaded between calls. Calls support JSON mode,
+    streaming (on_token callback) and per-call timeouts.
+
+    Requests are routed by an LLMRouter: backends are tried fastest
+    expected first and skipped while their circuit breaker is open.
+
+    Hedged races check a session per backend out of a small spare pool, so
+    the loser's connection can be aborted without touching anyone else's.
+    """
+
+    def __init__(self):
+        self._groq = self._session()
+        self._ollama = self._session()
+        self._spare = {"groq": [], "ollama": []}
+        self._spare_lock = threading.Lock()
+        self._hedge_pool = ThreadPoolExecutor(max_workers=cfg.LLM_POOL_SIZE * 2, thread_name_prefix="llm-hedge")
+        self.router = LLMRouter(
+            ("groq", "ollama"),
+            probe=self._probe,
+            available=lambda name: name != "groq" or is_online(),
+        )
+
+    @staticmethod
+    def _session():
+        session = requests.Session()
+        adapter = AbortableAdapter(pool_connections=2, pool_maxsize=cfg.LLM_POOL_SIZE, max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _checkout(self, name):
+        with self._spare_lock:
+            spare = self._spare[name]
+            return spare.pop() if spare else self._session()
+
+    def _checkin(self, name, session):
+        """Keep a session for the next race, unless it was aborted."""
+        if _aborted(session):
+            return
+        with self._spare_lock:
+            if len(self._spare[name]) < cfg.LLM_POOL_SIZE:
+                self._spare[name].append(session)
+                return
+        session.close()
+
+    @staticmethod
+    def _abort(session):
+        adapters = {id(a): a for a in session.adapters.values()}
+        return sum(a.abort() for a in adapters.values())
+
+    @staticmethod
+    def _messages(prompt, system):
+        messages = [{"role": "system", "content": system}] if system else []
+        return messages + [{"role": "user", "content": prompt}]
+
+    def _timeout(self, timeout):
+        return (cfg.LLM_CONNECT_TIMEOUT, timeout or cfg.LLM_TIMEOUT)
+
+    # -----------------------------
+    # Backends
+    # -----------------------------
+    def groq(self, prompt, system=None, json_mode=False, temperature=0, timeout=None, on_token=None, session=None):
+        payload = {
+            "model": cfg.GROQ_MODEL,
+            "messages": self._messages(prompt, system),
+            "temperature": temperature,
+            "stream": on_token is not None,
+        }
+        if json_mode and on_token is None:
+            # Groq rejects response_format on streamed requests; the prompt
+            # asks for JSON anyway
+            payload["response_format"] = {"type": "json_object"}
+
+        session = session or self._groq
+        try:
+            r = session.post(
+                cfg.GROQ_URL,
+                headers={"Authorization": f"Bearer {cfg.GROQ_API_KEY}"},
+                json=payload,
+                timeout=self._timeout(timeout),
+                stream=on_token is not None,
+            )
+        except (requests.ConnectionError, requests.Timeout):
+            if not _aborted(session):
+                get_monitor().report_failure()
+            raise
+        get_monitor().report_success()
+        r.raise_for_status()
+        if on_token is None:
+            return r.json()["choices"][0]["message"]["content"]
+
+        # server-sent events: "data: {...}" lines, ending with "data: [DONE]"
+        parts = []
+        with r:
+            for line in r.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                token = json.loads(data)["choices"][0].get("delta", {}).get("content")
+                if token:
+                    parts.append(token)
+                    if on_token(token) is False:
+                        break
+        return "".join(parts)
+
+    def ollama(self, prompt, system=None, json_mode=False, temperature=0, timeout=None, on_token=None, session=None):
+        payload = {
+            "model": cfg.OLLAMA_MODEL,
+            "messages": self._messages(prompt, system),
+            "stream": on_token is not None,
+            "keep_alive": cfg.OLLAMA_KEEP_ALIVE,
+            "options": {"temperature": temperature},
+        }
+        if json_mode:
+            payload["format"] = "json"
+
+        r = (session or self._ollama).post(
+            cfg.OLLAMA_URL + "/api/chat",
+            json=payload,
+            timeout=self._timeout(timeout or cfg.OLLAMA_TIMEOUT),
+            stream=on_token is not None,
+        )
+        r.raise_for_status()
+        if on_token is None:
+            return r.json()["message"]["content"]
+
+        # newline-delimited JSON chunks, the last one has "done": true
+        parts = []
+        with r:
+            for line in r.iter_lines(decode_unicode=True):
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                token = chunk.get("message", {}).get("content")
+                if token:
+                    parts.append(token)
+                    if on_token(token) is False:
+                        break
+                if chunk.get("done"):
+                    break
+        return "".join(parts)
+
+    def warm_up(self):
+        """Load the Ollama model in the background so the first call is fast."""
+        def _load():
+            try:
+                self._ollama.post(
+                    cfg.OLLAMA_URL + "/api/generate",
+                    json={"model": cfg.OLLAMA_MODEL, "keep_alive": cfg.OLLAMA_KEEP_ALIVE},
+                    timeout=(cfg.LLM_CONNECT_TIMEOUT, 120),
+                )
+            except requests.RequestException:
+                pass
+        threading.Thread(target=_load, daemon=True).start()
+
+    def _probe(self, name):
+        """Tiny request the router sends to a half-open backend."""
+        getattr(self, name)("Reply with OK.", timeout=cfg.LLM_PROBE_TIMEOUT)
+
+    # -----------------------------
+    # Entry points
+    # -----------------------------
+    def backends(self, kind="default"):
+        """
+        Backends to try, in order: those with a closed breaker (Groq only
+        when online), expected fastest for this kind of request first.
+        """
+        return self.router.order(kind)
+
+    def complete(self, prompt, system=None, json_mode=False, temperature=0,
+                 timeout=None, on_token=None, backends=None, kind="default", watch=None):
+        """
+        Text completion from the first backend that answers. Returning
+        False from `on_token` stops a streamed response early. `kind`
+        ("intent", "code", ...) picks the latency score used for routing.
+
+        `watch` makes a fresh StreamingJSON-like object per attempt; the
+        response streams into its feed() and stops once feed() is True.
+        """
+        errors = []
+        for name in backends or self.backends(kind):
+            start = time.perf_counter()
+            if watch is not None:
+                on_token = _stop_when(watch())
+            try:
+                text = getattr(self, name)(prompt, system, json_mode, temperature, timeout, on_token)
+            except (requests.RequestException, KeyError, ValueError) as e:
+                metrics.incr(f"errors.{name}")
+                self.router.record_failure(name, e, _retry_after(e))
+                print(f"⚠️ {name} failed:", e)
+                errors.append(f"{name}: {e}")
+                continue
+            elapsed = time.perf_counter() - start
+            metrics.observe(f"latency.{name}", elapsed)
+            metrics.incr(f"calls.{name}")
+            self.router.record_success(name, elapsed, kind)
+            return text
+        raise LLMError("; ".join(errors) or "no LLM backend available")
+
+    def complete_json(self, prompt, system=None, hedge=False, ready=None, accept=extract_json, **kwargs):
+        """
+        Like complete() in JSON mode, returning the object `accept` makes
+        of the answer (by default the first JSON object in it, tolerating
+        prose around it). Raises ValueError when there is none.
+        With hedge=True the backends race (see hedged()).
+
+        With `ready(members)`, the answer streams and generation is cut off
+        as soon as the members parsed so far are enough.
+        """
+        if ready is not None:
+            kwargs["watch"] = lambda: StreamingJSON(ready)
+        if hedge:
+            return self.hedged(prompt, system, json_mode=True, accept=accept, **kwargs)
+        return accept(self.complete(prompt, system, json_mode=True, **kwargs))
+
+    def hedged(self, prompt, system=None, json_mode=False, temperature=0,
+               timeout=None, delay=None, accept=None, kind="default", watch=None):
+        """
+        Race the backends: start the first, start the next one after `delay`
+        seconds (cfg.LLM_HEDGE_DELAY, 0 = all at once) or as soon as an
+        earlier one fails, and return the first answer `accept` takes
+        (`accept` may transform it; raising ValueError rejects it).
+
+        Each backend gets its own session; once one answers, the losers'
+        connections are closed, whether they are still waiting for headers
+        (a cold Ollama model) or mid-stream, and Ollama stops generating.
+        `watch` works as in complete().
+        """
+        names = self.backends(kind)
+        delay = cfg.LLM_HEDGE_DELAY if delay is None else delay
+        accept = accept or (lambda text: text)
+        results = queue.Queue()
+        cancelled = threading.Event()
+        sessions = {}
+        sessions_lock = threading.Lock()
+
+        def run(name, start):
+            done = _stop_when(watch()) if watch is not None else lambda token: True
+            session = self._checkout(name)
+            with sessions_lock:
+                if cancelled.is_set():
+                    self._checkin(name, session)
+                    return
+                sessions[name] = session
+            try:
+                text = getattr(self, name)(prompt, system, json_mode, temperature, timeout,
+                                           on_token=lambda token: done(token) and not cancelled.is_set(),
+                                           session=session)
+                if cancelled.is_set():
+                    return
+                elapsed = time.perf_counter() - start
+                results.put((name, accept(text), None, elapsed))
+            except Exception as e:
+                if not cancelled.is_set():
+                    results.put((name, None, e, time.perf_counter() - start))
+            finally:
+                with sessions_lock:
+                    sessions.pop(name, None)
+                self._checkin(name, session)
+
+        pending, running, errors, started = list(names), 0, [], {}
+        metrics.incr("hedge.races")
+
+        def launch():
+            nonlocal running
+            name = pending.pop(0)
+            metrics.incr(f"hedge.started.{name}")
+            started[name] = time.perf_counter()
+            self._hedge_pool.submit(run, name, started[name])
+            running += 1
+            return time.perf_counter() + delay
+
+        hedge_at = launch()
+        while running:
+            wait = max(0.0, hedge_at - time.perf_counter()) if pending else None
+            try:
+                name, value, error, elapsed = results.get(timeout=wait)
+            except queue.Empty:
+                metrics.incr("hedge.fired")
+                hedge_at = launch()
+                continue
+            running -= 1
+            del started[name]
+
+            if error is None:
+                with sessions_lock:
+                    cancelled.set()
+                    losers = [sessions[n] for n in started if n in sessions]
+                metrics.incr(f"calls.{name}")
+                metrics.incr(f"hedge.wins.{name}")
+                metrics.observe(f"latency.{name}", elapsed)
+                # only requests whose connection was actually closed
+                metrics.incr("hedge.cancelled", sum(1 for loser in losers if self._abort(loser)))
+                self.router.record_success(name, elapsed, kind)
+                now = time.perf_counter()
+                for loser, loser_start in started.items():
+                    self.router.record_slow(loser, now - loser_start, kind)
+                return value
+
+            metrics.incr(f"errors.{name}")
+            if not isinstance(error, ValueError):
+                # an answer that isn't JSON says nothing about the backend's health
+                self.router.record_failure(name, error, _retry_after(error))
+            print(f"⚠️ {name} failed:", error)
+            errors.append(f"{name}: {error}")
+            if pending:
+                hedge_at = launch()
+
+        metrics.incr("hedge.failed")
+        raise LLMError("; ".join(errors) or "no LLM backend available")
+
+
+def _stop_when(watcher):
+    """on_token callback that stops the stream once watcher.feed() is True."""
+    def on_token(token):
+        if watcher.feed(token):
+            metrics.incr("stopped_early")
+            return False
+        return True
+    return on_token
+
+
+def hedge_stats(edges=LATENCY_BUCKETS):
+    """
+    How often each backend wins a hedged race, how often the hedge fires,
+    and per-backend latency histograms (bucketed at `edges`) for tuning
+    cfg.LLM_HEDGE_DELAY.
+    """
+    races = metrics.count("hedge.races")
+    names = ("groq", "ollama")
+    return {
+        "races": races,
+        "hedge_fired": metrics.ratio("hedge.fired", "hedge.races"),
+        "win_rate": {n: metrics.ratio(f"hedge.wins.{n}", "hedge.races") for n in names},
+        "edges": list(edges),
+        "latency": {n: metrics.histogram(f"latency.{n}", edges) for n in names},
+        "counters": metrics.snapshot()["counters"],
+    }
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = LLMClient()
+        return _client
@@ -0,0 +1,188 @@
+import threading
+import time
+
+import config.settings as cfg
+from utils.metrics import get_metrics
+
+metrics = get_metrics("llm_router")
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+
+class BackendHealth:
+    """
+    Running score and circuit breaker for one LLM backend. Latency EWMAs
+    are kept per request kind ("intent", "code", ...) because a code
+    answer takes far longer than an intent answer on either backend.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.latency = {}
+        self.error_rate = 0.0
+        self.failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.cooldown = cfg.LLM_BREAKER_COOLDOWN
+        self.last_error = None
+
+    def expected_latency(self, kind):
+        if kind in self.latency:
+            return self.latency[kind]
+        known = [v for k, v in self.latency.items() if k != "probe"]
+        if known:
+            return max(known)
+        return cfg.LLM_ROUTER_PRIOR.get(self.name, 1.0)
+
+    def cost(self, kind):
+        """Expected seconds for a request, counting time lost to failures."""
+        return self.expected_latency(kind) + self.error_rate * cfg.LLM_ROUTER_ERROR_PENALTY
+
+
+class LLMRouter:
+    """
+    Orders the LLM backends for each request by expected cost: an EWMA of
+    latency plus an EWMA error rate times a penalty. After
+    LLM_BREAKER_FAILURES failures in a row (or one HTTP 429) a backend's
+    breaker opens and it is skipped. After the cooldown it goes half-open
+    and a background probe decides whether it closes again or stays open
+    for twice as long.
+    """
+
+    def __init__(self, names, probe, available=None):
+        self._health = {name: BackendHealth(name) for name in names}
+        self._probe_fn = probe
+        self._available = available or (lambda name: True)
+        self._lock = threading.Lock()
+
+    # -----------------------------
+    # Routing
+    # -----------------------------
+    def order(self, kind="default"):
+        """
+        Usable backends, expected fastest first. When every breaker is open
+        the one due to close soonest is returned so requests still go out.
+        """
+        available = [name for name in self._health if self._available(name)]
+        with self._lock:
+            healths = [self._health[name] for name in available]
+            usable = [h for h in healths if h.state == CLOSED]
+            if not usable and healths:
+                usable = [min(healths, key=lambda h: h.opened_at + h.cooldown)]
+                metrics.incr("all_open")
+            usable.sort(key=lambda h: h.cost(kind))
+            return [h.name for h in usable]
+
+    # -----------------------------
+    # Feedback
+    # -----------------------------
+    def record_success(self, name, seconds, kind="default"):
+        alpha = cfg.LLM_ROUTER_ALPHA
+        with self._lock:
+            h = self._health[name]
+            prev = h.latency.get(kind)
+            h.latency[kind] = seconds if prev is None else alpha * seconds + (1 - alpha) * prev
+            h.error_rate *= 1 - alpha
+            h.failures = 0
+            if h.state != CLOSED:
+                self._close_locked(h)
+
+    def record_slow(self, name, at_least, kind="default"):
+        """
+        A request cancelled after `at_least` seconds because another backend
+        answered first: it was at least that slow.
+        """
+        with self._lock:
+            h = self._health[name]
+            prev = h.latency.get(kind)
+            if prev is None or at_least > prev:
+                alpha = cfg.LLM_ROUTER_ALPHA
+                h.latency[kind] = at_least if prev is None else alpha * at_least + (1 - alpha) * prev
+
+    def record_failure(self, name, error=None, retry_after=None):
+        alpha = cfg.LLM_ROUTER_ALPHA
+        with self._lock:
+            h = self._health[name]
+            h.error_rate = alpha + (1 - alpha) * h.error_rate
+            h.failures += 1
+            h.last_error = str(error)[:120] if error else None
+            metrics.incr(f"failures.{name}")
+            if h.state == HALF_OPEN or retry_after is not None or h.failures >= cfg.LLM_BREAKER_FAILURES:
+                self._open_locked(h, retry_after)
+
+    # -----------------------------
+    # Breaker
+    # -----------------------------
+    def _open_locked(self, h, retry_after=None):
+        if h.state == HALF_OPEN:
+            h.cooldown = min(h.cooldown * 2, cfg.LLM_BREAKER_MAX_COOLDOWN)
+        elif h.state == CLOSED:
+            h.cooldown = cfg.LLM_BREAKER_COOLDOWN
+        if retry_after is not None:
+            h.cooldown = max(h.cooldown, retry_after)
+        if h.state == OPEN:
+            return
+        h.state = OPEN
+        h.opened_at = time.monotonic()
+        metrics.incr(f"opened.{h.name}")
+        print(f"⛔ {h.name} circuit open for {h.cooldown:.0f}s: {h.last_error}")
+
+        timer = threading.Timer(h.cooldown, self._probe, args=(h.name,))
+        timer.daemon = True
+        timer.start()
+
+    def _close_locked(self, h):
+        h.state = CLOSED
+        h.failures = 0
+        h.cooldown = cfg.LLM_BREAKER_COOLDOWN
+        metrics.incr(f"closed.{h.name}")
+        print(f"✅ {h.name} circuit closed")
+
+    def _probe(self, name):
+        with self._lock:
+            h = self._health[name]
+            if h.state != OPEN:
+                return
+            h.state = HALF_OPEN
+        metrics.incr(f"probes.{name}")
+
+        start = time.perf_counter()
+        try:
+            self._probe_fn(name)
+        except Exception as e:
+            self.record_failure(name, e)
+        else:
+            self.record_success(name, time.perf_counter() - start, kind="probe")
+
+    # -----------------------------
+    # Status
+    # -----------------------------
+    def status(self):
+        now = time.monotonic()
+        with self._lock:
+            rows = []
+            for h in self._health.values():
+                rows.append({
+                    "name": h.name,
+                    "state": h.state,
+                    "available": self._available(h.name),
+                    "retry_in": max(0.0, h.opened_at + h.cooldown - now) if h.state == OPEN else 0.0,
+                    "latency": {k: round(v, 3) for k, v in h.latency.items() if k != "probe"},
+                    "error_rate": round(h.error_rate, 3),
+                    "last_error": h.last_error,
+                })
+            return rows
+
+    def describe(self):
+        """Human-readable status, one block per backend, for the details panel."""
+        lines = []
+        for s in self.status():
+            state = s["state"] if s["available"] else "offline"
+            if s["state"] == OPEN:
+                state += f" (retry in {s['retry_in']:.0f}s)"
+            lines.append(f"{s['name']}: {state}, errors {s['error_rate']:.0%}")
+            for kind, seconds in sorted(s["latency"].items()):
+                lines.append(f"   {kind}: {seconds * 1000:.0f} ms")
+            if s["state"] != CLOSED and s["last_error"]:
+                lines.append(f"   last error: {s['last_error']}")
+        return "\n".join(lines)
@@ -0,0 +1,179 @@
+"""
+Local stand-in for Groq and Ollama, for tests and benchmarks.
+
+Speaks both APIs the LLM client uses, including streaming:
+  POST /openai/v1/chat/completions   (OpenAI/Groq, SSE when "stream")
+  POST /api/chat                     (Ollama, NDJSON when "stream")
+  POST /api/generate                 (Ollama model load; answers {})
+
+Answers come from a responder(prompt, json_mode) -> str. The default one
+answers intent prompts with the deterministic fast-path matcher (or
+{"intent": "other"}) and echoes anything else. `latency` delays the first
+token and `token_delay` spaces out streamed tokens.
+
+Usage:
+  python -m utils.llm_stub [--port 11500] [--latency 0.3] [--token-delay 0.02]
+
+In code:
+  with StubLLMServer(latency=0.2) as stub:
+      stub.install()      # point cfg.GROQ_URL / cfg.OLLAMA_URL at the stub
+      ...
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import config.settings as cfg
+
+
+def default_responder(prompt, json_mode):
+    m = re.search(r'User: "(.*?)"?\s*Return JSON', prompt, re.S)
+    if m or json_mode:
+        from nlu.fast_intent import match_intent
+        hit = match_intent(m.group(1) if m else prompt) or {"intent": "other"}
+        return json.dumps(hit)
+    return prompt.strip().splitlines()[-1] if prompt.strip() else ""
+
+
+def _tokens(text):
+    return re.findall(r"\s*\S+", text) or [""]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send(self, status, body, content_type="application/json"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, chunks, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for chunk in chunks:
+                data = chunk.encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # the client cancelled the stream
+            self.close_connection = True
+
+    def do_POST(self):
+        stub = self.server.stub
+        body = self._read_json()
+        stub.requests += 1
+
+        if self.path.endswith("/api/generate"):
+            return self._send(200, "{}")
+
+        messages = body.get("messages") or []
+        prompt = "\n".join(m.get("content", "") for m in messages if m.get("role") == "user")
+        openai = self.path.endswith("/chat/completions")
+        json_mode = body.get("format") == "json" or (body.get("response_format") or {}).get("type") == "json_object"
+
+        time.sleep(stub.latency)
+        text = stub.responder(prompt, json_mode)
+
+        if not body.get("stream"):
+            if openai:
+                reply = {"choices": [{"message": {"role": "assistant", "content": text}}]}
+            else:
+                reply = {"message": {"role": "assistant", "content": text}, "done": True}
+            return self._send(200, json.dumps(reply))
+
+        def chunks():
+            for i, token in enumerate(_tokens(text)):
+                if i:
+                    time.sleep(stub.token_delay)
+                if openai:
+                    yield "data: " + json.dumps({"choices": [{"delta": {"content": token}}]}) + "\n\n"
+                else:
+                    yield json.dumps({"message": {"content": token}, "done": False}) + "\n"
+            yield "data: [DONE]\n\n" if openai else json.dumps({"message": {"content": ""}, "done": True}) + "\n"
+
+        self._stream(chunks(), "text/event-stream" if openai else "application/x-ndjson")
+
+
+class StubLLMServer:
+    def __init__(self, port=0, latency=0.0, token_delay=0.0, responder=None):
+        self.latency = latency
+        self.token_delay = token_delay
+        self.responder = responder or default_responder
+        self.requests = 0
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread = None
+        self._saved = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.uninstall()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def install(self):
+        """Route the LLM client's Groq and Ollama calls to this stub."""
+        if self._saved is None:
+            self._saved = (cfg.GROQ_URL, cfg.OLLAMA_URL)
+        cfg.GROQ_URL = self.url + "/openai/v1/chat/completions"
+        cfg.OLLAMA_URL = self.url
+
+    def uninstall(self):
+        if self._saved is not None:
+            cfg.GROQ_URL, cfg.OLLAMA_URL = self._saved
+            self._saved = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Groq and Ollama APIs.")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="seconds between streamed tokens")
+    args = parser.parse_args()
+
+    stub = StubLLMServer(args.port, args.latency, args.token_delay).start()
+    print(f"🧪 Stub LLM on {stub.url}")
+    print(f"   GROQ_URL   = \"{stub.url}/openai/v1/chat/completions\"")
+    print(f"   OLLAMA_URL = \"{stub.url}\"")
+    try:
+        stub._thread.join()
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
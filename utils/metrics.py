@@ -0,0 +1,112 @@
+# utils/metrics.py
+import bisect
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class Metrics:
+    """
+    Thread-safe counters and recent samples (latencies, seconds saved, ...)
+    for one component. Only the last `window` samples per key are kept.
+    """
+
+    def __init__(self, name: str, window: int = 500):
+        self.name = name
+        self.window = window
+        self._counters = {}
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def incr(self, key: str, n: int = 1):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + n
+
+    def observe(self, key: str, value: float):
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(value)
+
+    @contextmanager
+    def timer(self, key: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(key, time.perf_counter() - start)
+
+    def count(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def ratio(self, part: str, whole: str) -> float:
+        total = self.count(whole)
+        return self.count(part) / total if total else 0.0
+
+    def histogram(self, key: str, edges) -> list:
+        """
+        Counts of the recent samples of `key` in the buckets split at the
+        ascending `edges`: [< e0, e0..e1, ..., >= last], len(edges) + 1 counts.
+        """
+        with self._lock:
+            values = list(self._samples.get(key, ()))
+        counts = [0] * (len(edges) + 1)
+        for v in values:
+            counts[bisect.bisect_right(edges, v)] += 1
+        return counts
+
+    def snapshot(self) -> dict:
+        """
+        {"counters": {...}, "samples": {key: {"n", "mean", "p50", "p95", "max"}}}
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            samples = {k: sorted(v) for k, v in self._samples.items()}
+
+        stats = {}
+        for key, values in samples.items():
+            if not values:
+                continue
+            n = len(values)
+            stats[key] = {
+                "n": n,
+                "mean": sum(values) / n,
+                "p50": values[n // 2],
+                "p95": values[min(n - 1, int(n * 0.95))],
+                "max": values[-1],
+            }
+        return {"counters": counters, "samples": stats}
+
+    def report(self) -> str:
+        snap = self.snapshot()
+        lines = [f"[{self.name}]"]
+        for key, value in sorted(snap["counters"].items()):
+            lines.append(f"  {key}: {value}")
+        for key, s in sorted(snap["samples"].items()):
+            lines.append(
+                f"  {key}: n={s['n']} mean={s['mean']:.3f} "
+                f"p50={s['p50']:.3f} p95={s['p95']:.3f} max={s['max']:.3f}"
+            )
+        return "\n".join(lines)
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def get_metrics(name: str) -> Metrics:
+    """
+    Return the shared Metrics object for `name`, creating it on first use.
+    """
+    with _registry_lock:
+        if name not in _registry:
+            _registry[name] = Metrics(name)
+        return _registry[name]
+
+
+def all_metrics():
+    with _registry_lock:
+        return list(_registry.values())